@@ -27,5 +27,6 @@ setup(
     ],
     packages=find_packages(exclude=("test", "docs")),
     include_package_data=True,
-    install_requires=["grpcio", "grpcio-tools", "protobuf"]
+    install_requires=["grpcio>=1.32.0", "grpcio-tools>=1.32.0", "protobuf"],
+    extras_require={"numpy": ["numpy"]}
 )
\ No newline at end of file
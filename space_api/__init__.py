@@ -1,4 +1,5 @@
 from .api import API
-from .utils import AND, OR, COND
+from .aio import AsyncAPI
+from .utils import AND, OR, COND, Param
 
-__all__ = ["API", "AND", "OR", "COND"]
+__all__ = ["API", "AsyncAPI", "AND", "OR", "COND", "Param"]
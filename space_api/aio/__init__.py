@@ -0,0 +1,5 @@
+from .api import AsyncAPI
+from .transport import AsyncTransport
+from .db import AsyncDB
+
+__all__ = ["AsyncAPI", "AsyncTransport", "AsyncDB"]
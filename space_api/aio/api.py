@@ -0,0 +1,134 @@
+"""
+SpaceUp Client Python asyncio API
+"""
+from typing import Optional, Union
+from space_api.api import strip_scheme
+from space_api.aio.db import AsyncDB
+from space_api.aio.filestore import AsyncFileStore
+from space_api.aio.transport import AsyncTransport
+from space_api.response import Response
+from space_api.codec import JSONCodec
+from space_api import constants
+
+
+class AsyncAPI:
+    """
+    The SpaceUp Client asyncio API
+
+    Mirrors API, but every apply() (and every other request) is a coroutine running on a grpc.aio channel
+    ::
+        from space_api import AsyncAPI, COND
+        async with AsyncAPI("My-Project", "localhost:4124") as api:
+            db = api.mongo()
+            response = await db.get('posts').where(COND('author', '==', 'John')).apply()
+
+    :param project_id: (str) The project ID
+    :param url: (str) The base URL of space-cloud server
+    :param timeout: (float) The (optional) default timeout of the requests in seconds
+    :param codec: (str or JSONCodec) The (optional) JSON codec, or its name (see API)
+    """
+
+    def __init__(self, project_id: str, url: str, timeout: Optional[float] = None,
+                 codec: Union[str, JSONCodec, None] = None):
+        self.project_id = project_id
+        self.url = strip_scheme(url)
+        self.token = None
+        self.transport = AsyncTransport(self.url, self.project_id, timeout=timeout, codec=codec)
+
+    async def __aenter__(self) -> 'AsyncAPI':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the communication channel
+        """
+        await self.transport.close()
+
+    async def connect(self):
+        """
+        Connects to the Space Cloud Instance, replacing the channel and closing the old one
+        """
+        await self.transport.connect()
+
+    def set_token(self, token: str):
+        """
+        Sets the JWT Token
+
+        :param token: (str) The signed JWT token received from the server on successful authentication
+        """
+        self.token = token
+        self.transport.token = token
+
+    def set_project_id(self, project_id: str):
+        """
+        Sets the Project ID
+
+        :param project_id: (str) The project ID
+        """
+        self.project_id = project_id
+        self.transport.project_id = project_id
+
+    def mongo(self) -> AsyncDB:
+        """
+        Returns an asyncio MongoDB client instance
+
+        :return: asyncio MongoDB client instance
+        """
+        return AsyncDB(self.transport, constants.Mongo)
+
+    def postgres(self) -> AsyncDB:
+        """
+        Returns an asyncio Postgres client instance
+
+        :return: asyncio Postgres client instance
+        """
+        return AsyncDB(self.transport, constants.Postgres)
+
+    def my_sql(self) -> AsyncDB:
+        """
+        Returns an asyncio MySQL client instance
+
+        :return: asyncio MySQL client instance
+        """
+        return AsyncDB(self.transport, constants.MySQL)
+
+    def __str__(self) -> str:
+        return f'AsyncSpaceAPI(project_id:{self.project_id}, url:{self.url}, token:{self.token})'
+
+    async def call(self, service_name: str, func_name: str, params, timeout: Optional[int] = 5000) -> Response:
+        """
+        Calls a function from Function as a Service Engine
+        ::
+            response = await api.call('my-service', 'my-func', { msg: 'Function as a Service is awesome!' }, 1000)
+
+        :param service_name: (str) The name of service(engine) with which the function is registered
+        :param func_name: (str) The name of function to be called
+        :param params: The params for the function
+        :param timeout: (int) The (optional) timeout in milliseconds (defaults to 5000)
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        return await self.transport.faas(service_name, func_name, params, timeout)
+
+    def file_store(self) -> AsyncFileStore:
+        """
+        Returns an asyncio FileStore instance
+
+        :return: (AsyncFileStore) The asyncio FileStore instance
+        """
+        return AsyncFileStore(self.transport)
+
+    async def publish(self, subject: str, msg) -> Response:
+        """
+        Publishes a message to a pubsub subject
+
+        :param subject: (str) The subject to publish to
+        :param msg: The message to be published
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        return await self.transport.pubsub_publish(subject, msg)
+
+
+__all__ = ["AsyncAPI"]
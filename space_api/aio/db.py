@@ -0,0 +1,687 @@
+import asyncio
+import grpc
+from typing import AsyncIterator, Callable, Hashable, Iterator, List, Optional, Union
+from space_api import constants
+from space_api.db.db import DB
+from space_api.db.get import Get, _Pager
+from space_api.db.insert import Insert
+from space_api.db.update import Update
+from space_api.db.delete import Delete
+from space_api.db.aggregate import Aggregate
+from space_api.db.batch import Batch
+from space_api.db.loader import Loader
+from space_api.db.keyset import KeysetPaginator
+from space_api.db.scan import Scan
+from space_api.livequery import LiveQuery, LiveQuerySubscription
+from space_api.response import Response, RawResponse, ResponseError
+
+
+class AsyncGet(Get):
+    """
+    The asyncio DB Get Class (see Get)
+    ::
+        response = await db.get('posts').where(COND('title', '==', 'Title1')).apply()
+    """
+
+    async def apply(self, timeout: Optional[float] = None, raw: bool = False) -> Union[Response, RawResponse]:
+        """
+        Triggers the get request
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :param raw: (bool) Whether to leave the result JSON encoded, in a RawResponse (defaults to False)
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        return await self.transport.read(self.params['find'], self.operation, self._read_options(), self.db_type,
+                                         self.collection, timeout=timeout, raw=raw)
+
+    def apply_async(self, timeout: Optional[float] = None, raw: bool = False) -> asyncio.Task:
+        """
+        Triggers the get request right away, as a task of the running event loop
+        ::
+            task = db.get('posts').apply_async()
+            response = await task
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :param raw: (bool) Whether to leave the result JSON encoded, in a RawResponse (defaults to False)
+        :return: (asyncio.Task[Response]) A task resolving to the response object
+        """
+        return asyncio.ensure_future(self.apply(timeout=timeout, raw=raw))
+
+    async def iter_docs(self, timeout: Optional[float] = None) -> Iterator:
+        """
+        Triggers the get request, and returns an iterator over the documents of the result (see Get.iter_docs)
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (Iterator) The documents, a ResponseError being raised if the request failed
+        """
+        response = await self.apply(timeout=timeout)
+        if response.status != 200:
+            raise ResponseError(response.status, response.error)
+        return response.iter_result()
+
+    async def pages(self, page_size: int, prefetch: int = 1, timeout: Optional[float] = None) -> AsyncIterator[List]:
+        """
+        Iterates over the pages of the result, fetching the next pages in tasks while the current one is used (see
+        Get.pages)
+        ::
+            async for page in db.get('events').sort('id').pages(1000, prefetch=2):
+                process(page)
+
+        :param page_size: (int) The number of documents per page
+        :param prefetch: (int) The number of pages fetched ahead of the current one (defaults to 1, 0 fetches them one
+            by one)
+        :param timeout: (float) The (optional) timeout of every page in seconds (defaults to the API's timeout)
+        :return: (AsyncIterator[List]) The documents of each page, a ResponseError being raised if a page failed
+        """
+        pager = _Pager(self.params['options'], page_size, lambda skip, limit: asyncio.ensure_future(
+            self.transport.read(self.params['find'], self.operation, self._read_options(skip=skip, limit=limit),
+                                self.db_type, self.collection, timeout=timeout)))
+        try:
+            pager.start(prefetch)
+            while pager.in_flight:
+                limit, task = pager.in_flight.popleft()
+                page = pager.page(await task, limit)
+                if page:
+                    yield page
+                pager.fetch()
+        finally:
+            pager.cancel()
+
+    def paginate_by(self, *keys: str, page_size: int, cursor: Optional[str] = None,
+                    timeout: Optional[float] = None) -> 'AsyncKeysetPaginator':
+        """
+        Iterates over the pages of the result in the order of the keys, seeking past the last document of every page
+        (see Get.paginate_by)
+        ::
+            async for page in db.get('events').paginate_by('-created', 'id', page_size=1000):
+                process(page)
+
+        :param keys: (*) The fields to sort and seek by, prefixed with '-' for the descending order
+        :param page_size: (int) The number of documents per page
+        :param cursor: (str) The (optional) cursor of an earlier paginator to resume from
+        :param timeout: (float) The (optional) timeout of every page in seconds (defaults to the API's timeout)
+        :return: (AsyncKeysetPaginator) The async iterator over the pages, whose cursor points past the last page read
+        """
+        return AsyncKeysetPaginator(self, list(keys), page_size, cursor, timeout)
+
+    async def iter(self, page_size: int, prefetch: int = 1, timeout: Optional[float] = None) -> AsyncIterator:
+        """
+        Iterates over the documents of the result, page by page, fetching the next pages in tasks (see pages)
+        ::
+            async for doc in db.get('events').sort('id').iter(1000, prefetch=2):
+                process(doc)
+
+        :param page_size: (int) The number of documents per page
+        :param prefetch: (int) The number of pages fetched ahead of the current one (defaults to 1)
+        :param timeout: (float) The (optional) timeout of every page in seconds (defaults to the API's timeout)
+        :return: (AsyncIterator) The documents, a ResponseError being raised if a page failed
+        """
+        async for page in self.pages(page_size, prefetch, timeout):
+            for doc in page:
+                yield doc
+
+
+class AsyncKeysetPaginator(KeysetPaginator):
+    """
+    The asyncio keyset paginator (see KeysetPaginator), iterated over with async for
+    ::
+        pages = db.get('events').paginate_by('created', 'id', page_size=1000)
+        async for page in pages:
+            process(page)
+            save(pages.cursor)
+    """
+    # The pages are read by coroutines, so that the paginator is only an async iterator
+    __iter__ = None
+
+    def __aiter__(self) -> 'AsyncKeysetPaginator':
+        return self
+
+    async def __anext__(self) -> list:
+        read = self._next_read()
+        if read is None:
+            raise StopAsyncIteration
+        find, options, limit = read
+        get = self.get
+        page = self._take(await get.transport.read(find, get.operation, options, get.db_type, get.collection,
+                                                   timeout=self.timeout), limit)
+        if page is None:
+            raise StopAsyncIteration
+        return page
+
+
+class AsyncInsert(Insert):
+    """
+    The asyncio DB Insert Class (see Insert)
+    ::
+        response = await db.insert('posts').doc({'author': 'John', 'title': 'Title1'}).apply()
+    """
+
+    async def apply(self, timeout: Optional[float] = None) -> Response:
+        """
+        Triggers the insert request
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        return await self.transport.create(self.document, self.operation, self.db_type, self.collection,
+                                           timeout=timeout)
+
+    def apply_async(self, timeout: Optional[float] = None) -> asyncio.Task:
+        """
+        Triggers the insert request right away, as a task of the running event loop
+        ::
+            task = db.insert('posts').doc({'title': 'Title1'}).apply_async()
+            response = await task
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (asyncio.Task[Response]) A task resolving to the response object
+        """
+        return asyncio.ensure_future(self.apply(timeout=timeout))
+
+
+class AsyncUpdate(Update):
+    """
+    The asyncio DB Update Class (see Update)
+    ::
+        response = await db.update('posts').where(COND('title', '==', 'Title1')).set({'title': 'Title2'}).apply()
+    """
+
+    async def apply(self, timeout: Optional[float] = None) -> Response:
+        """
+        Triggers the update request
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        return await self.transport.update(self.params['find'], self.operation, self.params['update'], self.db_type,
+                                           self.collection, timeout=timeout)
+
+    def apply_async(self, timeout: Optional[float] = None) -> asyncio.Task:
+        """
+        Triggers the update request right away, as a task of the running event loop
+        ::
+            task = db.update('posts').where(COND('title', '==', 'Title1')).set({'title': 'Title2'}).apply_async()
+            response = await task
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (asyncio.Task[Response]) A task resolving to the response object
+        """
+        return asyncio.ensure_future(self.apply(timeout=timeout))
+
+
+class AsyncDelete(Delete):
+    """
+    The asyncio DB Delete Class (see Delete)
+    ::
+        response = await db.delete('posts').where(COND('title', '==', 'Title1')).apply()
+    """
+
+    async def apply(self, timeout: Optional[float] = None) -> Response:
+        """
+        Triggers the delete request
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        return await self.transport.delete(self.params['find'], self.operation, self.db_type, self.collection,
+                                           timeout=timeout)
+
+    def apply_async(self, timeout: Optional[float] = None) -> asyncio.Task:
+        """
+        Triggers the delete request right away, as a task of the running event loop
+        ::
+            task = db.delete('posts').where(COND('title', '==', 'Title1')).apply_async()
+            response = await task
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (asyncio.Task[Response]) A task resolving to the response object
+        """
+        return asyncio.ensure_future(self.apply(timeout=timeout))
+
+
+class AsyncAggregate(Aggregate):
+    """
+    The asyncio DB Aggregate Class (see Aggregate)
+    ::
+        response = await db.aggr('posts').pipe([...]).apply()
+    """
+
+    async def apply(self, timeout: Optional[float] = None, raw: bool = False) -> Union[Response, RawResponse]:
+        """
+        Triggers the aggregate request
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :param raw: (bool) Whether to leave the result JSON encoded, in a RawResponse (defaults to False)
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        return await self.transport.aggregate(self.params['pipe'], self.operation, self.db_type, self.collection,
+                                              timeout=timeout, raw=raw)
+
+    def apply_async(self, timeout: Optional[float] = None, raw: bool = False) -> asyncio.Task:
+        """
+        Triggers the aggregate request right away, as a task of the running event loop
+        ::
+            task = db.aggr('posts').pipe([...]).apply_async()
+            response = await task
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :param raw: (bool) Whether to leave the result JSON encoded, in a RawResponse (defaults to False)
+        :return: (asyncio.Task[Response]) A task resolving to the response object
+        """
+        return asyncio.ensure_future(self.apply(timeout=timeout, raw=raw))
+
+
+class AsyncBatch(Batch):
+    """
+    The asyncio DB Batch Class (see Batch)
+    ::
+        batch_obj = db.begin_batch()
+        batch_obj.add(db.insert('books').doc({'name': 'MyBook'}))
+        response = await batch_obj.apply()
+    """
+
+    async def apply(self, timeout: Optional[float] = None) -> Response:
+        """
+        Triggers the batch request
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        return await self.transport.batch(self.requests, self.db_type, timeout=timeout)
+
+    def apply_async(self, timeout: Optional[float] = None) -> asyncio.Task:
+        """
+        Triggers the batch request right away, as a task of the running event loop
+        ::
+            task = batch_obj.apply_async()
+            response = await task
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (asyncio.Task[Response]) A task resolving to the response object
+        """
+        return asyncio.ensure_future(self.apply(timeout=timeout))
+
+
+class AsyncScan(Scan):
+    """
+    The asyncio DB Scan Class (see Scan), which reads every partition in a task of the running event loop
+    ::
+        async for doc in db.scan('events', partitions=8, key='id').where(COND('type', '==', 'click')).apply():
+            process(doc)
+    """
+
+    async def boundaries(self, timeout: Optional[float] = None) -> list:
+        """
+        Returns the values of the key between the partitions, sampling them if they were not given (see
+        Scan.boundaries)
+
+        :param timeout: (float) The (optional) timeout of every sampling request in seconds (defaults to the API's
+            timeout)
+        :return: (list) The sorted boundaries
+        """
+        if self._boundaries is not None:
+            return self._boundaries
+        if self.partitions == 1:
+            self._boundaries = []
+            return self._boundaries
+        response = await self._get('count').apply(timeout=timeout)
+        if response.status != 200:
+            raise ResponseError(response.status, response.error)
+        samples = [get.apply_async(timeout=timeout) for get in self._samples(response.result or 0)]
+        values = []
+        try:
+            for task in samples:
+                values.extend(self._sampled(await task))
+        finally:
+            for task in samples:
+                task.cancel()
+        self._boundaries = sorted(set(values))
+        return self._boundaries
+
+    async def apply(self, timeout: Optional[float] = None) -> AsyncIterator:
+        """
+        Triggers the read of every partition at once, and iterates over their documents as the partitions complete, or
+        in the order of the key if the scan is ordered (see Scan.apply)
+
+        :param timeout: (float) The (optional) timeout of every request in seconds (defaults to the API's timeout)
+        :return: (AsyncIterator) The documents, a ResponseError being raised if a partition failed
+        """
+        reads = [get.apply_async(timeout=timeout) for get in self._partitions(await self.boundaries(timeout))]
+        try:
+            for read in (reads if self.ordered else asyncio.as_completed(reads)):
+                response = await read
+                if response.status != 200:
+                    raise ResponseError(response.status, response.error)
+                for doc in response.iter_result():
+                    yield doc
+        finally:
+            for task in reads:
+                task.cancel()
+
+    def _get(self, operation: str) -> AsyncGet:
+        get = AsyncGet(self.transport, self.collection, self.db_type, operation)
+        get.params['find'] = self.params['find']
+        if operation == 'all':
+            get.params['options'] = dict(self.params['options'])
+        return get
+
+
+class AsyncLiveQuery(LiveQuery):
+    """
+    The asyncio LiveQuery Class (see LiveQuery), whose feed is read by a task of the running event loop
+    ::
+        subscription = db.live_query('books').subscribe(on_snapshot, on_error)
+
+        # After some condition
+        subscription.unsubscribe()
+    """
+
+    @property
+    def stub(self):
+        return self.transport.stub
+
+    def subscribe(self, on_snapshot: Callable, on_error: Callable) -> LiveQuerySubscription:
+        """
+        Subscribes to the live query, from a coroutine of the event loop which the feed is read on (see
+        LiveQuery.subscribe)
+
+        :param on_snapshot: (Callable) The function to be called when new live data is encountered
+        :param on_error: (Callable) The function to be called when an error occurs
+        :return: (LiveQuerySubscription) The LiveQuerySubscription instance
+        """
+        self.on_snapshot = on_snapshot
+        self.on_error = on_error
+        self.call = self.stub.RealTime()
+        self.async_result = asyncio.ensure_future(self._run_client(self.id))
+        self.subscription = LiveQuerySubscription(self.unsubscribe, [])
+        return self.subscription
+
+    async def _run_client(self, _id: str):
+        try:
+            await self.call.write(self._request(constants.TypeRealtimeSubscribe))
+            async for response in self.call:
+                if response.id == _id:
+                    if response.ack:
+                        self._snapshot_callback(response.feedData)
+                    else:
+                        self.on_error(response.error)
+                        self.unsubscribe()
+                        return
+        except grpc.RpcError as e:
+            if self.call.cancelled():
+                return
+            self.on_error("Transport Error:", e.details())
+            self.unsubscribe()
+
+    def unsubscribe(self):
+        """
+        Unsubscribes from the live query, closing its stream in a task of the event loop
+        """
+        if self.subscription is None or self.call is None:
+            return
+        call, self.call = self.call, None
+        self.async_result = asyncio.ensure_future(self._close(call))
+        self.store = []
+
+    async def _close(self, call):
+        try:
+            await call.write(self._request(constants.TypeRealtimeUnsubscribe))
+            await call.done_writing()
+        except (grpc.RpcError, asyncio.InvalidStateError):
+            pass
+        finally:
+            call.cancel()
+
+
+class AsyncLoader(Loader):
+    """
+    The asyncio DB Loader Class (see Loader), which collects the keys requested within a turn of the event loop, or
+    within the window if given
+    ::
+        users = db.loader('users', key='id')
+        authors = await asyncio.gather(*(users.load(post['author_id']) for post in posts))
+    """
+
+    def load(self, key: Hashable) -> asyncio.Future:
+        """
+        Loads the document of a key
+
+        :param key: The key
+        :return: (asyncio.Future[dict]) A future resolving to the document, or to None if there is none, a
+            ResponseError being raised if the read failed
+        """
+        future = self._futures.get(key) or self._pending.get(key)
+        if future is not None and not future.cancelled():
+            return future
+        loop = asyncio.get_event_loop()
+        future = self._pending[key] = loop.create_future()
+        if self.cache:
+            self._futures[key] = future
+        if len(self._pending) >= self.max_keys:
+            self.dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.dispatch) if self.window > 0 else \
+                loop.call_soon(self.dispatch)
+        return future
+
+    def _get(self, keys: list) -> AsyncGet:
+        get = AsyncGet(self.transport, self.collection, self.db_type)
+        get.params['find'] = {self.key: {'$in': keys}}
+        return get
+
+    def _send(self, batch: dict):
+        asyncio.ensure_future(self._read(batch))
+
+    async def _read(self, batch: dict):
+        try:
+            response = await self._get(list(batch)).apply(timeout=self.timeout)
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        self._resolve(batch, response)
+
+    @staticmethod
+    def _settle(future: asyncio.Future, result: Optional[dict] = None, error: Optional[BaseException] = None):
+        """
+        Resolves a future of a read to its document or error, unless it was cancelled by its caller, both running on
+        the event loop
+        """
+        if not future.done():
+            Loader._settle(future, result, error)
+
+
+class AsyncDB(DB):
+    """
+    The asyncio DB Client Class
+    ::
+        from space_api import AsyncAPI
+        api = AsyncAPI("My-Project", "localhost:4124")
+        db = api.mongo()  # For a MongoDB interface
+        response = await db.get('posts').apply()
+
+    :param transport: (AsyncTransport) The API's asyncio transport instance
+    :param db_type: (str) The database type
+    """
+
+    def get(self, collection: str) -> AsyncGet:
+        """
+        Returns an async DB Get object, with operation 'all'
+
+        :param collection: (str) The collection name
+        :return: The async DB Get object
+        """
+        return AsyncGet(self.transport, collection, self.db_type)
+
+    def get_one(self, collection: str) -> AsyncGet:
+        """
+        Returns an async DB Get object, with operation 'one'
+
+        :param collection: (str) The collection name
+        :return: The async DB Get object
+        """
+        return AsyncGet(self.transport, collection, self.db_type, operation='one')
+
+    def count(self, collection: str) -> AsyncGet:
+        """
+        Returns an async DB Get object, with operation 'count'
+
+        :param collection: (str) The collection name
+        :return: The async DB Get object
+        """
+        return AsyncGet(self.transport, collection, self.db_type, operation='count')
+
+    def distinct(self, collection: str) -> AsyncGet:
+        """
+        Returns an async DB Get object, with operation 'distinct'
+
+        :param collection: (str) The collection name
+        :return: The async DB Get object
+        """
+        return AsyncGet(self.transport, collection, self.db_type, operation='distinct')
+
+    def insert(self, collection: str) -> AsyncInsert:
+        """
+        Returns an async DB Insert object
+
+        :param collection: (str) The collection name
+        :return: The async DB Insert object
+        """
+        return AsyncInsert(self.transport, collection, self.db_type)
+
+    def update(self, collection: str) -> AsyncUpdate:
+        """
+        Returns an async DB Update object, with operation 'all'
+
+        :param collection: (str) The collection name
+        :return: The async DB Update object
+        """
+        return AsyncUpdate(self.transport, collection, self.db_type)
+
+    def update_one(self, collection: str) -> AsyncUpdate:
+        """
+        Returns an async DB Update object, with operation 'one'
+
+        :param collection: (str) The collection name
+        :return: The async DB Update object
+        """
+        return AsyncUpdate(self.transport, collection, self.db_type, operation='one')
+
+    def upsert(self, collection: str) -> AsyncUpdate:
+        """
+        Returns an async DB Update object, with operation 'upsert'
+
+        :param collection: (str) The collection name
+        :return: The async DB Update object
+        """
+        return AsyncUpdate(self.transport, collection, self.db_type, operation='upsert')
+
+    def delete(self, collection: str) -> AsyncDelete:
+        """
+        Returns an async DB Delete object, with operation 'all'
+
+        :param collection: (str) The collection name
+        :return: The async DB Delete object
+        """
+        return AsyncDelete(self.transport, collection, self.db_type)
+
+    def delete_one(self, collection: str) -> AsyncDelete:
+        """
+        Returns an async DB Delete object, with operation 'one'
+
+        :param collection: (str) The collection name
+        :return: The async DB Delete object
+        """
+        return AsyncDelete(self.transport, collection, self.db_type, operation='one')
+
+    def aggr(self, collection: str) -> AsyncAggregate:
+        """
+        Returns an async DB Aggregate object, with operation 'all'
+
+        :param collection: (str) The collection name
+        :return: The async DB Aggregate object
+        """
+        return AsyncAggregate(self.transport, collection, self.db_type)
+
+    def aggr_one(self, collection: str) -> AsyncAggregate:
+        """
+        Returns an async DB Aggregate object, with operation 'one'
+
+        :param collection: (str) The collection name
+        :return: The async DB Aggregate object
+        """
+        return AsyncAggregate(self.transport, collection, self.db_type, operation='one')
+
+    def begin_batch(self) -> AsyncBatch:
+        """
+        Creates an async Batch request
+
+        :return: (AsyncBatch) An async DB Batch object
+        """
+        return AsyncBatch(self.transport, self.db_type)
+
+    def scan(self, collection: str, partitions: int = 4, key: str = 'id', boundaries: Optional[list] = None,
+             ordered: bool = False) -> AsyncScan:
+        """
+        Returns an async DB Scan object, which reads a collection in partitions at once (see DB.scan)
+        ::
+            async for doc in db.scan('events', partitions=8).apply():
+                process(doc)
+
+        :return: (AsyncScan) The async DB Scan object
+        """
+        return AsyncScan(self.transport, collection, self.db_type, partitions, key, boundaries, ordered)
+
+    def loader(self, collection: str, key: str = 'id', window: float = 0.0,
+               max_keys: int = constants.LoaderMaxKeys, cache: bool = True,
+               timeout: Optional[float] = None) -> AsyncLoader:
+        """
+        Returns an async DB Loader object, which collects the keys requested within a turn of the event loop by
+        default (see DB.loader)
+
+        :return: (AsyncLoader) The async DB Loader object
+        """
+        return AsyncLoader(self.transport, collection, self.db_type, key, window, max_keys, cache, timeout)
+
+    def live_query(self, collection: str) -> AsyncLiveQuery:
+        """
+        Returns an async DB LiveQuery object, to subscribe to from a coroutine (see DB.live_query)
+
+        :param collection: (str) The collection name
+        :return: (AsyncLiveQuery) The async DB LiveQuery object
+        """
+        return AsyncLiveQuery(self.transport, self.db_type, collection)
+
+    async def profile(self, _id: str) -> Response:
+        """
+        Gets the profile of the user (see DB.profile)
+        """
+        return await self.transport.profile(_id, self.db_type)
+
+    async def profiles(self) -> Response:
+        """
+        Gets the all the profiles (see DB.profiles)
+        """
+        return await self.transport.profiles(self.db_type)
+
+    async def edit_profile(self, _id: str, email: Optional[str] = None, name: Optional[str] = None,
+                           password: Optional[str] = None) -> Response:
+        """
+        Edits the profile of the user (see DB.edit_profile)
+        """
+        return await self.transport.edit_profile(_id, email, name, password, self.db_type)
+
+    async def sign_in(self, email: str, password: str) -> Response:
+        """
+        Allows the user to sign in (see DB.sign_in)
+        """
+        return await self.transport.sign_in(email, password, self.db_type)
+
+    async def sign_up(self, email: str, name: str, password: str, role: str) -> Response:
+        """
+        Allows a user to sign up (see DB.sign_up)
+        """
+        return await self.transport.sign_up(email, name, password, role, self.db_type)
+
+
+__all__ = ['AsyncDB', 'AsyncGet', 'AsyncInsert', 'AsyncUpdate', 'AsyncDelete', 'AsyncAggregate', 'AsyncBatch',
+           'AsyncKeysetPaginator', 'AsyncScan', 'AsyncLiveQuery', 'AsyncLoader']
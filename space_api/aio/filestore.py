@@ -0,0 +1,45 @@
+from space_api.response import Response
+from space_api.filestore import FileStore
+
+
+class AsyncFileStore(FileStore):
+    """
+    The asyncio FileStore Class (see FileStore)
+    ::
+        response = await api.file_store().list_files("/")
+    """
+
+    async def create_folder(self, path: str, name: str) -> Response:
+        """
+        Creates a folder at the specified location (see FileStore.create_folder)
+        """
+        return await self.transport.create_folder(path, name)
+
+    async def delete_file(self, path: str) -> Response:
+        """
+        Deletes a particular file (see FileStore.delete_file)
+        """
+        return await self.transport.delete_file(path)
+
+    async def list_files(self, path: str) -> Response:
+        """
+        List the files in a particular folder (see FileStore.list_files)
+        """
+        return await self.transport.list_files(path)
+
+    async def upload_file(self, path: str, name: str, location: str) -> Response:
+        """
+        Uploads a particular file (see FileStore.upload_file)
+        """
+        with open(location, "rb") as stream:
+            return await self.transport.upload_file(path, name, stream)
+
+    async def download_file(self, path: str, location: str) -> Response:
+        """
+        Downloads a particular file (see FileStore.download_file)
+        """
+        with open(location, "wb") as stream:
+            return await self.transport.download_file(path, stream)
+
+
+__all__ = ["AsyncFileStore"]
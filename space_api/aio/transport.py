@@ -0,0 +1,230 @@
+import io
+import math
+import grpc
+import grpc.aio
+from typing import Optional, List, Union
+from space_api.proto import server_pb2
+from space_api.proto.server_pb2_grpc import SpaceCloudStub
+from space_api.response import Response, RawResponse
+from space_api.encoding import serialize
+from space_api.codec import JSONCodec
+from space_api.transport import BaseTransport
+from space_api.deadline import resolve
+from space_api import constants
+
+
+class AsyncTransport(BaseTransport):
+    """
+    The SpaceUp asyncio Transport Instance
+
+    Builds the same gRPC requests as Transport, but sends them over a grpc.aio channel, so that every call is a
+    coroutine which runs on the event loop instead of blocking a thread. The requests are built as protobuf messages,
+    and the channel pool, the call policies and the read cache of Transport are not available
+    ::
+        transport = AsyncTransport("localhost:4124", "My-Project")
+        response = await transport.read(...)
+
+    :param url: (str) The URL of space-cloud server
+    :param project_id: (str) The project ID
+    :param token: (str) The (optional) JWT token
+    :param timeout: (float) The (optional) default timeout of the unary calls in seconds
+    :param codec: (str or JSONCodec) The (optional) JSON codec, or its name (see Transport)
+    """
+
+    def __init__(self, url: str, project_id: str, token: Optional[str] = None, timeout: Optional[float] = None,
+                 codec: Union[str, JSONCodec, None] = None):
+        super().__init__(url, project_id, token, timeout, codec)
+        # A single grpc.aio channel, rather than the channel pool of Transport
+        self.channel = grpc.aio.insecure_channel(self.url)
+        self.stub = SpaceCloudStub(self.channel)
+        self._raw_methods = {}
+
+    async def close(self):
+        """
+        Closes the communication channel
+        """
+        await self.channel.close()
+
+    async def connect(self):
+        """
+        Connects to the Space Cloud Instance, replacing the channel and closing the old one
+        """
+        channel = self.channel
+        self.channel = grpc.aio.insecure_channel(self.url)
+        self.stub = SpaceCloudStub(self.channel)
+        self._raw_methods = {}
+        await channel.close()
+
+    def metrics(self) -> dict:
+        """
+        Returns the number of calls which ran out of time per RPC
+
+        :return: (dict) The counters under 'deadline_exceeded'
+        """
+        with self._deadlines_lock:
+            return {'deadline_exceeded': dict(self._deadlines_exceeded)}
+
+    def _raw_method(self, rpc: str) -> grpc.aio.UnaryUnaryMultiCallable:
+        """
+        Returns the callable of a unary RPC which returns the encoded Response
+        """
+        method = self._raw_methods.get(rpc)
+        if method is None:
+            method = self._raw_methods[rpc] = self.channel.unary_unary(f'/proto.SpaceCloud/{rpc}',
+                                                                       request_serializer=serialize)
+        return method
+
+    async def _unary(self, rpc: str, request, timeout: Optional[float] = None,
+                     raw: bool = False) -> Union[Response, RawResponse]:
+        """
+        Sends a unary call
+
+        :param rpc: (str) The name of the unary RPC
+        :param request: The gRPC request object
+        :param timeout: (float) The (optional) timeout of the call in seconds (defaults to the transport's timeout)
+        :param raw: (bool) Whether to leave the result encoded, in a RawResponse (defaults to False)
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        at = resolve(self.timeout if timeout is None else timeout)
+        try:
+            if raw:
+                return RawResponse(await self._raw_method(rpc)(request, timeout=self._timeout(rpc, at)))
+            return Response(await getattr(self.stub, rpc)(request, timeout=self._timeout(rpc, at)), self.codec)
+        except grpc.RpcError as e:
+            self._failed(rpc, e)
+            raise
+
+    async def faas(self, service: str, function: str, params, timeout: int) -> Response:
+        """
+        Calls the gRPC Call function (see Transport.faas)
+        """
+        return await self._unary('Call', self._functions_request(service, function, params, timeout),
+                                 timeout=math.ceil(timeout / 1000) + constants.FunctionDeadlineMargin)
+
+    async def read(self, find, operation: str, options: server_pb2.ReadOptions, db_type: str, col: str,
+                   timeout: Optional[float] = None, raw: bool = False) -> Union[Response, RawResponse]:
+        """
+        Calls the gRPC Read function (see Transport.read)
+        """
+        read_request = self._read_request(find, operation, options, db_type, col)
+        return await self._unary('Read', read_request, timeout=timeout, raw=raw)
+
+    async def create(self, document, operation: str, db_type: str, col: str,
+                     timeout: Optional[float] = None) -> Response:
+        """
+        Calls the gRPC Create function (see Transport.create)
+        """
+        return await self._unary('Create', self._create_request(document, operation, db_type, col), timeout=timeout)
+
+    async def update(self, find, operation: str, _update, db_type: str, col: str,
+                     timeout: Optional[float] = None) -> Response:
+        """
+        Calls the gRPC Update function (see Transport.update)
+        """
+        update_request = self._update_request(find, operation, _update, db_type, col)
+        return await self._unary('Update', update_request, timeout=timeout)
+
+    async def delete(self, find, operation: str, db_type: str, col: str, timeout: Optional[float] = None) -> Response:
+        """
+        Calls the gRPC Delete function (see Transport.delete)
+        """
+        return await self._unary('Delete', self._delete_request(find, operation, db_type, col), timeout=timeout)
+
+    async def aggregate(self, pipeline, operation: str, db_type: str, col: str, timeout: Optional[float] = None,
+                        raw: bool = False) -> Union[Response, RawResponse]:
+        """
+        Calls the gRPC Aggregate function (see Transport.aggregate)
+        """
+        aggregate_request = self._aggregate_request(pipeline, operation, db_type, col)
+        return await self._unary('Aggregate', aggregate_request, timeout=timeout, raw=raw)
+
+    async def batch(self, all_requests: List[server_pb2.AllRequest], db_type: str,
+                    timeout: Optional[float] = None) -> Response:
+        """
+        Calls the gRPC Batch function (see Transport.batch)
+        """
+        return await self._unary('Batch', self._batch_request(all_requests, db_type), timeout=timeout)
+
+    async def profile(self, _id: str, db_type: str) -> Response:
+        """
+        Calls the gRPC Profile function (see Transport.profile)
+        """
+        profile_request = server_pb2.ProfileRequest(id=_id, meta=self._make_meta(db_type=db_type))
+        return await self._unary('Profile', profile_request)
+
+    async def profiles(self, db_type: str) -> Response:
+        """
+        Calls the gRPC Profiles function (see Transport.profiles)
+        """
+        profiles_request = server_pb2.ProfilesRequest(meta=self._make_meta(db_type=db_type))
+        return await self._unary('Profiles', profiles_request)
+
+    async def edit_profile(self, _id: str, email: str, name: str, password: str, db_type: str) -> Response:
+        """
+        Calls the gRPC EditProfile function (see Transport.edit_profile)
+        """
+        return await self._unary('EditProfile', self._edit_profile_request(_id, email, name, password, db_type))
+
+    async def sign_in(self, email: str, password: str, db_type: str) -> Response:
+        """
+        Calls the gRPC SignIn function (see Transport.sign_in)
+        """
+        meta = self._make_meta(db_type=db_type)
+        sign_in_request = server_pb2.SignInRequest(email=email, password=password, meta=meta)
+        return await self._unary('SignIn', sign_in_request)
+
+    async def sign_up(self, email: str, name: str, password: str, role: str, db_type: str) -> Response:
+        """
+        Calls the gRPC SignUp function (see Transport.sign_up)
+        """
+        meta = self._make_meta(db_type=db_type)
+        sign_up_request = server_pb2.SignUpRequest(email=email, name=name, password=password, role=role, meta=meta)
+        return await self._unary('SignUp', sign_up_request)
+
+    async def create_folder(self, path: str, name: str) -> Response:
+        """
+        Calls the gRPC CreateFolder function (see Transport.create_folder)
+        """
+        create_folder_request = server_pb2.CreateFolderRequest(path=path, name=name, meta=self._make_meta())
+        return await self._unary('CreateFolder', create_folder_request)
+
+    async def delete_file(self, path: str) -> Response:
+        """
+        Calls the gRPC DeleteFile function (see Transport.delete_file)
+        """
+        delete_file_request = server_pb2.DeleteFileRequest(path=path, meta=self._make_meta())
+        return await self._unary('DeleteFile', delete_file_request)
+
+    async def list_files(self, path: str) -> Response:
+        """
+        Calls the gRPC ListFiles function (see Transport.list_files)
+        """
+        list_files_request = server_pb2.ListFilesRequest(path=path, meta=self._make_meta())
+        return await self._unary('ListFiles', list_files_request)
+
+    async def upload_file(self, path: str, name: str, stream: io.BufferedReader) -> Response:
+        """
+        Calls the gRPC UploadFile function (see Transport.upload_file)
+        """
+        return Response(await self.stub.UploadFile(self._upload_file_requests(path, name, stream)), self.codec)
+
+    async def download_file(self, path: str, stream: io.BufferedWriter) -> Response:
+        """
+        Calls the gRPC DownloadFile function (see Transport.download_file)
+        """
+        download_file_request = server_pb2.DownloadFileRequest(path=path, meta=self._make_meta())
+        async for response in self.stub.DownloadFile(download_file_request):
+            if response.status == 200:
+                stream.write(response.payload)
+            else:
+                return Response(server_pb2.Response(status=response.status, error=response.error))
+        return Response(server_pb2.Response(status=200))
+
+    async def pubsub_publish(self, subject: str, msg) -> Response:
+        """
+        Calls the gRPC PubsubPublish function (see Transport.pubsub_publish)
+        """
+        return await self._unary('PubsubPublish', self._publish_request(subject, msg))
+
+
+__all__ = ["AsyncTransport"]
@@ -1,16 +1,37 @@
 """
 SpaceUp Client Python API
 """
-from typing import Optional
+from typing import Optional, List, Union
 from space_api.db.db import DB
 from space_api.response import Response
 from space_api.service import Service
 from space_api.filestore import FileStore
 from space_api.pubsub import Pubsub
 from space_api.transport import Transport
+from space_api.compression import Compression
+from space_api.retry import RetryPolicy
+from space_api.hedging import HedgePolicy
+from space_api.breaker import CircuitBreaker
+from space_api.coalescing import Coalescer
+from space_api.cache import ReadCache
+from space_api.codec import JSONCodec
 from space_api import constants
 
 
+def strip_scheme(url: str) -> str:
+    """
+    Strips the (optional) http/https scheme from the URL of space-cloud server
+
+    :param url: (str) The base URL of space-cloud server
+    :return: (str) The URL without the scheme
+    """
+    if url.startswith("http://"):
+        return url.lstrip("http://")
+    elif url.startswith("https://"):
+        return url.lstrip("https://")
+    return url
+
+
 class API:
     """
     The SpaceUp Client API
@@ -19,19 +40,43 @@ class API:
         api = API("My-Project", "localhost:4124")
 
     :param project_id: (str) The project ID
-    :param url: (str) The base URL of space-cloud server
+    :param url: (str or List[str]) The base URL of space-cloud server, or the base URLs of several replicas to
+        balance the requests across
+    :param channels: (int) The number of gRPC channels per server the requests are spread over (defaults to 1)
+    :param balance: (str) How the requests are spread over the channels, constants.RoundRobin (default),
+        constants.LeastOutstanding or constants.EWMALatency
+    :param compression: (Compression) The (optional) compression policy of the requests
+    :param retry_policy: (RetryPolicy) The (optional) retry policy of the requests
+    :param hedging: (HedgePolicy) The (optional) hedging policy of the reads and aggregations
+    :param health_check_interval: (float) The seconds between the health checks of several servers, or None to
+        disable them (defaults to constants.HealthCheckInterval)
+    :param breaker: (CircuitBreaker) The (optional) circuit breaker of the requests
+    :param coalescer: (Coalescer) The (optional) coalescer of the identical concurrent reads
+    :param timeout: (float) The (optional) default timeout of the requests in seconds, including their retries; it
+        can be overridden per request with apply(timeout=...) and shortened by a space_api.deadline.deadline block
+    :param warm_up_timeout: (float) The (optional) seconds to wait for the channels to be ready; they start connecting
+        right away either way
+    :param codec: (str or JSONCodec) The (optional) JSON codec of the documents, queries and results, or its name,
+        e.g. "orjson", "ujson", "simdjson" or "json" (defaults to the first installed one of constants.JSONCodecs)
+    :param cache: (ReadCache) The (optional) cache of the reads, invalidated by the writes sent through the API and
+        the realtime feeds of its live collections
     """
 
-    def __init__(self, project_id: str, url: str):
+    def __init__(self, project_id: str, url: Union[str, List[str]], channels: int = 1,
+                 balance: str = constants.RoundRobin, compression: Optional[Compression] = None,
+                 retry_policy: Optional[RetryPolicy] = None, hedging: Optional[HedgePolicy] = None,
+                 health_check_interval: Optional[float] = constants.HealthCheckInterval,
+                 breaker: Optional[CircuitBreaker] = None, coalescer: Optional[Coalescer] = None,
+                 timeout: Optional[float] = None, warm_up_timeout: Optional[float] = None,
+                 codec: Union[str, JSONCodec, None] = None, cache: Optional[ReadCache] = None):
         self.project_id = project_id
-        if url.startswith("http://"):
-            self.url = url.lstrip("http://")
-        elif url.startswith("https://"):
-            self.url = url.lstrip("https://")
-        else:
-            self.url = url
+        self.url = strip_scheme(url) if isinstance(url, str) else [strip_scheme(u) for u in url]
         self.token = None
-        self.transport = Transport(self.url, self.project_id)
+        self.transport = Transport(self.url, self.project_id, channels=channels, balance=balance,
+                                   compression=compression, retry_policy=retry_policy, hedging=hedging,
+                                   health_check_interval=health_check_interval, breaker=breaker,
+                                   coalescer=coalescer, cache=cache, timeout=timeout, codec=codec)
+        self.transport.warm_up(wait=warm_up_timeout is not None, timeout=warm_up_timeout)
 
     def close(self):
         """
@@ -41,10 +86,32 @@ class API:
 
     def connect(self):
         """
-        Connects to the Space Cloud Instance
+        Connects to the Space Cloud Instance, replacing the channels (see Transport.connect)
         """
         self.transport.connect()
 
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for the channels to be ready
+        ::
+            if not api.wait_ready(timeout=5):
+                print("space-cloud is unreachable")
+
+        :param timeout: (float) The (optional) seconds to wait, None to wait indefinitely
+        :return: (bool) Whether all the channels are ready
+        """
+        return self.transport.warm_up(wait=True, timeout=timeout)
+
+    def metrics(self) -> dict:
+        """
+        Returns the counters of the transport policies
+        ::
+            print(api.metrics())
+
+        :return: (dict) The counters, keyed by policy
+        """
+        return self.transport.metrics()
+
     def set_token(self, token: str):
         """
         Sets the JWT Token
@@ -0,0 +1,191 @@
+import threading
+import time
+from typing import Iterable, Optional
+import grpc
+from space_api import constants
+
+# FailureCodes are the status codes which count as failures of a circuit, as they point to an overloaded or
+# unreachable server
+FailureCodes = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED, grpc.StatusCode.RESOURCE_EXHAUSTED)
+
+
+class CircuitOpenError(grpc.RpcError):
+    """
+    Raised instead of sending a call whose circuit is open
+
+    :param key: (str) The key of the open circuit
+    """
+
+    def __init__(self, key: str):
+        super().__init__(f"The circuit of {key} is open")
+        self.key = key
+
+    @staticmethod
+    def code() -> grpc.StatusCode:
+        return grpc.StatusCode.UNAVAILABLE
+
+    def details(self) -> str:
+        return f"The circuit of {self.key} is open"
+
+
+class Circuit:
+    """
+    The state of a single circuit, i.e. of an endpoint or of a collection on an endpoint
+    """
+
+    def __init__(self):
+        self.state = constants.CircuitClosed
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trials = 0
+        self.trips = 0
+        self.rejected = 0
+
+    def metrics(self) -> dict:
+        return {'state': self.state, 'trips': self.trips, 'rejected': self.rejected, 'failures': self.failures}
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker per endpoint (and optionally per collection) around the unary calls of a Transport
+
+    A circuit opens after `failure_threshold` consecutive calls failed with one of the failure codes, and then fails
+    the calls fast with a CircuitOpenError. After `reset_timeout` seconds it turns half-open and lets up to
+    `half_open_calls` trial calls through: a successful trial closes the circuit, a failed one opens it again. With
+    several endpoints, the calls are sent to the endpoints whose circuit is not open
+    ::
+        from space_api import API
+        from space_api.breaker import CircuitBreaker
+        api = API("My-Project", "localhost:4124", breaker=CircuitBreaker(failure_threshold=10))
+        print(api.metrics()['breaker'])
+
+    :param failure_threshold: (int) The number of consecutive failures which opens a circuit (defaults to 5)
+    :param reset_timeout: (float) The seconds an open circuit waits before turning half-open (defaults to 5)
+    :param half_open_calls: (int) The number of concurrent trial calls of a half-open circuit (defaults to 1)
+    :param codes: (Iterable[grpc.StatusCode]) The status codes which count as failures (defaults to FailureCodes)
+    :param per_collection: (bool) Keep a circuit per collection of every endpoint, rather than per endpoint
+        (defaults to False)
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 5.0, half_open_calls: int = 1,
+                 codes: Iterable[grpc.StatusCode] = FailureCodes, per_collection: bool = False):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.codes = frozenset(codes)
+        self.per_collection = per_collection
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def key(self, url: str, request) -> str:
+        """
+        Returns the key of the circuit a call belongs to
+
+        :param url: (str) The URL of the endpoint
+        :param request: The gRPC request object
+        :return: (str) The key, the URL of the endpoint, followed by the database type and collection if the
+            breaker works per collection
+        """
+        meta = getattr(request, 'meta', None)
+        if not self.per_collection or meta is None or not meta.col:
+            return url
+        return f"{url}/{meta.dbType}/{meta.col}"
+
+    def _circuit(self, key: str) -> Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = Circuit()
+        return circuit
+
+    def _refresh(self, circuit: Circuit):
+        if circuit.state == constants.CircuitOpen and time.monotonic() - circuit.opened_at >= self.reset_timeout:
+            circuit.state = constants.CircuitHalfOpen
+            circuit.trials = 0
+
+    def available(self, key: str) -> bool:
+        """
+        Returns whether a circuit would let a call through, without taking a trial
+
+        :param key: (str) The key of the circuit
+        :return: (bool) Whether the circuit is closed, or half-open with trials left
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                return True
+            self._refresh(circuit)
+            return circuit.state == constants.CircuitClosed or (
+                    circuit.state == constants.CircuitHalfOpen and circuit.trials < self.half_open_calls)
+
+    def allow(self, key: str) -> bool:
+        """
+        Asks a circuit to let a call through, which must then be reported with record
+
+        :param key: (str) The key of the circuit
+        :return: (bool) Whether the call may be sent
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            self._refresh(circuit)
+            if circuit.state == constants.CircuitClosed:
+                return True
+            if circuit.state == constants.CircuitHalfOpen and circuit.trials < self.half_open_calls:
+                circuit.trials += 1
+                return True
+            circuit.rejected += 1
+            return False
+
+    def record(self, key: str, code: Optional[grpc.StatusCode] = None):
+        """
+        Reports the outcome of a call let through by allow
+
+        :param key: (str) The key of the circuit
+        :param code: (grpc.StatusCode) The status code of the call, None if it succeeded
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            half_open = circuit.state == constants.CircuitHalfOpen
+            if half_open:
+                circuit.trials = max(0, circuit.trials - 1)
+            if code == grpc.StatusCode.CANCELLED:
+                # The caller gave up, which says nothing about the server
+                return
+            if code in self.codes:
+                circuit.failures += 1
+                if half_open or (circuit.state == constants.CircuitClosed and
+                                 circuit.failures >= self.failure_threshold):
+                    circuit.state = constants.CircuitOpen
+                    circuit.opened_at = time.monotonic()
+                    circuit.trips += 1
+            elif circuit.state != constants.CircuitOpen or half_open:
+                circuit.state = constants.CircuitClosed
+                circuit.failures = 0
+
+    def state(self, key: str) -> str:
+        """
+        Returns the state of a circuit
+
+        :param key: (str) The key of the circuit
+        :return: (str) constants.CircuitClosed, constants.CircuitOpen or constants.CircuitHalfOpen
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                return constants.CircuitClosed
+            self._refresh(circuit)
+            return circuit.state
+
+    def metrics(self) -> dict:
+        """
+        Returns the state of every circuit
+
+        :return: (dict) The state, the number of trips, of calls failed fast and of consecutive failures, keyed by
+            circuit
+        """
+        with self._lock:
+            for circuit in self._circuits.values():
+                self._refresh(circuit)
+            return {key: circuit.metrics() for key, circuit in self._circuits.items()}
+
+
+__all__ = ["CircuitBreaker", "CircuitOpenError", "Circuit", "FailureCodes"]
@@ -0,0 +1,530 @@
+import collections
+import math
+import queue
+import sys
+import threading
+import time
+import uuid
+import grpc
+from concurrent import futures
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+from space_api import constants
+from space_api.proto import server_pb2
+from space_api.response import Response, RawResponse
+from space_api.utils import encode_find
+
+# The encodings of the empty results of the get_one reads which are cached as negative results
+_empty = frozenset((b'', b'null', b'{}', b'[]'))
+
+# The comparisons of the find operators which are evaluated against the documents of the realtime feeds
+_tests = {'$gt': lambda a, b: a > b, '$lt': lambda a, b: a < b, '$gte': lambda a, b: a >= b,
+          '$lte': lambda a, b: a <= b, '$ne': lambda a, b: a != b, '$in': lambda a, b: a in b,
+          '$nin': lambda a, b: a not in b}
+
+# The value of the fields which cannot be told apart from the document, e.g. within arrays
+_unknown = object()
+
+
+def _sizeof(value) -> int:
+    """
+    Returns the approximate number of bytes a decoded result takes in memory, its nested values included
+    """
+    size = 0
+    values = [value]
+    while values:
+        value = values.pop()
+        size += sys.getsizeof(value)
+        if isinstance(value, dict):
+            values.extend(value.keys())
+            values.extend(value.values())
+        elif isinstance(value, list):
+            values.extend(value)
+    return size
+
+
+def _field(doc: dict, field: str):
+    value = doc
+    for part in field.split('.'):
+        if not isinstance(value, dict):
+            return _unknown
+        value = value.get(part)
+    return _unknown if isinstance(value, list) else value
+
+
+def _matches(find, doc) -> bool:
+    """
+    Tells whether a document may match find parameters, the operators which are not evaluated matching any document
+    """
+    if not isinstance(find, dict) or not isinstance(doc, dict):
+        return True
+    for field, value in find.items():
+        if field == '$or':
+            if isinstance(value, list) and not any(_matches(clause, doc) for clause in value):
+                return False
+            continue
+        if field.startswith('$'):
+            continue
+        actual = _field(doc, field)
+        if actual is _unknown:
+            continue
+        if isinstance(value, dict) and value and all(isinstance(op, str) and op.startswith('$') for op in value):
+            for op, operand in value.items():
+                test = _tests.get(op)
+                try:
+                    if test is not None and not test(actual, operand):
+                        return False
+                except TypeError:
+                    continue
+        elif actual != value:
+            return False
+    return True
+
+
+class _Watch:
+    """
+    What a cached read of a collection kept coherent by a realtime feed depends on
+
+    :param find: (dict) The find parameters of the read
+    :param ids: (FrozenSet[str]) The ids of the documents of its result, or None if a change of any document may
+        change it (e.g. counts, or reads skipping documents)
+    """
+    __slots__ = ('find', 'ids')
+
+    def __init__(self, find, ids: Optional[FrozenSet[str]]):
+        self.find = find
+        self.ids = ids
+
+    def changed_by(self, _type: str, doc_id: str, doc) -> bool:
+        """
+        Tells whether a change of a document may change the result of the read
+        """
+        if _type == constants.Insert:
+            return _matches(self.find, doc)
+        if self.ids is None or doc_id in self.ids:
+            return True
+        return _type == constants.Update and _matches(self.find, doc)
+
+
+class _Entry:
+    __slots__ = ('response', 'scope', 'size', 'expires', 'negative', 'refreshing', 'watch')
+
+    def __init__(self, response, scope: Tuple[str, str], size: int, expires: float, negative: bool,
+                 watch: Optional[_Watch] = None):
+        self.response = response
+        self.scope = scope
+        self.size = size
+        self.expires = expires
+        self.negative = negative
+        self.refreshing = False
+        self.watch = watch
+
+
+class _Feed:
+    """
+    The realtime feed of a collection, on the RealTime stream of the live queries, by which a read cache drops the
+    reads a change of a document may change
+
+    :param cache: (ReadCache) The cache
+    :param transport: (Transport) The transport to subscribe with
+    :param scope: (Tuple[str, str]) The database type and the collection
+    """
+
+    def __init__(self, cache: 'ReadCache', transport, scope: Tuple[str, str]):
+        self.cache = cache
+        self.transport = transport
+        self.scope = scope
+        self.id = str(uuid.uuid1())
+        # The requests of the stream, which ends at None
+        self.requests = queue.Queue()
+        self.call = None
+        # Whether the subscription was acknowledged, from when the changes of the collection are all fed
+        self.live = False
+
+    def _request(self, _type: str) -> server_pb2.RealTimeRequest:
+        codec = self.transport.codec
+        return server_pb2.RealTimeRequest(token=self.transport.token, dbType=self.scope[0],
+                                          project=self.transport.project_id, group=self.scope[1],
+                                          options=codec.dumps({"skipInitial": True}), type=_type, id=self.id,
+                                          where=encode_find({}, codec))
+
+    def start(self):
+        self.call = self.transport.stream_stub('RealTime').RealTime(iter(self.requests.get, None))
+        threading.Thread(target=self._run, daemon=True).start()
+        self.requests.put(self._request(constants.TypeRealtimeSubscribe))
+
+    def _run(self):
+        try:
+            for response in self.call:
+                if response.id != self.id:
+                    continue
+                if not response.ack:
+                    break
+                self.cache._on_feed(self, response.feedData)
+        except grpc.RpcError:
+            pass
+        finally:
+            self.cache._on_feed_lost(self)
+
+    def close(self):
+        self.requests.put(self._request(constants.TypeRealtimeUnsubscribe))
+        self.requests.put(None)
+        if self.call is not None:
+            self.call.cancel()
+
+
+class ReadCache:
+    """
+    Caches the successful reads of an API for a while, so that the reads of slow-changing data are answered without
+    a call
+
+    Reads are cached under their encoded request, which includes the meta (project, token, database type and
+    collection), the find and the read options. The inserts, updates, deletes and batches sent through the same API
+    drop the entries of their collections, both when sent and when answered. The cache is bounded both in entries and
+    in bytes of results, the least recently used entries being evicted first. The results are decoded before they are
+    cached, and count for the memory they take decoded (the raw results for their encoded size). As the Response is
+    shared, the callers should not modify its result
+
+    The reads of the live collections are kept coherent with the writes of every client instead, by a realtime feed
+    of their changes, on the same RealTime stream as the live queries. Once the feed is subscribed, their reads are
+    kept until a document is inserted, updated or deleted which they may depend on, i.e. which matches their find
+    parameters or is in their result
+    ::
+        from space_api import API
+        from space_api.cache import ReadCache
+        api = API("My-Project", "localhost:4124", cache=ReadCache(ttl=30, ttls={'countries': 3600, 'orders': 0},
+                                                                   stale_while_revalidate=10, live=['users']))
+        print(api.metrics()['cache'])
+
+    :param ttl: (float) The seconds reads are cached for (defaults to constants.CacheTTL)
+    :param ttls: (dict{str:float}) The (optional) seconds reads are cached for by collection, 0 not caching them
+    :param max_entries: (int) The maximum number of cached reads (defaults to constants.CacheMaxEntries)
+    :param max_bytes: (int) The maximum number of bytes of cached results, decoded results counting for the memory they
+        take (defaults to constants.CacheMaxBytes)
+    :param negative_ttl: (float) The seconds the get_one reads finding no document are cached for, 0 not caching them
+        (defaults to the ttl of their collection)
+    :param stale_while_revalidate: (float) The seconds an expired read is still answered from the cache while it is
+        read again in the background (defaults to 0)
+    :param live: (Iterable[str]) The (optional) collections whose reads are kept coherent by a realtime feed, and
+        cached as per their ttl while it is not subscribed
+    """
+
+    def __init__(self, ttl: float = constants.CacheTTL, ttls: Optional[Dict[str, float]] = None,
+                 max_entries: int = constants.CacheMaxEntries, max_bytes: int = constants.CacheMaxBytes,
+                 negative_ttl: Optional[float] = None, stale_while_revalidate: float = 0.0,
+                 live: Optional[Iterable[str]] = None):
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.live = frozenset(live or ())
+        self._transport = None
+        self._feeds: Dict[Tuple[str, str], _Feed] = {}
+        # The time from when the feeds which were lost may be subscribed again
+        self._retries: Dict[Tuple[str, str], float] = {}
+        self._closed = False
+        self._lock = threading.Lock()
+        self._entries: 'collections.OrderedDict[bytes, _Entry]' = collections.OrderedDict()
+        self._scopes: Dict[Tuple[str, str], set] = {}
+        # The number of invalidations of every scope, and of the whole cache, so that a read sent before an
+        # invalidation is not cached
+        self._generations: Dict[Tuple[str, str], int] = {}
+        self._epoch = 0
+        self._bytes = 0
+        self._counters = {'hits': 0, 'negative_hits': 0, 'stale_hits': 0, 'misses': 0, 'evictions': 0,
+                          'expirations': 0, 'invalidations': 0, 'refreshes': 0, 'feed_events': 0}
+
+    def _lookup(self, key: bytes) -> Tuple[Optional[_Entry], bool]:
+        """
+        Looks a read up
+
+        :return: (Tuple[_Entry, bool]) The entry answering the read, if any, and whether it has to be refreshed
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                now = time.monotonic()
+                if now < entry.expires:
+                    self._entries.move_to_end(key)
+                    self._counters['negative_hits' if entry.negative else 'hits'] += 1
+                    return entry, False
+                if now < entry.expires + self.stale_while_revalidate:
+                    self._entries.move_to_end(key)
+                    self._counters['stale_hits'] += 1
+                    refresh, entry.refreshing = not entry.refreshing, True
+                    return entry, refresh
+                self._remove(key)
+                self._counters['expirations'] += 1
+            self._counters['misses'] += 1
+            return None, False
+
+    def _generation(self, scope: Tuple[str, str]) -> Tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generations.get(scope, 0)
+
+    def _remove(self, key: bytes):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        keys = self._scopes[entry.scope]
+        keys.discard(key)
+        if not keys:
+            del self._scopes[entry.scope]
+
+    def _store(self, key: bytes, scope: Tuple[str, str], operation: str, response: Union[Response, RawResponse],
+               generation: Tuple[int, int], request=None):
+        """
+        Caches the response of a read, unless it failed or its collection was invalidated since it was sent. The
+        get_one reads finding no document are cached as negative results
+        """
+        if response.status == 404 and operation == 'one':
+            # The server answers the get_one reads finding no document with a 404
+            size, negative = 0, True
+        elif response.status != 200:
+            return
+        elif isinstance(response, RawResponse):
+            size = 0 if response.result is None else len(response.result)
+            negative = operation == 'one' and (response.result is None or bytes(response.result).strip() in _empty)
+        else:
+            # The result is decoded before the response is shared, the cache being charged for the decoded result
+            result = response.result
+            size = _sizeof(result)
+            negative = operation == 'one' and result in (None, {}, [])
+        ttl = self.ttls.get(scope[1], self.ttl)
+        if negative and self.negative_ttl is not None:
+            ttl = self.negative_ttl
+        watch = None
+        feed = self._feeds.get(scope)
+        if feed is not None and feed.live and request is not None:
+            # Kept until the feed reports a change it depends on, the feed being subscribed before the read was sent
+            # as otherwise the generation of the collection would have changed
+            watch = self._watch(scope, operation, response, request)
+            ttl = math.inf
+        size += len(key)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if (self._epoch, self._generations.get(scope, 0)) != generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(response, scope, size, time.monotonic() + ttl, negative, watch)
+            self._scopes.setdefault(scope, set()).add(key)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._counters['evictions'] += 1
+
+    def _watch(self, scope: Tuple[str, str], operation: str, response: Union[Response, RawResponse],
+               request) -> _Watch:
+        """
+        Returns what a read of a live collection depends on, from its request and its result
+        """
+        codec = self._transport.codec
+        if not isinstance(request, server_pb2.ReadRequest):
+            request = server_pb2.ReadRequest.FromString(request.SerializeToString())
+        find = codec.loads(request.find) if request.find else {}
+        ids = None
+        # The results of the reads skipping documents shift with the changes of the documents before them
+        if operation in ('one', 'all') and not request.options.skip:
+            if isinstance(response, RawResponse):
+                docs = None if response.result is None else codec.loads(bytes(response.result))
+            else:
+                docs = response.result
+            if response.status == 404:
+                docs = []
+            elif operation == 'one':
+                docs = [docs]
+            field = '_id' if scope[0] == constants.Mongo else 'id'
+            if isinstance(docs, list) and all(isinstance(doc, dict) and type(doc.get(field)) in (str, int)
+                                              for doc in docs):
+                ids = frozenset(str(doc[field]) for doc in docs)
+        return _Watch(find, ids)
+
+    def _refresh(self, key: bytes, scope: Tuple[str, str], operation: str, entry: _Entry,
+                 send_future: Callable[[], futures.Future], request):
+        """
+        Reads a stale entry again in the background
+        """
+        generation = self._generation(scope)
+        with self._lock:
+            self._counters['refreshes'] += 1
+
+        def on_done(f: futures.Future):
+            entry.refreshing = False
+            if not f.cancelled() and f.exception() is None:
+                self._store(key, scope, operation, f.result(), generation, request)
+
+        try:
+            send_future().add_done_callback(on_done)
+        except Exception:
+            entry.refreshing = False
+
+    def read(self, key: bytes, scope: Tuple[str, str], operation: str,
+             send: Callable[[], Union[Response, RawResponse]],
+             send_future: Callable[[], futures.Future], request=None) -> Union[Response, RawResponse]:
+        """
+        Answers a read from the cache, or sends it and caches its response
+
+        :param key: (bytes) The key of the read, e.g. its encoded request
+        :param scope: (Tuple[str, str]) The database type and the collection of the read
+        :param operation: (str) The operation of the read (one/all/distinct/count)
+        :param send: (Callable) The function sending the read and returning its Response
+        :param send_future: (Callable[[], futures.Future]) The function sending the read without blocking, to refresh
+            a stale entry
+        :param request: (server_pb2.ReadRequest) The (optional) request of the read, without which the reads of the
+            live collections are cached as per their ttl
+        :return: (Response) The response of the read
+        """
+        if scope[1] in self.live:
+            self._subscribe(scope)
+        entry, refresh = self._lookup(key)
+        if entry is not None:
+            if refresh:
+                self._refresh(key, scope, operation, entry, send_future, request)
+            return entry.response
+        generation = self._generation(scope)
+        response = send()
+        self._store(key, scope, operation, response, generation, request)
+        return response
+
+    def read_future(self, key: bytes, scope: Tuple[str, str], operation: str,
+                    send_future: Callable[[], futures.Future], request=None) -> futures.Future:
+        """
+        Answers a read from the cache, or sends it without blocking and caches its response (see read)
+
+        :return: (futures.Future[Response]) A future resolving to the response of the read
+        """
+        if scope[1] in self.live:
+            self._subscribe(scope)
+        entry, refresh = self._lookup(key)
+        if entry is not None:
+            if refresh:
+                self._refresh(key, scope, operation, entry, send_future, request)
+            future = futures.Future()
+            future.set_result(entry.response)
+            return future
+        generation = self._generation(scope)
+        future = send_future()
+
+        def on_done(f: futures.Future):
+            if not f.cancelled() and f.exception() is None:
+                self._store(key, scope, operation, f.result(), generation, request)
+
+        future.add_done_callback(on_done)
+        return future
+
+    def invalidate(self, db_type: str, col: str):
+        """
+        Drops the cached reads of a collection, and keeps the reads in flight from being cached
+
+        :param db_type: (str) The database type
+        :param col: (str) The collection name
+        """
+        with self._lock:
+            self._drop((db_type, col))
+
+    def _drop(self, scope: Tuple[str, str]):
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+        for key in list(self._scopes.get(scope, ())):
+            self._remove(key)
+            self._counters['invalidations'] += 1
+
+    def bind(self, transport):
+        """
+        Binds the cache to the transport it caches the reads of, with which it subscribes to the realtime feeds of
+        the live collections
+
+        :param transport: (Transport) The transport
+        """
+        self._transport = transport
+
+    def _subscribe(self, scope: Tuple[str, str]):
+        """
+        Subscribes to the realtime feed of a live collection, unless it is subscribed or was lost a moment ago
+        """
+        if scope in self._feeds or self._transport is None:
+            return
+        with self._lock:
+            if scope in self._feeds or self._closed or time.monotonic() < self._retries.get(scope, 0.0):
+                return
+            feed = self._feeds[scope] = _Feed(self, self._transport, scope)
+        try:
+            feed.start()
+        except Exception:
+            self._on_feed_lost(feed)
+
+    def _on_feed(self, feed: _Feed, rows: List[server_pb2.FeedData]):
+        """
+        Drops the cached reads which the changes of a realtime feed may change
+        """
+        loads = feed.transport.codec.loads
+        changes = [(row.type, row.docId, loads(row.payload) if row.payload else None)
+                   for row in rows if row.type != constants.Initial]
+        scope = feed.scope
+        with self._lock:
+            if self._feeds.get(scope) is not feed:
+                return
+            if not feed.live:
+                # The reads cached before the subscription may have missed changes
+                feed.live = True
+                self._drop(scope)
+            if not changes:
+                return
+            self._counters['feed_events'] += len(changes)
+            # The reads in flight may have been answered before the changes
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+            for key in list(self._scopes.get(scope, ())):
+                watch = self._entries[key].watch
+                if watch is None or any(watch.changed_by(*change) for change in changes):
+                    self._remove(key)
+                    self._counters['invalidations'] += 1
+
+    def _on_feed_lost(self, feed: _Feed):
+        """
+        Drops the cached reads of a collection whose realtime feed was lost, which is subscribed again on a later read
+        """
+        with self._lock:
+            if self._feeds.get(feed.scope) is not feed:
+                return
+            del self._feeds[feed.scope]
+            self._retries[feed.scope] = time.monotonic() + constants.CacheFeedRetry
+            self._drop(feed.scope)
+
+    def close(self):
+        """
+        Unsubscribes from the realtime feeds, dropping the cached reads of the live collections
+        """
+        with self._lock:
+            self._closed = True
+            feeds, self._feeds = list(self._feeds.values()), {}
+            for feed in feeds:
+                self._drop(feed.scope)
+        for feed in feeds:
+            feed.close()
+
+    def clear(self):
+        """
+        Drops all the cached reads, and keeps the reads in flight from being cached
+        """
+        with self._lock:
+            self._epoch += 1
+            self._counters['invalidations'] += len(self._entries)
+            self._entries.clear()
+            self._scopes.clear()
+            self._bytes = 0
+
+    def metrics(self) -> dict:
+        """
+        Returns the cache counters
+
+        :return: (dict) The number of hits (fresh, negative and stale), misses, evictions, expirations, invalidated
+            entries, background refreshes and changes fed, and the number of entries, of bytes cached and of live
+            feeds
+        """
+        with self._lock:
+            return dict(self._counters, entries=len(self._entries), bytes=self._bytes,
+                        feeds=sum(1 for feed in self._feeds.values() if feed.live))
+
+
+__all__ = ["ReadCache"]
@@ -0,0 +1,217 @@
+import threading
+from concurrent import futures
+from typing import Callable, Iterable, Optional
+from space_api.deadline import remaining
+from space_api.hedging import Scheduler
+
+# CoalescedRPCs are the unary RPCs whose identical concurrent calls are coalesced by default
+CoalescedRPCs = frozenset(("Read",))
+
+# The error of resolving a future which is already done (Python 3.8+, earlier versions resolve it anyway)
+_InvalidStateError = getattr(futures, 'InvalidStateError', ())
+
+
+class Coalescer:
+    """
+    Coalesces identical concurrent calls (singleflight), so that only one of them is sent and every caller gets the
+    same Response object
+
+    Calls are identical if their RPC and encoded request, which includes the meta (project, token, database type and
+    collection), the find and the read options, are equal. A call only joins a call in flight; once answered, the next
+    identical call is sent again. As the Response is shared, the callers should not modify its result
+    ::
+        from space_api import API
+        from space_api.coalescing import Coalescer
+        api = API("My-Project", "localhost:4124", coalescer=Coalescer())
+        print(api.metrics()['coalescing'])
+
+    :param rpcs: (Iterable[str]) The RPCs which are coalesced (defaults to CoalescedRPCs), which must be idempotent
+    """
+
+    def __init__(self, rpcs: Iterable[str] = CoalescedRPCs):
+        self.rpcs = frozenset(rpcs)
+        self._lock = threading.Lock()
+        # Expires the futures of the callers whose deadline passes while they wait for the call in flight
+        self._scheduler = Scheduler()
+        self._in_flight = {}
+        self._counters = {'calls': 0, 'coalesced': 0}
+
+    def applies(self, rpc: str) -> bool:
+        """
+        Returns whether the calls of an RPC are coalesced
+
+        :param rpc: (str) The name of the RPC
+        :return: (bool) Whether the RPC is coalesced
+        """
+        return rpc in self.rpcs
+
+    @staticmethod
+    def key(rpc: str, request) -> bytes:
+        """
+        Returns the key under which identical calls are coalesced
+
+        :param rpc: (str) The name of the RPC
+        :param request: The gRPC request object
+        :return: (bytes) The key
+        """
+        # Maps (e.g. the select and sort of the read options) are only encoded in a stable order if asked to
+        return rpc.encode() + b'\0' + request.SerializeToString(deterministic=True)
+
+    def _join(self, key: bytes):
+        """
+        Joins the call in flight under the key, or registers a new one
+
+        :param key: (bytes) The key of the call
+        :return: (Tuple[futures.Future, bool]) The shared future of the call, and whether the caller has to send it
+        """
+        with self._lock:
+            self._counters['calls'] += 1
+            shared = self._in_flight.get(key)
+            if shared is not None:
+                self._counters['coalesced'] += 1
+                shared.waiters += 1
+                return shared, False
+            shared = self._in_flight[key] = futures.Future()
+            shared.waiters = 1
+            return shared, True
+
+    def _forget(self, key: bytes, shared: futures.Future):
+        with self._lock:
+            if self._in_flight.get(key) is shared:
+                del self._in_flight[key]
+
+    def _leave(self, key: bytes, shared: futures.Future):
+        """
+        Stops waiting for a call, which is cancelled once no caller waits for it
+
+        :param key: (bytes) The key of the call
+        :param shared: (futures.Future) The shared future of the call
+        """
+        with self._lock:
+            shared.waiters -= 1
+            last = shared.waiters == 0
+        call = getattr(shared, 'call', None)
+        if last and call is not None:
+            # Identical calls made from now on must not join the cancelled one
+            self._forget(key, shared)
+            call.cancel()
+
+    def do(self, key: bytes, send: Callable, at: Optional[float] = None,
+           expired: Callable[[], BaseException] = futures.TimeoutError):
+        """
+        Sends a call, or waits for the identical call in flight
+
+        :param key: (bytes) The key of the call
+        :param send: (Callable) The function sending the call and returning its Response
+        :param at: (float) The deadline of the caller as a time.monotonic() timestamp, if any, which bounds its wait
+            for the call in flight
+        :param expired: (Callable[[], BaseException]) Makes the error raised if the deadline passes while waiting
+            (defaults to futures.TimeoutError)
+        :return: (Response) The response of the call
+        """
+        shared, leader = self._join(key)
+        if not leader:
+            try:
+                return shared.result(timeout=remaining(at))
+            except futures.TimeoutError:
+                if not shared.done():
+                    self._leave(key, shared)
+                    raise expired() from None
+                # The call was answered meanwhile
+                return shared.result()
+        try:
+            response = send()
+        except BaseException as e:
+            self._forget(key, shared)
+            shared.set_exception(e)
+            raise
+        self._forget(key, shared)
+        shared.set_result(response)
+        return response
+
+    def do_future(self, key: bytes, send: Callable[[], futures.Future], at: Optional[float] = None,
+                  expired: Callable[[], BaseException] = futures.TimeoutError) -> futures.Future:
+        """
+        Sends a call without blocking, or joins the identical call in flight
+
+        Every caller gets a future of its own; the call itself is only cancelled once all of them are cancelled or
+        expired
+
+        :param key: (bytes) The key of the call
+        :param send: (Callable[[], futures.Future]) The function sending the call and returning a future of its
+            Response
+        :param at: (float) The deadline of the caller as a time.monotonic() timestamp, if any, which bounds its wait
+            for the call in flight
+        :param expired: (Callable[[], BaseException]) Makes the error set if the deadline passes while waiting
+            (defaults to futures.TimeoutError)
+        :return: (futures.Future[Response]) A future resolving to the response of the call
+        """
+        shared, leader = self._join(key)
+        waiter = futures.Future()
+        timer = None
+        if leader:
+            try:
+                call = send()
+            except Exception as e:
+                self._forget(key, shared)
+                shared.set_exception(e)
+                call = None
+            if call is not None:
+                shared.call = call
+
+                def on_call_done(f: futures.Future):
+                    self._forget(key, shared)
+                    if f.cancelled():
+                        shared.cancel()
+                    elif f.exception() is not None:
+                        shared.set_exception(f.exception())
+                    else:
+                        shared.set_result(f.result())
+
+                call.add_done_callback(on_call_done)
+        elif at is not None:
+            def expire():
+                if not shared.done():
+                    _settle(waiter.set_exception, expired())
+
+            # The leader's own call is already bounded by its deadline
+            timer = self._scheduler.call_later(max(remaining(at), 0), expire)
+
+        def on_shared_done(f: futures.Future):
+            if f.cancelled():
+                waiter.cancel()
+            elif f.exception() is not None:
+                _settle(waiter.set_exception, f.exception())
+            else:
+                _settle(waiter.set_result, f.result())
+
+        def on_waiter_done(f: futures.Future):
+            self._scheduler.cancel(timer)
+            if not shared.done():
+                self._leave(key, shared)
+
+        waiter.add_done_callback(on_waiter_done)
+        shared.add_done_callback(on_shared_done)
+        return waiter
+
+    def metrics(self) -> dict:
+        """
+        Returns the coalescing counters
+
+        :return: (dict) The number of calls, and of calls which joined an identical call in flight
+        """
+        with self._lock:
+            return dict(self._counters)
+
+
+def _settle(resolve: Callable, outcome):
+    """
+    Resolves a future unless it is already done, e.g. cancelled or expired by another thread
+    """
+    try:
+        resolve(outcome)
+    except _InvalidStateError:
+        pass
+
+
+__all__ = ["Coalescer", "CoalescedRPCs"]
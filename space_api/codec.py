@@ -0,0 +1,206 @@
+import json
+import re
+import threading
+from typing import Callable, Dict, Iterator, Optional, Union
+from space_api import constants
+
+
+_whitespace = re.compile(rb'[ \t\n\r]*')
+# The runs of a JSON value up to its next bracket or comma, or up to its next bracket within nested values. Strings,
+# and values nested up to two levels deep, are skipped whole, so that the brackets and commas within them are not taken
+# for delimiters. The patterns are unrolled loops, which match in a single way and hence do not backtrack exponentially
+_string = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_flat = rb'[\[{][^"\[\]{}]*(?:' + _string + rb'[^"\[\]{}]*)*[\]}]'
+_nested = rb'[\[{][^"\[\]{}]*(?:(?:' + _string + rb'|' + _flat + rb')[^"\[\]{}]*)*[\]}]'
+_run = re.compile(rb'[^"\[\]{},]*(?:(?:' + _string + rb'|' + _nested + rb')[^"\[\]{},]*)*')
+_nested_run = re.compile(rb'[^"\[\]{}]*(?:(?:' + _string + rb'|' + _nested + rb')[^"\[\]{}]*)*')
+_opening, _closing, _comma = frozenset(b'[{'), frozenset(b']}'), ord(',')
+
+
+class JSONCodec:
+    """
+    The JSON codec of the documents, queries and results, based on the standard library's json
+
+    The other codecs wrap faster JSON libraries, and fall back to json for the values those libraries cannot encode
+    ::
+        from space_api import API
+        api = API("My-Project", "localhost:4124", codec="orjson")
+    """
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        """
+        Encodes a value to compact JSON
+
+        :param obj: A JavaScript object-like variable
+        :return: (bytes) The utf-8 bytes of the encoded value
+        """
+        return json.dumps(obj, separators=(',', ':')).encode(encoding='utf-8')
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]):
+        """
+        Decodes a JSON value
+
+        :param data: (bytes, bytearray, memoryview or str) The encoded value
+        :return: The decoded value
+        """
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+    def iter_array(self, data: Union[bytes, bytearray, memoryview]) -> Iterator:
+        """
+        Decodes the elements of a JSON array one at a time, so that only the element being used is held decoded. A
+        value which is not an array is yielded as a single element, unless it is null
+
+        The bounds of the elements are found on the encoded bytes, every element then being decoded with the codec. The
+        values nested more than two levels deep within an element are scanned bracket by bracket, which is slower
+
+        :param data: (bytes, bytearray or memoryview) The encoded array
+        :return: (Iterator) The decoded elements
+        """
+        view = memoryview(data)
+        pos = _whitespace.match(view).end()
+        if view[pos:pos + 1] != b'[':
+            value = self.loads(data)
+            if value is not None:
+                yield value
+            return
+        depth = 0
+        start = first = pos = pos + 1
+        while True:
+            pos = (_nested_run if depth else _run).match(view, pos).end()
+            if pos == len(view):
+                raise ValueError("The JSON array is not terminated")
+            char = view[pos]
+            if char in _opening:
+                depth += 1
+            elif char in _closing:
+                if depth:
+                    depth -= 1
+                else:
+                    # An empty array has no element
+                    if start != first or _whitespace.match(view, start, pos).end() != pos:
+                        yield self.loads(view[start:pos])
+                    return
+            elif char == _comma:
+                yield self.loads(view[start:pos])
+                start = pos + 1
+            else:
+                raise ValueError(f"Invalid JSON string at position {pos}")
+            pos += 1
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    The JSON codec based on orjson, which encodes straight to bytes (see JSONCodec)
+    """
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        # Keys which are not strings are encoded as strings, as json does
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj) -> bytes:
+        try:
+            return self._orjson.dumps(obj, option=self._options)
+        except TypeError:
+            # e.g. integers above 64 bits
+            return super().dumps(obj)
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]):
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """
+    The JSON codec based on ujson (see JSONCodec)
+    """
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, obj) -> bytes:
+        try:
+            return self._ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode(encoding='utf-8')
+        except (TypeError, OverflowError):
+            return super().dumps(obj)
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]):
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return self._ujson.loads(data)
+
+
+class SimdjsonCodec(JSONCodec):
+    """
+    The JSON codec decoding with pysimdjson, and encoding with json (see JSONCodec)
+    """
+    name = "simdjson"
+
+    def __init__(self):
+        import simdjson
+        self._simdjson = simdjson
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]):
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return self._simdjson.loads(data)
+
+
+_lock = threading.Lock()
+_factories: Dict[str, Callable[[], JSONCodec]] = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+    SimdjsonCodec.name: SimdjsonCodec,
+}
+_default: Optional[JSONCodec] = None
+
+
+def register(name: str, factory: Callable[[], JSONCodec]):
+    """
+    Registers a JSON codec under a name
+    ::
+        from space_api import codec
+        codec.register("rapidjson", RapidjsonCodec)
+        api = API("My-Project", "localhost:4124", codec="rapidjson")
+
+    :param name: (str) The name of the codec
+    :param factory: (Callable[[], JSONCodec]) The function making the codec, which raises ImportError if the codec is
+        not installed
+    """
+    with _lock:
+        _factories[name] = factory
+
+
+def get_codec(codec: Union[str, JSONCodec, None] = None) -> JSONCodec:
+    """
+    Returns a JSON codec
+
+    :param codec: (str or JSONCodec) The codec, or the name it is registered under, or None for the first one of
+        constants.JSONCodecs which is installed
+    :return: (JSONCodec) The codec
+    """
+    global _default
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is not None:
+        if codec not in _factories:
+            raise ValueError(f"Unknown JSON codec {codec}, expected one of {', '.join(_factories)}")
+        return _factories[codec]()
+    if _default is None:
+        for name in constants.JSONCodecs:
+            try:
+                _default = _factories[name]()
+                break
+            except ImportError:
+                continue
+    return _default
+
+
+__all__ = ["JSONCodec", "OrjsonCodec", "UjsonCodec", "SimdjsonCodec", "register", "get_codec"]
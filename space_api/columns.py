@@ -0,0 +1,105 @@
+import array
+import collections
+from typing import Dict, Iterable, List, Optional
+
+# A column of a result: its values, and the mask of its nulls (1 where the document has no value for the field)
+Column = collections.namedtuple("Column", ["values", "mask"])
+
+# The array typecodes of the types which have none of their own
+_typecodes = {'?': 'b'}
+
+
+def _numpy(required: bool = True):
+    try:
+        import numpy
+    except ImportError:
+        if required:
+            raise ImportError("NumPy is needed for this conversion, install it with pip install space-api-py[numpy]")
+        return None
+    return numpy
+
+
+def _getter(field: str):
+    if '.' not in field:
+        return lambda doc: doc.get(field)
+    path = field.split('.')
+
+    def get(doc):
+        for part in path:
+            if not isinstance(doc, dict):
+                return None
+            doc = doc.get(part)
+        return doc
+
+    return get
+
+
+def to_columns(docs: Iterable[dict], fields: List[str], dtypes: Optional[Dict[str, str]] = None,
+               use_numpy: Optional[bool] = None) -> Dict[str, Column]:
+    """
+    Turns documents into columns, in a single pass over them, so that they can be consumed one at a time
+
+    The typed columns are filled in array.array objects, which NumPy then wraps without copying them. Nulls and missing
+    values are masked, and filled with NaN in the float columns and 0 in the other typed columns
+    ::
+        columns = to_columns(docs, ['id', 'price', 'seller.name'], {'id': 'q', 'price': 'd'})
+        print(columns['price'].values.mean())
+
+    :param docs: (Iterable[dict]) The documents
+    :param fields: (List[str]) The fields to make columns of, nested fields being joined by dots
+    :param dtypes: (dict{str:str}) The array typecodes of the fields, e.g. 'q' (int64), 'd' (float64) or '?' (bool);
+        the other fields are kept as Python objects
+    :param use_numpy: (bool) Whether to return NumPy arrays (defaults to whether NumPy is installed)
+    :return: (dict{str:Column}) The columns by field, as array.array objects (lists for the object columns) or NumPy
+        arrays
+    """
+    dtypes = dtypes or {}
+    columns = []
+    for field in fields:
+        dtype = dtypes.get(field, 'O')
+        values = [] if dtype == 'O' else array.array(_typecodes.get(dtype, dtype))
+        fill = None if dtype == 'O' else float('nan') if dtype in ('f', 'd') else 0
+        columns.append((_getter(field), values, array.array('b'), fill))
+    for doc in docs:
+        for get, values, mask, fill in columns:
+            value = get(doc)
+            if value is None:
+                values.append(fill)
+                mask.append(1)
+            else:
+                values.append(value)
+                mask.append(0)
+    result = {field: Column(values, mask) for field, (_, values, mask, _) in zip(fields, columns)}
+    numpy = _numpy(required=bool(use_numpy))
+    if numpy is not None and use_numpy is not False:
+        for field, column in result.items():
+            dtype = dtypes.get(field, 'O')
+            if dtype == 'O':
+                values = numpy.empty(len(column.values), dtype=object)
+                values[:] = column.values
+            else:
+                values = numpy.frombuffer(column.values, dtype=numpy.dtype(dtype))
+            result[field] = Column(values, numpy.frombuffer(column.mask, dtype=bool))
+    return result
+
+
+def to_records(docs: Iterable[dict], fields: List[str], dtypes: Optional[Dict[str, str]] = None):
+    """
+    Turns documents into a NumPy structured array, in a single pass over them (see to_columns)
+
+    :param docs: (Iterable[dict]) The documents
+    :param fields: (List[str]) The fields of the records, nested fields being joined by dots
+    :param dtypes: (dict{str:str}) The array typecodes of the fields; the other fields are kept as Python objects
+    :return: (numpy.ndarray) The structured array, with one record per document
+    """
+    numpy = _numpy()
+    dtypes = dtypes or {}
+    columns = to_columns(docs, fields, dtypes, use_numpy=True)
+    size = len(columns[fields[0]].values) if fields else 0
+    records = numpy.empty(size, dtype=[(field, numpy.dtype(dtypes.get(field, 'O'))) for field in fields])
+    for field in fields:
+        records[field] = columns[field].values
+    return records
+
+
+__all__ = ["Column", "to_columns", "to_records"]
@@ -0,0 +1,95 @@
+import threading
+import time
+import zlib
+from typing import Optional
+import grpc
+from space_api import constants
+
+
+class Compression:
+    """
+    An adaptive, per call compression policy for the unary requests of a Transport
+
+    Only the requests whose encoded size reaches the threshold are compressed. gRPC compresses the messages in its
+    core, so the bytes saved and the CPU time spent are estimated by compressing one in every `sample_every`
+    compressed requests with zlib, and scaling the result up to all the compressed bytes
+    ::
+        from space_api import API
+        from space_api.compression import Compression
+        api = API("My-Project", "localhost:4124", compression=Compression(threshold=256 * 1024))
+        print(api.metrics()['compression'])
+
+    :param algorithm: (grpc.Compression) The algorithm, grpc.Compression.Gzip (default) or grpc.Compression.Deflate
+    :param threshold: (int) The encoded size (in bytes) from which a request is compressed
+        (defaults to constants.CompressionThreshold)
+    :param sample_every: (int) Measure the compression of one in every `sample_every` compressed requests
+        (defaults to 16)
+    """
+
+    def __init__(self, algorithm: grpc.Compression = grpc.Compression.Gzip,
+                 threshold: int = constants.CompressionThreshold, sample_every: int = 16):
+        if algorithm not in (grpc.Compression.Gzip, grpc.Compression.Deflate):
+            raise ValueError("The algorithm should be grpc.Compression.Gzip or grpc.Compression.Deflate")
+        self.algorithm = algorithm
+        self.threshold = threshold
+        self.sample_every = max(1, sample_every)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.compressed_calls = 0
+        self.compressed_bytes = 0
+        self.sampled_bytes = 0
+        self.sampled_saved_bytes = 0
+        self.sampled_seconds = 0.0
+
+    def choose(self, request) -> Optional[grpc.Compression]:
+        """
+        Picks the compression for a request
+
+        :param request: The gRPC request object
+        :return: (grpc.Compression) The compression algorithm, or None to send the request uncompressed
+        """
+        size = request.ByteSize()
+        with self._lock:
+            self.calls += 1
+            if size < self.threshold:
+                return None
+            self.compressed_calls += 1
+            self.compressed_bytes += size
+            sample = (self.compressed_calls - 1) % self.sample_every == 0
+        if sample:
+            self._sample(request.SerializeToString())
+        return self.algorithm
+
+    def _sample(self, payload: bytes):
+        """
+        Measures the compression ratio and the CPU time spent on a payload
+
+        :param payload: (bytes) The encoded request
+        """
+        start = time.process_time()
+        compressed = zlib.compress(payload)
+        elapsed = time.process_time() - start
+        with self._lock:
+            self.sampled_bytes += len(payload)
+            self.sampled_saved_bytes += len(payload) - len(compressed)
+            self.sampled_seconds += elapsed
+
+    def metrics(self) -> dict:
+        """
+        Returns the compression counters
+
+        :return: (dict) The number of calls, of compressed calls and bytes, and the estimated bytes saved and CPU
+            seconds spent on compression
+        """
+        with self._lock:
+            scale = self.compressed_bytes / self.sampled_bytes if self.sampled_bytes else 0
+            return {
+                'calls': self.calls,
+                'compressed_calls': self.compressed_calls,
+                'compressed_bytes': self.compressed_bytes,
+                'estimated_bytes_saved': int(self.sampled_saved_bytes * scale),
+                'estimated_cpu_seconds': self.sampled_seconds * scale,
+            }
+
+
+__all__ = ["Compression"]
@@ -26,6 +26,9 @@ TypeRealtimeFeed = "realtime-feed"
 # PayloadSize is the size of the payload(in bytes) in file upload and download
 PayloadSize = 256 * 1024  # 256 kB
 
+# CompressionThreshold is the default encoded size(in bytes) from which a request is compressed
+CompressionThreshold = 64 * 1024  # 64 kB
+
 # TypePubsubSubscribe is type triggering a pubsub subscribe
 TypePubsubSubscribe = "pubsub-subscribe"
 
@@ -37,3 +40,62 @@ TypePubsubUnsubscribe = "pubsub-unsubscribe"
 
 # TypePubsubUnsubscribeAll is type triggering a pubsub unsubscribe all
 TypePubsubUnsubscribeAll = "pubsub-unsubscribe-all"
+
+# RoundRobin spreads the unary calls of a channel pool over its channels in turn
+RoundRobin = "round-robin"
+
+# LeastOutstanding sends each unary call of a channel pool to the channel with the fewest calls in flight
+LeastOutstanding = "least-outstanding"
+
+# EWMALatency sends each unary call of a channel pool to the endpoint with the lowest EWMA latency, weighted by its
+# calls in flight
+EWMALatency = "ewma-latency"
+
+# HealthCheckInterval is the default number of seconds between the active health checks of the endpoints of a pool
+HealthCheckInterval = 5.0
+
+# DrainTimeout is the maximum number of seconds a replaced pool waits for its unary calls in flight before it is closed
+DrainTimeout = 30.0
+
+# EjectAfterFailures is the default number of consecutive UNAVAILABLE calls which ejects an endpoint of a pool
+EjectAfterFailures = 3
+
+# CircuitClosed is the state of a circuit which lets the calls through
+CircuitClosed = "closed"
+
+# CircuitOpen is the state of a circuit which fails the calls fast
+CircuitOpen = "open"
+
+# CircuitHalfOpen is the state of a circuit which lets a few trial calls through, to decide whether to close again
+CircuitHalfOpen = "half-open"
+
+# FunctionDeadlineMargin is the number of seconds a function call is given on top of its timeout, so that the server
+# times it out first
+FunctionDeadlineMargin = 1
+
+# MetaCacheSize is the default maximum number of encoded Meta an encoder keeps
+MetaCacheSize = 1024
+
+# FindCacheSize is the maximum number of conditions whose compiled find parameters are memoized
+FindCacheSize = 1024
+
+# JSONCodecs are the JSON codecs, in order of preference, of which the first one installed is used by default
+JSONCodecs = ("orjson", "ujson", "simdjson", "json")
+
+# CacheTTL is the default number of seconds a read cache keeps the reads for
+CacheTTL = 60.0
+
+# CacheMaxEntries is the default maximum number of reads a read cache keeps
+CacheMaxEntries = 1024
+
+# CacheMaxBytes is the default maximum number of bytes of results a read cache keeps
+CacheMaxBytes = 64 * 1024 * 1024
+
+# CacheFeedRetry is the number of seconds a read cache waits before subscribing again to a realtime feed it lost
+CacheFeedRetry = 5.0
+
+# LoaderWindow is the default number of seconds a loader collects the keys of a read for
+LoaderWindow = 0.002
+
+# LoaderMaxKeys is the default maximum number of keys a loader reads at once
+LoaderMaxKeys = 1000
@@ -1,5 +1,7 @@
+from concurrent import futures
+from typing import Optional, Union
 from space_api.transport import Transport
-from space_api.response import Response
+from space_api.response import Response, RawResponse
 
 
 class Aggregate:
@@ -37,15 +39,32 @@ class Aggregate:
         self.params['pipe'] = pipe_obj
         return self
 
-    def apply(self) -> Response:
+    def apply(self, timeout: Optional[float] = None, raw: bool = False) -> Union[Response, RawResponse]:
         """
         Triggers the aggregate request
         ::
             response = db.aggr('posts').pipe([...]).apply()
 
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :param raw: (bool) Whether to leave the result JSON encoded, in a RawResponse (defaults to False)
         :return: (Response) The response object containing values corresponding to the request
         """
-        return self.transport.aggregate(self.params['pipe'], self.operation, self.db_type, self.collection)
+        return self.transport.aggregate(self.params['pipe'], self.operation, self.db_type, self.collection,
+                                        timeout=timeout, raw=raw)
+
+    def apply_async(self, timeout: Optional[float] = None, raw: bool = False) -> futures.Future:
+        """
+        Triggers the aggregate request without blocking
+        ::
+            future = db.aggr('posts').pipe([...]).apply_async()
+            response = future.result()
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :param raw: (bool) Whether to leave the result JSON encoded, in a RawResponse (defaults to False)
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        return self.transport.aggregate_future(self.params['pipe'], self.operation, self.db_type, self.collection,
+                                               timeout=timeout, raw=raw)
 
 
 __all__ = ['Aggregate']
@@ -1,6 +1,8 @@
-from typing import Union
+from concurrent import futures
+from typing import Optional, Union
 from space_api.transport import Transport
-from space_api.utils import obj_to_utf8_bytes
+from space_api.response import Response
+from space_api.utils import encode_find
 from space_api.proto import server_pb2
 from space_api.db.delete import Delete
 from space_api.db.insert import Insert
@@ -37,24 +39,24 @@ class Batch:
         all_request = server_pb2.AllRequest()
         if isinstance(request, Insert):
             all_request.col = request.collection
-            all_request.document = obj_to_utf8_bytes(request.document)
+            all_request.document = self.transport.codec.dumps(request.document)
             all_request.operation = request.operation
             all_request.type = "create"
         if isinstance(request, Update):
             all_request.col = request.collection
             all_request.operation = request.operation
-            all_request.find = obj_to_utf8_bytes(request.params['find'])
-            all_request.update = obj_to_utf8_bytes(request.params['update'])
+            all_request.find = encode_find(request.params['find'], self.transport.codec)
+            all_request.update = self.transport.codec.dumps(request.params['update'])
             all_request.type = "update"
         if isinstance(request, Delete):
             all_request.col = request.collection
             all_request.operation = request.operation
-            all_request.find = obj_to_utf8_bytes(request.params['find'])
+            all_request.find = encode_find(request.params['find'], self.transport.codec)
             all_request.type = "delete"
         self.requests.append(all_request)
         return self
 
-    def apply(self):
+    def apply(self, retry: Optional[bool] = None, timeout: Optional[float] = None) -> Response:
         """
         Triggers the batch request
         ::
@@ -62,9 +64,27 @@ class Batch:
             batch_obj.add(...)
             response = batch_obj.apply()
 
+        :param retry: (bool) Whether the request may be retried as per the API's retry policy (defaults to the
+            policy's retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
         :return: (Response) The response object containing values corresponding to the request
         """
-        return self.transport.batch(self.requests, self.db_type)
+        return self.transport.batch(self.requests, self.db_type, retry=retry, timeout=timeout)
+
+    def apply_async(self, retry: Optional[bool] = None, timeout: Optional[float] = None) -> futures.Future:
+        """
+        Triggers the batch request without blocking
+        ::
+            batch_obj = db.begin_batch()
+            batch_obj.add(...)
+            response = batch_obj.apply_async().result()
+
+        :param retry: (bool) Whether the request may be retried as per the API's retry policy (defaults to the
+            policy's retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        return self.transport.batch_future(self.requests, self.db_type, retry=retry, timeout=timeout)
 
 
 __all__ = ['Batch']
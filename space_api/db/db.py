@@ -1,4 +1,5 @@
 from typing import Optional
+from space_api import constants
 from space_api.transport import Transport
 from space_api.db.get import Get
 from space_api.db.insert import Insert
@@ -6,6 +7,9 @@ from space_api.db.update import Update
 from space_api.db.delete import Delete
 from space_api.db.aggregate import Aggregate
 from space_api.db.batch import Batch
+from space_api.db.scan import Scan
+from space_api.db.prepared import PreparedQuery
+from space_api.db.loader import Loader
 from space_api.response import Response
 from space_api.livequery import LiveQuery
 
@@ -66,6 +70,23 @@ class DB:
         """
         return Get(self.transport, collection, self.db_type, operation='distinct')
 
+    def scan(self, collection: str, partitions: int = 4, key: str = 'id', boundaries: Optional[list] = None,
+             ordered: bool = False) -> 'Scan':
+        """
+        Returns a DB Scan object, which reads the collection in partitions of the key space, all of them at once
+        ::
+            for doc in db.scan('events', partitions=8, key='id').apply():
+                process(doc)
+
+        :param collection: (str) The collection name
+        :param partitions: (int) The number of partitions (defaults to 4)
+        :param key: (str) The field to partition by (defaults to 'id')
+        :param boundaries: (list) The (optional) values of the key between the partitions (sampled if not given)
+        :param ordered: (bool) Whether to yield the documents in the order of the key (defaults to False)
+        :return: The DB Scan object
+        """
+        return Scan(self.transport, collection, self.db_type, partitions, key, boundaries, ordered)
+
     def insert(self, collection: str) -> 'Insert':
         """
         Returns a DB Insert object
@@ -150,6 +171,38 @@ class DB:
         """
         return Batch(self.transport, self.db_type)
 
+    def prepare(self, builder) -> PreparedQuery:
+        """
+        Prepares a query holding Param placeholders, which is encoded once and then bound to values many times
+        ::
+            from space_api import COND, Param
+            user = db.prepare(db.get_one('users').where(COND('id', '==', Param('id'))))
+            response = user.bind(id=42).apply()
+
+        :param builder: (Get, Insert, Update, Delete or Aggregate) The query
+        :return: (PreparedQuery) The prepared query
+        """
+        return PreparedQuery(builder)
+
+    def loader(self, collection: str, key: str = 'id', window: float = constants.LoaderWindow,
+               max_keys: int = constants.LoaderMaxKeys, cache: bool = True,
+               timeout: Optional[float] = None) -> Loader:
+        """
+        Returns a DB Loader object, which batches the lookups of documents by key into single reads
+        ::
+            users = db.loader('users', key='id')
+            author = users.load(post['author_id']).result()
+
+        :param collection: (str) The collection name
+        :param key: (str) The field to look the documents up by (defaults to 'id')
+        :param window: (float) The seconds the keys are collected for (defaults to constants.LoaderWindow)
+        :param max_keys: (int) The maximum number of keys read at once (defaults to constants.LoaderMaxKeys)
+        :param cache: (bool) Whether to cache the documents loaded (defaults to True)
+        :param timeout: (float) The (optional) timeout of every read in seconds (defaults to the API's timeout)
+        :return: (Loader) The DB Loader object
+        """
+        return Loader(self.transport, collection, self.db_type, key, window, max_keys, cache, timeout)
+
     def live_query(self, collection: str) -> LiveQuery:
         """
         Returns a DB LiveQuery object
@@ -1,3 +1,5 @@
+from concurrent import futures
+from typing import Optional
 from space_api.utils import generate_find, AND
 from space_api.transport import Transport
 from space_api.response import Response
@@ -34,13 +36,32 @@ class Delete:
         self.params['find'] = generate_find(AND(*conditions))
         return self
 
-    def apply(self) -> Response:
+    def apply(self, retry: Optional[bool] = None, timeout: Optional[float] = None) -> Response:
         """
         Triggers the delete request
 
+        :param retry: (bool) Whether the request may be retried as per the API's retry policy (defaults to the
+            policy's retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
         :return: (Response) The response object containing values corresponding to the request
         """
-        return self.transport.delete(self.params['find'], self.operation, self.db_type, self.collection)
+        return self.transport.delete(self.params['find'], self.operation, self.db_type, self.collection,
+                                     retry=retry, timeout=timeout)
+
+    def apply_async(self, retry: Optional[bool] = None, timeout: Optional[float] = None) -> futures.Future:
+        """
+        Triggers the delete request without blocking
+        ::
+            future = db.delete('posts').where(COND('title', '==', 'Title1')).apply_async()
+            response = future.result()
+
+        :param retry: (bool) Whether the request may be retried as per the API's retry policy (defaults to the
+            policy's retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        return self.transport.delete_future(self.params['find'], self.operation, self.db_type, self.collection,
+                                            retry=retry, timeout=timeout)
 
 
 __all__ = ['Delete']
@@ -1,6 +1,12 @@
+import collections
+from concurrent import futures
+from typing import Any, Callable, Iterator, List, Optional, Union
 from space_api.utils import generate_find, AND
 from space_api.transport import Transport, make_read_options
-from space_api.response import Response
+from space_api.response import Response, RawResponse, ResponseError
+from space_api.encoding import encode_read_options
+from space_api.db.keyset import KeysetPaginator
+from space_api.proto import server_pb2
 
 
 class Get:
@@ -98,23 +104,196 @@ class Get:
         self.params['options']['distinct'] = key
         return self
 
-    def apply(self) -> Response:
+    def apply(self, timeout: Optional[float] = None, raw: bool = False) -> Union[Response, RawResponse]:
         """
         Triggers the get request
         ::
             response = db.get('posts').apply()
 
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :param raw: (bool) Whether to leave the result JSON encoded, in a RawResponse (defaults to False)
         :return: (Response) The response object containing values corresponding to the request
         """
+        return self.transport.read(self.params['find'], self.operation, self._read_options(), self.db_type,
+                                   self.collection, timeout=timeout, raw=raw)
+
+    def apply_async(self, timeout: Optional[float] = None, raw: bool = False) -> futures.Future:
+        """
+        Triggers the get request without blocking
+        ::
+            future = db.get('posts').apply_async()
+            response = future.result()
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :param raw: (bool) Whether to leave the result JSON encoded, in a RawResponse (defaults to False)
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        return self.transport.read_future(self.params['find'], self.operation, self._read_options(), self.db_type,
+                                          self.collection, timeout=timeout, raw=raw)
+
+    def iter_docs(self, timeout: Optional[float] = None) -> Iterator:
+        """
+        Triggers the get request, and iterates over the documents of the result, decoding them one at a time
+        ::
+            for doc in db.get('events').where(COND('type', '==', 'click')).iter_docs():
+                process(doc)
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (Iterator) The documents, a ResponseError being raised if the request failed
+        """
+        response = self.apply(timeout=timeout)
+        if response.status != 200:
+            raise ResponseError(response.status, response.error)
+        return response.iter_result()
+
+    def pages(self, page_size: int, prefetch: int = 1, timeout: Optional[float] = None) -> Iterator[List]:
+        """
+        Iterates over the pages of the result, fetching the next pages in the background while the current one is used
+
+        The pages are read with skip and limit, starting at the skip of the request and stopping at its limit, if set,
+        or at the first page which is not full. Sort the request for the pages to be consistent
+        ::
+            for page in db.get('events').sort('id').pages(1000, prefetch=2):
+                process(page)
+
+        :param page_size: (int) The number of documents per page
+        :param prefetch: (int) The number of pages fetched ahead of the current one (defaults to 1, 0 fetches them one
+            by one)
+        :param timeout: (float) The (optional) timeout of every page in seconds (defaults to the API's timeout)
+        :return: (Iterator[List]) The documents of each page, a ResponseError being raised if a page failed
+        """
+        pager = _Pager(self.params['options'], page_size, lambda skip, limit: self.transport.read_future(
+            self.params['find'], self.operation, self._read_options(skip=skip, limit=limit), self.db_type,
+            self.collection, timeout=timeout))
+        try:
+            pager.start(prefetch)
+            while pager.in_flight:
+                limit, future = pager.in_flight.popleft()
+                page = pager.page(future.result(), limit)
+                if page:
+                    yield page
+                pager.fetch()
+        finally:
+            pager.cancel()
+
+    def iter(self, page_size: int, prefetch: int = 1, timeout: Optional[float] = None) -> Iterator:
+        """
+        Iterates over the documents of the result, page by page, fetching the next pages in the background (see pages)
+        ::
+            for doc in db.get('events').sort('id').iter(1000, prefetch=2):
+                process(doc)
+
+        :param page_size: (int) The number of documents per page
+        :param prefetch: (int) The number of pages fetched ahead of the current one (defaults to 1)
+        :param timeout: (float) The (optional) timeout of every page in seconds (defaults to the API's timeout)
+        :return: (Iterator) The documents, a ResponseError being raised if a page failed
+        """
+        for page in self.pages(page_size, prefetch, timeout):
+            yield from page
+
+    def paginate_by(self, *keys: str, page_size: int, cursor: Optional[str] = None,
+                    timeout: Optional[float] = None) -> KeysetPaginator:
+        """
+        Iterates over the pages of the result in the order of the keys, seeking past the last document of every page
+        rather than skipping the documents read, so that deep pages are as fast as the first one
+
+        The pages are sorted by the keys, which should identify every document, e.g. by ending with a unique field. The
+        skip of the request is not used, but its limit caps the number of documents read
+        ::
+            pages = db.get('events').where(COND('type', '==', 'click')).paginate_by('-created', 'id', page_size=1000)
+            for page in pages:
+                process(page)
+            resumed = db.get('events').where(COND('type', '==', 'click')).paginate_by(
+                '-created', 'id', page_size=1000, cursor=pages.cursor)
+
+        :param keys: (*) The fields to sort and seek by, prefixed with '-' for the descending order
+        :param page_size: (int) The number of documents per page
+        :param cursor: (str) The (optional) cursor of an earlier paginator to resume from
+        :param timeout: (float) The (optional) timeout of every page in seconds (defaults to the API's timeout)
+        :return: (KeysetPaginator) The iterator over the pages, whose cursor points past the last page read
+        """
+        return KeysetPaginator(self, list(keys), page_size, cursor, timeout)
+
+    def _read_options(self, **overrides) -> Union[server_pb2.ReadOptions, bytes]:
+        """
+        Makes the gRPC ReadOptions object for the request, or encodes it if the transport has an encoder
+
+        :param overrides: The options to use instead of those of the request, e.g. the skip and limit of a page
+        :return: (server_pb2.ReadOptions or bytes) gRPC ReadOptions object, or its encoding
+        """
+        options = dict(self.params['options'], **overrides)
         # Set a default limit if offset is specified and limit is not specified.
-        if self.params['options'].get('skip') is not None and self.params['options'].get('limit') is None:
-            self.params['options']['limit'] = 20
-
-        options = self.params['options']
-        read_options = make_read_options(select=options.get('select'), sort=options.get('sort'),
-                                         skip=options.get('skip'), limit=options.get('limit'),
-                                         distinct=options.get('distinct'))
-        return self.transport.read(self.params['find'], self.operation, read_options, self.db_type, self.collection)
+        if options.get('skip') is not None and options.get('limit') is None:
+            options['limit'] = 20
+
+        if self.transport.encoder is not None:
+            return encode_read_options(select=options.get('select'), sort=options.get('sort'),
+                                       skip=options.get('skip'), limit=options.get('limit'),
+                                       distinct=options.get('distinct'))
+        return make_read_options(select=options.get('select'), sort=options.get('sort'), skip=options.get('skip'),
+                                 limit=options.get('limit'), distinct=options.get('distinct'))
+
+
+class _Pager:
+    """
+    The page arithmetic shared by Get.pages and AsyncGet.pages, which only wait for the pages (see Get.pages)
+
+    :param options: (dict) The read options of the request
+    :param page_size: (int) The number of documents per page
+    :param read: (Callable[[int, int], Any]) Starts reading a page from its skip and limit, returning a future or task
+        of its Response
+    """
+
+    def __init__(self, options: dict, page_size: int, read: Callable[[int, int], Any]):
+        if page_size <= 0:
+            raise ValueError("The page size should be positive")
+        self.page_size = page_size
+        self.read = read
+        self.skip = options.get('skip') or 0
+        self.end = None if options.get('limit') is None else self.skip + options['limit']
+        # The limits and futures of the pages being read, in order
+        self.in_flight = collections.deque()
+
+    def start(self, prefetch: int):
+        """
+        Starts reading the first page, and the pages fetched ahead of it
+        """
+        for _ in range(prefetch + 1):
+            self.fetch()
+
+    def fetch(self):
+        """
+        Starts reading the next page, if there is one
+        """
+        limit = self.page_size if self.end is None else min(self.page_size, self.end - self.skip)
+        if limit <= 0:
+            return
+        self.in_flight.append((limit, self.read(self.skip, limit)))
+        self.skip += limit
+
+    def page(self, response: Response, limit: int) -> list:
+        """
+        Returns the documents of a page, stopping at it if it is not full
+
+        :param response: (Response) The response of the page
+        :param limit: (int) The limit the page was read with
+        :return: (list) The documents of the page
+        """
+        if response.status != 200:
+            raise ResponseError(response.status, response.error)
+        page = response.result or []
+        if len(page) < limit:
+            self.end = self.skip
+            self.cancel()
+        return page
+
+    def cancel(self):
+        """
+        Cancels the pages being read
+        """
+        for _, future in self.in_flight:
+            future.cancel()
+        self.in_flight.clear()
 
 
 __all__ = ['Get']
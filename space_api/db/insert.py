@@ -1,3 +1,5 @@
+from concurrent import futures
+from typing import Optional
 from space_api.transport import Transport
 from space_api.response import Response
 
@@ -51,16 +53,35 @@ class Insert:
         self.document = records
         return self
 
-    def apply(self) -> Response:
+    def apply(self, retry: Optional[bool] = None, timeout: Optional[float] = None) -> Response:
         """
         Triggers the insert request
         ::
             records = [{'author': 'John', 'title': 'Title1'}]
             response = db.insert('posts').docs(records).apply()
 
+        :param retry: (bool) Whether the request may be retried as per the API's retry policy (defaults to the
+            policy's retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
         :return: (Response) The response object containing values corresponding to the request
         """
-        return self.transport.create(self.document, self.operation, self.db_type, self.collection)
+        return self.transport.create(self.document, self.operation, self.db_type, self.collection, retry=retry,
+                                     timeout=timeout)
+
+    def apply_async(self, retry: Optional[bool] = None, timeout: Optional[float] = None) -> futures.Future:
+        """
+        Triggers the insert request without blocking
+        ::
+            future = db.insert('posts').doc({'author': 'John', 'title': 'Title1'}).apply_async()
+            response = future.result()
+
+        :param retry: (bool) Whether the request may be retried as per the API's retry policy (defaults to the
+            policy's retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        return self.transport.create_future(self.document, self.operation, self.db_type, self.collection,
+                                            retry=retry, timeout=timeout)
 
 
 __all__ = ['Insert']
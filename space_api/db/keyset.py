@@ -0,0 +1,161 @@
+import base64
+from typing import List, Optional, Tuple
+from space_api.utils import generate_find, AND, OR, COND
+from space_api.response import ResponseError
+
+
+# The operators of which only the tighter bound is kept when both predicates use them on a field
+_tighter = {'$gt': max, '$gte': max, '$lt': min, '$lte': min}
+
+
+def merge_find(find: dict, extra: dict) -> dict:
+    """
+    Merges find parameters with the parameters of an extra predicate
+
+    The conditions on distinct fields are merged, as are the bounds on a field, of which the tighter is kept. Otherwise,
+    e.g. when both have an $or, the parameters are combined with an $and
+
+    :param find: (dict) The find parameters (see generate_find)
+    :param extra: (dict) The find parameters of the extra predicate
+    :return: (dict) The find parameters matching both
+    """
+    merged = dict(find)
+    for field, condition in extra.items():
+        if field not in merged:
+            merged[field] = condition
+            continue
+        if field.startswith('$') or not isinstance(merged[field], dict) or not isinstance(condition, dict):
+            return {'$and': [find, extra]}
+        operators = dict(merged[field])
+        for operator, value in condition.items():
+            if operator not in operators:
+                operators[operator] = value
+                continue
+            try:
+                operators[operator] = _tighter[operator](operators[operator], value)
+            except (KeyError, TypeError):
+                return {'$and': [find, extra]}
+        merged[field] = operators
+    return merged
+
+
+class KeysetPaginator:
+    """
+    Iterates over the pages of a request in the order of its keys, each page being read with a predicate seeking past
+    the keys of the last document seen, rather than with a skip which the database still has to scan through
+
+    The keys should identify every document, e.g. by ending with a unique field. After every page, cursor is an opaque
+    string from which a later paginator resumes
+    ::
+        pages = db.get('events').paginate_by('created', 'id', page_size=1000)
+        for page in pages:
+            process(page)
+            save(pages.cursor)
+
+    :param get: (Get) The request to paginate
+    :param keys: (List[str]) The fields to sort by, prefixed with '-' to sort in descending order
+    :param page_size: (int) The number of documents per page
+    :param cursor: (str) The (optional) cursor to resume from
+    :param timeout: (float) The (optional) timeout of every page in seconds (defaults to the API's timeout)
+    """
+
+    def __init__(self, get, keys: List[str], page_size: int, cursor: Optional[str] = None,
+                 timeout: Optional[float] = None):
+        if not keys:
+            raise ValueError("At least one key is needed to paginate by")
+        if page_size <= 0:
+            raise ValueError("The page size should be positive")
+        self.get = get
+        self.keys: List[Tuple[str, int]] = [(key[1:], -1) if key.startswith('-') else (key, 1) for key in keys]
+        self.page_size = page_size
+        self.timeout = timeout
+        self.last: Optional[list] = None
+        self.remaining: Optional[int] = get.params['options'].get('limit')
+        self.done = False
+        if cursor is not None:
+            self._resume(cursor)
+
+    @property
+    def cursor(self) -> Optional[str]:
+        """
+        The opaque cursor to resume from, which points past the last document read, or None before the first page
+        """
+        if self.last is None:
+            return None
+        state = {'keys': [[key, order] for key, order in self.keys], 'last': self.last, 'remaining': self.remaining}
+        return base64.urlsafe_b64encode(self.get.transport.codec.dumps(state)).decode('ascii')
+
+    def _resume(self, cursor: str):
+        try:
+            state = self.get.transport.codec.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            keys = [(key, order) for key, order in state['keys']]
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid pagination cursor")
+        if keys != self.keys:
+            raise ValueError("The pagination cursor was made for other keys")
+        self.last = state['last']
+        self.remaining = state['remaining']
+
+    def _find(self) -> dict:
+        """
+        Returns the find parameters of the request, seeking past the last document read
+        """
+        find = self.get.params['find']
+        if self.last is None:
+            return find
+        # (k1, k2, ...) > (v1, v2, ...) is k1 > v1 OR (k1 == v1 AND k2 > v2) OR ...
+        clauses = []
+        for i, (key, order) in enumerate(self.keys):
+            equal = [COND(k, '==', v) for (k, _), v in zip(self.keys[:i], self.last[:i])]
+            clauses.append(AND(*equal, COND(key, '>' if order > 0 else '<', self.last[i])))
+        seek = generate_find(clauses[0] if len(clauses) == 1 else OR(*clauses))
+        return merge_find(find, seek)
+
+    def _next_read(self) -> Optional[Tuple[dict, object, int]]:
+        """
+        Returns the find parameters, the read options and the limit of the next page, or None after the last page
+        """
+        if self.done:
+            return None
+        limit = self.page_size if self.remaining is None else min(self.page_size, self.remaining)
+        if limit <= 0:
+            self.done = True
+            return None
+        options = self.get._read_options(sort={key: order for key, order in self.keys}, skip=None, limit=limit)
+        return self._find(), options, limit
+
+    def _take(self, response, limit: int) -> Optional[list]:
+        """
+        Returns the page of the response of a read and seeks past it, or None if it is empty
+        """
+        if response.status != 200:
+            raise ResponseError(response.status, response.error)
+        page = response.result or []
+        if len(page) < limit:
+            self.done = True
+        if not page:
+            return None
+        try:
+            self.last = [page[-1][key] for key, _ in self.keys]
+        except KeyError as e:
+            raise ValueError(f"The documents have no {e.args[0]} key to paginate by")
+        if self.remaining is not None:
+            self.remaining -= len(page)
+        return page
+
+    def __iter__(self) -> 'KeysetPaginator':
+        return self
+
+    def __next__(self) -> list:
+        read = self._next_read()
+        if read is None:
+            raise StopIteration
+        find, options, limit = read
+        get = self.get
+        page = self._take(get.transport.read(find, get.operation, options, get.db_type, get.collection,
+                                             timeout=self.timeout), limit)
+        if page is None:
+            raise StopIteration
+        return page
+
+__all__ = ["KeysetPaginator", "merge_find"]
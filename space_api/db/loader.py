@@ -0,0 +1,195 @@
+import contextvars
+import threading
+from concurrent import futures
+from typing import Dict, Hashable, Iterable, List, Optional
+from space_api import constants
+from space_api.transport import Transport
+from space_api.response import Response, ResponseError
+from space_api.db.get import Get
+
+# The error of resolving a future which was cancelled meanwhile (Python 3.8+, earlier versions resolve it anyway)
+_InvalidStateError = getattr(futures, 'InvalidStateError', ())
+
+
+class Loader:
+    """
+    The DB Loader Class, which batches the lookups of documents by key made at about the same time into a single read
+    with COND(key, 'in', keys), and hands every caller its document
+
+    The keys requested within the window are read at once, every key being read once. The documents loaded are cached
+    for the life of the loader, which should hence be made for a scope, e.g. a request of a GraphQL server
+    ::
+        from space_api import API
+        api = API("My-Project", "localhost:4124")
+        db = api.mongo()
+        users = db.loader('users', key='id')
+
+        # In the resolvers, on any thread
+        author = users.load(post['author_id']).result()
+
+    :param transport: (Transport) The API's transport instance
+    :param collection: (str) The collection name
+    :param db_type: (str) The database type
+    :param key: (str) The field to look the documents up by, which should be unique (defaults to 'id')
+    :param window: (float) The seconds the keys are collected for before being read (defaults to
+        constants.LoaderWindow)
+    :param max_keys: (int) The maximum number of keys read at once, the keys being read right away once reached
+        (defaults to constants.LoaderMaxKeys)
+    :param cache: (bool) Whether to cache the documents loaded (defaults to True)
+    :param timeout: (float) The (optional) timeout of every read in seconds (defaults to the API's timeout)
+    """
+
+    def __init__(self, transport: Transport, collection: str, db_type: str, key: str = 'id',
+                 window: float = constants.LoaderWindow, max_keys: int = constants.LoaderMaxKeys, cache: bool = True,
+                 timeout: Optional[float] = None):
+        if max_keys <= 0:
+            raise ValueError("The maximum number of keys should be positive")
+        self.transport = transport
+        self.collection = collection
+        self.db_type = db_type
+        self.key = key
+        self.window = window
+        self.max_keys = max_keys
+        self.cache = cache
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        # The futures of the keys to read, and of the keys loaded or being loaded
+        self._pending: Dict[Hashable, futures.Future] = {}
+        self._futures: Dict[Hashable, futures.Future] = {}
+        self._timer: Optional[threading.Timer] = None
+
+    def load(self, key: Hashable) -> futures.Future:
+        """
+        Loads the document of a key
+
+        :param key: The key
+        :return: (futures.Future[dict]) A future resolving to the document, or to None if there is none, a
+            ResponseError being raised by result() if the read failed
+        """
+        with self._lock:
+            future = self._futures.get(key) or self._pending.get(key)
+            if future is not None and not future.cancelled():
+                return future
+            future = self._pending[key] = futures.Future()
+            if self.cache:
+                self._futures[key] = future
+            if len(self._pending) >= self.max_keys:
+                batch = self._take()
+            else:
+                batch = None
+                if self._timer is None:
+                    # The keys are read on the timer's thread within the context of the load which started it, e.g.
+                    # under its deadline
+                    self._timer = threading.Timer(self.window, contextvars.copy_context().run, (self.dispatch,))
+                    self._timer.daemon = True
+                    self._timer.start()
+        if batch:
+            self._send(batch)
+        return future
+
+    def load_many(self, keys: Iterable[Hashable]) -> List[futures.Future]:
+        """
+        Loads the documents of keys
+
+        :param keys: (Iterable) The keys
+        :return: (List[futures.Future[dict]]) The futures of the documents (see load)
+        """
+        return [self.load(key) for key in keys]
+
+    def dispatch(self):
+        """
+        Reads the keys collected so far right away
+        """
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._send(batch)
+
+    def clear(self, key: Optional[Hashable] = None):
+        """
+        Drops a document from the cache, or all of them, so that it is read again on its next load
+
+        :param key: The (optional) key to drop (defaults to all of them)
+        """
+        with self._lock:
+            if key is None:
+                self._futures.clear()
+            else:
+                self._futures.pop(key, None)
+
+    def _take(self) -> Dict[Hashable, futures.Future]:
+        """
+        Takes the keys collected so far, the lock being held
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        return batch
+
+    def _get(self, keys: list) -> Get:
+        get = Get(self.transport, self.collection, self.db_type)
+        # The find is built as is rather than compiled, since the keys of a batch are seldom read again, and would only
+        # take the place of the memoized conditions (see generate_find)
+        get.params['find'] = {self.key: {'$in': keys}}
+        return get
+
+    def _send(self, batch: Dict[Hashable, futures.Future]):
+        try:
+            read = self._get(list(batch)).apply_async(timeout=self.timeout)
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        def on_done(f: futures.Future):
+            if f.cancelled():
+                self._fail(batch, futures.CancelledError())
+            elif f.exception() is not None:
+                self._fail(batch, f.exception())
+            else:
+                self._resolve(batch, f.result())
+
+        read.add_done_callback(on_done)
+
+    def _resolve(self, batch: dict, response: Response):
+        """
+        Hands every future of a read its document
+        """
+        if response.status != 200:
+            self._fail(batch, ResponseError(response.status, response.error))
+            return
+        docs = {}
+        for doc in response.result or ():
+            try:
+                docs[doc.get(self.key)] = doc
+            except TypeError:
+                continue
+        for key, future in batch.items():
+            self._settle(future, docs.get(key))
+
+    def _fail(self, batch: dict, error: BaseException):
+        """
+        Fails every future of a read, which are not cached so that their keys are read again on their next load
+        """
+        with self._lock:
+            for key, future in batch.items():
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+        for future in batch.values():
+            self._settle(future, error=error)
+
+    @staticmethod
+    def _settle(future: futures.Future, result: Optional[dict] = None, error: Optional[BaseException] = None):
+        """
+        Resolves a future of a read to its document or error, unless it was cancelled meanwhile by its caller
+        """
+        try:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+        except _InvalidStateError:
+            pass
+
+
+__all__ = ['Loader']
@@ -0,0 +1,194 @@
+import asyncio
+import re
+import uuid
+from concurrent import futures
+from typing import Dict, List, Optional, Union
+from space_api.utils import Param
+from space_api.response import Response, RawResponse
+from space_api.db.get import Get
+from space_api.db.insert import Insert
+from space_api.db.update import Update
+from space_api.db.delete import Delete
+from space_api.db.aggregate import Aggregate
+
+
+class _Template:
+    """
+    A JSON parameter of a request, encoded once with its placeholders, into which the encoded values are spliced
+
+    The placeholders are encoded as unique strings, at which the encoding is split
+
+    :param value: The parameter, holding Param placeholders
+    :param codec: (JSONCodec) The codec to encode with
+    """
+
+    def __init__(self, value, codec):
+        self.codec = codec
+        self.names: List[str] = []
+        marker = f"space-api-param-{uuid.uuid4().hex}-"
+        encoded = codec.dumps(self._substitute(value, marker))
+        parts = re.split(b'"' + re.escape(marker.encode('ascii')) + rb'(\d+)"', encoded)
+        # The parts alternate between the encoded literals and the indexes of the placeholders
+        self.literals: List[bytes] = parts[0::2]
+        self.slots: List[str] = [self.names[int(i)] for i in parts[1::2]]
+
+    def _substitute(self, value, marker: str):
+        if isinstance(value, Param):
+            self.names.append(value.name)
+            return f"{marker}{len(self.names) - 1}"
+        if isinstance(value, dict):
+            return {k: self._substitute(v, marker) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._substitute(v, marker) for v in value]
+        return value
+
+    def render(self, values: dict) -> bytes:
+        """
+        Encodes the parameter with the values of its placeholders
+
+        :param values: (dict) The values by placeholder name
+        :return: (bytes) The encoded parameter
+        """
+        if not self.slots:
+            return self.literals[0]
+        dumps = self.codec.dumps
+        parts = [self.literals[0]]
+        for name, literal in zip(self.slots, self.literals[1:]):
+            parts.append(dumps(values[name]))
+            parts.append(literal)
+        return b''.join(parts)
+
+
+class PreparedQuery:
+    """
+    A query whose find, update, document, pipeline and read options are encoded once, the values of its Param
+    placeholders being spliced into the encoding every time it is bound
+    ::
+        from space_api import API, COND, Param
+        api = API("My-Project", "localhost:4124")
+        db = api.mongo()
+        user = db.prepare(db.get_one('users').where(COND('id', '==', Param('id'))))
+        response = user.bind(id=42).apply()
+
+    The skip, limit and distinct read options may be placeholders too, e.g. db.get('posts').limit(Param('n'))
+
+    :param builder: (Get, Insert, Update, Delete or Aggregate) The query, holding Param placeholders
+    """
+
+    def __init__(self, builder: Union[Get, Insert, Update, Delete, Aggregate]):
+        if not isinstance(builder, (Get, Insert, Update, Delete, Aggregate)):
+            raise TypeError(f"Cannot prepare a {type(builder).__name__}, expected a Get, Insert, Update, Delete or "
+                            f"Aggregate")
+        self.transport = builder.transport
+        self.collection = builder.collection
+        self.db_type = builder.db_type
+        self.operation = builder.operation
+        codec = self.transport.codec
+        self._get: Optional[Get] = None
+        self._options = None
+        self._option_params: Dict[str, str] = {}
+        if isinstance(builder, Get):
+            self.rpc = 'read'
+            self._templates = [_Template(builder.params['find'], codec)]
+            self._option_params = {option: value.name for option, value in builder.params['options'].items()
+                                   if isinstance(value, Param)}
+            if self._option_params:
+                self._get = builder
+            else:
+                self._options = builder._read_options()
+        elif isinstance(builder, Insert):
+            self.rpc = 'create'
+            self._templates = [_Template(builder.document, codec)]
+        elif isinstance(builder, Update):
+            self.rpc = 'update'
+            self._templates = [_Template(builder.params['find'], codec), _Template(builder.params['update'], codec)]
+        elif isinstance(builder, Delete):
+            self.rpc = 'delete'
+            self._templates = [_Template(builder.params['find'], codec)]
+        else:
+            self.rpc = 'aggregate'
+            self._templates = [_Template(builder.params['pipe'], codec)]
+        self.names = frozenset(name for template in self._templates for name in template.names).union(
+            self._option_params.values())
+
+    def bind(self, **values) -> 'BoundQuery':
+        """
+        Binds the placeholders of the query to values
+
+        :param values: The values of the placeholders, by name
+        :return: (BoundQuery) The query to apply
+        """
+        if values.keys() != self.names:
+            missing, unknown = self.names.difference(values), set(values).difference(self.names)
+            raise ValueError(f"Expected the parameters {', '.join(sorted(self.names)) or 'none'}" +
+                             (f", missing {', '.join(sorted(missing))}" if missing else "") +
+                             (f", unknown {', '.join(sorted(unknown))}" if unknown else ""))
+        encoded = [template.render(values) for template in self._templates]
+        if self.rpc == 'read':
+            options = self._options
+            if options is None:
+                options = self._get._read_options(**{option: values[name]
+                                                     for option, name in self._option_params.items()})
+            args = (encoded[0], self.operation, options, self.db_type, self.collection)
+        elif self.rpc == 'update':
+            args = (encoded[0], self.operation, encoded[1], self.db_type, self.collection)
+        else:
+            args = (encoded[0], self.operation, self.db_type, self.collection)
+        return BoundQuery(self, args)
+
+
+class BoundQuery:
+    """
+    A prepared query bound to the values of its placeholders (see PreparedQuery.bind)
+    """
+    __slots__ = ('prepared', 'args')
+
+    def __init__(self, prepared: PreparedQuery, args: tuple):
+        self.prepared = prepared
+        self.args = args
+
+    def _kwargs(self, timeout: Optional[float], raw: bool, retry: Optional[bool]) -> dict:
+        if self.prepared.rpc in ('read', 'aggregate'):
+            return {'timeout': timeout, 'raw': raw}
+        # The asyncio transport has no retry policy
+        return {'timeout': timeout} if retry is None else {'timeout': timeout, 'retry': retry}
+
+    def apply(self, timeout: Optional[float] = None, raw: bool = False,
+              retry: Optional[bool] = None) -> Union[Response, RawResponse]:
+        """
+        Triggers the request
+        ::
+            response = user.bind(id=42).apply()
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :param raw: (bool) Whether to leave the result JSON encoded, in a RawResponse, for reads and aggregations
+            (defaults to False)
+        :param retry: (bool) Whether a write may be retried as per the API's retry policy (defaults to the policy's
+            retry_writes)
+        :return: (Response) The response object containing values corresponding to the request, or a coroutine
+            resolving to it with AsyncAPI
+        """
+        return getattr(self.prepared.transport, self.prepared.rpc)(*self.args, **self._kwargs(timeout, raw, retry))
+
+    def apply_async(self, timeout: Optional[float] = None, raw: bool = False,
+                    retry: Optional[bool] = None) -> Union[futures.Future, asyncio.Task]:
+        """
+        Triggers the request without blocking
+
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :param raw: (bool) Whether to leave the result JSON encoded, in a RawResponse, for reads and aggregations
+            (defaults to False)
+        :param retry: (bool) Whether a write may be retried as per the API's retry policy (defaults to the policy's
+            retry_writes)
+        :return: (futures.Future[Response]) A future resolving to the response object, or a task of the running
+            event loop with AsyncAPI
+        """
+        method = getattr(self.prepared.transport, self.prepared.rpc)
+        if asyncio.iscoroutinefunction(method):
+            # The asyncio transport has no future based calls, so that the request is started as a task instead
+            return asyncio.ensure_future(method(*self.args, **self._kwargs(timeout, raw, retry)))
+        return getattr(self.prepared.transport, self.prepared.rpc + '_future')(
+            *self.args, **self._kwargs(timeout, raw, retry))
+
+
+__all__ = ['PreparedQuery', 'BoundQuery']
@@ -0,0 +1,170 @@
+from concurrent import futures
+from typing import Iterator, List, Optional
+from space_api.utils import generate_find, AND, COND
+from space_api.transport import Transport
+from space_api.response import ResponseError
+from space_api.db.get import Get
+from space_api.db.keyset import merge_find
+
+
+class Scan:
+    """
+    The DB Scan Class, which reads a collection in partitions of its key space, all of them at once over the channels of
+    the API
+
+    The partitions are the ranges between the boundaries, which are sampled by count, sort and skip when not given. The
+    key should be set on every document, since the documents without it are in none of the ranges
+    ::
+        from space_api import API, COND
+        api = API("My-Project", "localhost:4124")
+        db = api.mongo()
+        for doc in db.scan('events', partitions=8, key='id').where(COND('type', '==', 'click')).apply():
+            process(doc)
+
+    :param transport: (Transport) The API's transport instance
+    :param collection: (str) The collection name
+    :param db_type: (str) The database type
+    :param partitions: (int) The number of partitions (defaults to 4)
+    :param key: (str) The field to partition by (defaults to 'id')
+    :param boundaries: (list) The (optional) sorted values of the key between the partitions, which make as many
+        partitions as there are boundaries plus one
+    :param ordered: (bool) Whether to yield the documents in the order of the key (defaults to False)
+    """
+
+    def __init__(self, transport: Transport, collection: str, db_type: str, partitions: int = 4, key: str = 'id',
+                 boundaries: Optional[list] = None, ordered: bool = False):
+        if partitions <= 0:
+            raise ValueError("The number of partitions should be positive")
+        self.transport = transport
+        self.collection = collection
+        self.db_type = db_type
+        self.partitions = partitions
+        self.key = key
+        self._boundaries = None if boundaries is None else sorted(set(boundaries))
+        self.ordered = ordered
+        self.params = {'find': {}, 'options': {}}
+
+    def where(self, *conditions) -> 'Scan':
+        """
+        Prepares the find parameters
+
+        :param conditions: (*) The conditions to find by
+        """
+        self.params['find'] = generate_find(AND(*conditions))
+        return self
+
+    def select(self, select) -> 'Scan':
+        """
+        Sets the fields to be selected
+
+        :param select: (*) The fields to select
+        """
+        self.params['options']['select'] = select
+        return self
+
+    def boundaries(self, timeout: Optional[float] = None) -> list:
+        """
+        Returns the values of the key between the partitions, sampling them if they were not given
+
+        The documents are counted, then the documents at every multiple of count / partitions in the order of the key
+        are read at once, with a sort, a skip and a limit of 1. Repeated values are dropped, making fewer partitions
+        ::
+            boundaries = db.scan('events', partitions=8).boundaries()
+
+        :param timeout: (float) The (optional) timeout of every sampling request in seconds (defaults to the API's
+            timeout)
+        :return: (list) The sorted boundaries
+        """
+        if self._boundaries is not None:
+            return self._boundaries
+        if self.partitions == 1:
+            self._boundaries = []
+            return self._boundaries
+        response = self._get('count').apply(timeout=timeout)
+        if response.status != 200:
+            raise ResponseError(response.status, response.error)
+        samples = [get.apply_async(timeout=timeout) for get in self._samples(response.result or 0)]
+        values = []
+        try:
+            for future in samples:
+                values.extend(self._sampled(future.result()))
+        finally:
+            for future in samples:
+                future.cancel()
+        self._boundaries = sorted(set(values))
+        return self._boundaries
+
+    def _samples(self, count: int) -> List[Get]:
+        """
+        Makes the reads of the documents at every multiple of count / partitions in the order of the key
+        """
+        samples = []
+        for i in range(1, self.partitions):
+            skip = i * count // self.partitions
+            if skip > 0:
+                samples.append(self._get('one').select({self.key: 1}).sort(self.key).skip(skip).limit(1))
+        return samples
+
+    def _sampled(self, response) -> list:
+        """
+        Returns the value of the key read by a sample, if any
+        """
+        if response.status != 200:
+            raise ResponseError(response.status, response.error)
+        if response.result and self.key in response.result:
+            return [response.result[self.key]]
+        return []
+
+    def apply(self, timeout: Optional[float] = None) -> Iterator:
+        """
+        Triggers the read of every partition at once, and iterates over their documents as the partitions complete, or
+        in the order of the key if the scan is ordered
+        ::
+            docs = list(db.scan('events', partitions=8, key='id', ordered=True).apply())
+
+        :param timeout: (float) The (optional) timeout of every request in seconds (defaults to the API's timeout)
+        :return: (Iterator) The documents, a ResponseError being raised if a partition failed
+        """
+        reads = [get.apply_async(timeout=timeout) for get in self._partitions(self.boundaries(timeout))]
+        return self._results(reads)
+
+    def _results(self, reads: List[futures.Future]) -> Iterator:
+        try:
+            # The ranges are disjoint and follow one another, so the ordered documents are those of each range in turn
+            for future in (reads if self.ordered else futures.as_completed(reads)):
+                response = future.result()
+                if response.status != 200:
+                    raise ResponseError(response.status, response.error)
+                yield from response.iter_result()
+        finally:
+            for future in reads:
+                future.cancel()
+
+    def _partitions(self, boundaries: list) -> List[Get]:
+        """
+        Makes the read request of every range between the boundaries
+        """
+        gets = []
+        for lower, upper in zip([None] + boundaries, boundaries + [None]):
+            conditions = []
+            if lower is not None:
+                conditions.append(COND(self.key, '>=', lower))
+            if upper is not None:
+                conditions.append(COND(self.key, '<', upper))
+            get = self._get('all')
+            if conditions:
+                get.params['find'] = merge_find(get.params['find'], generate_find(AND(*conditions)))
+            if self.ordered:
+                get.sort(self.key)
+            gets.append(get)
+        return gets
+
+    def _get(self, operation: str) -> Get:
+        get = Get(self.transport, self.collection, self.db_type, operation)
+        get.params['find'] = self.params['find']
+        if operation == 'all':
+            get.params['options'] = dict(self.params['options'])
+        return get
+
+
+__all__ = ['Scan']
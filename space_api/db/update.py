@@ -1,3 +1,5 @@
+from concurrent import futures
+from typing import Optional
 from space_api.utils import generate_find, AND
 from space_api.transport import Transport
 from space_api.response import Response
@@ -148,14 +150,32 @@ class Update:
         self.params['update']['$currentDate'].update({x: {'$type': 'date'} for x in values})
         return self
 
-    def apply(self) -> Response:
+    def apply(self, retry: Optional[bool] = None, timeout: Optional[float] = None) -> Response:
         """
         Triggers the update request
 
+        :param retry: (bool) Whether the request may be retried as per the API's retry policy (defaults to the
+            policy's retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
         :return: (Response) The response object containing values corresponding to the request
         """
         return self.transport.update(self.params['find'], self.operation, self.params['update'], self.db_type,
-                                     self.collection)
+                                     self.collection, retry=retry, timeout=timeout)
+
+    def apply_async(self, retry: Optional[bool] = None, timeout: Optional[float] = None) -> futures.Future:
+        """
+        Triggers the update request without blocking
+        ::
+            future = db.update('posts').set({'author': 'Drake'}).apply_async()
+            response = future.result()
+
+        :param retry: (bool) Whether the request may be retried as per the API's retry policy (defaults to the
+            policy's retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the API's timeout)
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        return self.transport.update_future(self.params['find'], self.operation, self.params['update'],
+                                            self.db_type, self.collection, retry=retry, timeout=timeout)
 
 
 __all__ = ['Update']
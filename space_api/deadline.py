@@ -0,0 +1,84 @@
+import contextlib
+import contextvars
+import time
+from typing import Optional
+import grpc
+
+# The deadline (as a time.monotonic() timestamp) of the innermost deadline block, if any
+_current: contextvars.ContextVar = contextvars.ContextVar("space_api_deadline", default=None)
+
+
+class DeadlineExceededError(grpc.RpcError):
+    """
+    Raised instead of sending a call whose deadline has already passed, or when the deadline of a call passes while it
+    waits for the identical call in flight
+
+    :param rpc: (str) The name of the RPC
+    :param when: (str) When the deadline passed (defaults to "before it was sent")
+    """
+
+    def __init__(self, rpc: str, when: str = "before it was sent"):
+        super().__init__(f"The deadline of {rpc} has passed {when}")
+        self.rpc = rpc
+        self.when = when
+
+    @staticmethod
+    def code() -> grpc.StatusCode:
+        return grpc.StatusCode.DEADLINE_EXCEEDED
+
+    def details(self) -> str:
+        return f"The deadline of {self.rpc} has passed {self.when}"
+
+
+@contextlib.contextmanager
+def deadline(seconds: float):
+    """
+    Sets a deadline shared by all the calls made in the block, e.g. by every page of a scan or every part of a split
+    batch, so that the block as a whole takes at most `seconds`. Nested blocks can only shorten the deadline, and
+    every call is still bounded by its own timeout
+    ::
+        from space_api.deadline import deadline
+        with deadline(2.5):
+            users = db.get('users').apply()
+            posts = db.get('posts').where(COND('author', 'in', ids)).apply()
+
+    :param seconds: (float) The time budget of the block in seconds
+    :return: (float) The deadline as a time.monotonic() timestamp
+    """
+    at = time.monotonic() + seconds
+    parent = _current.get()
+    if parent is not None:
+        at = min(at, parent)
+    token = _current.set(at)
+    try:
+        yield at
+    finally:
+        _current.reset(token)
+
+
+def resolve(timeout: Optional[float]) -> Optional[float]:
+    """
+    Returns the deadline of a call, combining its timeout with the deadline of the enclosing block
+
+    :param timeout: (float) The (optional) timeout of the call in seconds
+    :return: (float) The deadline as a time.monotonic() timestamp, or None if the call has none
+    """
+    at = _current.get()
+    if timeout is not None:
+        at = time.monotonic() + timeout if at is None else min(at, time.monotonic() + timeout)
+    return at
+
+
+def remaining(at: Optional[float]) -> Optional[float]:
+    """
+    Returns the time left until a deadline
+
+    :param at: (float) The deadline as a time.monotonic() timestamp, or None
+    :return: (float) The seconds left (which may be negative), or None if there is no deadline
+    """
+    if at is None:
+        return None
+    return at - time.monotonic()
+
+
+__all__ = ["deadline", "resolve", "remaining", "DeadlineExceededError"]
@@ -0,0 +1,257 @@
+import collections
+import threading
+from typing import Dict, Optional, Tuple, Union
+from space_api.proto import server_pb2
+from space_api import constants
+
+# The fields of Meta which the circuit breaker and the other transport policies read off a request
+Meta = collections.namedtuple("Meta", ["project", "dbType", "col", "token"])
+
+
+def _varint(value: int) -> bytes:
+    """
+    Encodes an integer as a protobuf varint (negative integers take ten bytes, as for int32 and int64 fields)
+    """
+    if value < 0:
+        value += 1 << 64
+    if value < 0x80:
+        return bytes((value,))
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _tag(field: int, wire_type: int) -> bytes:
+    return _varint(field << 3 | wire_type)
+
+
+def _length_delimited(tag: bytes, data: bytes) -> bytes:
+    return tag + _varint(len(data)) + data
+
+
+def _string(tag: bytes, value: Optional[str]) -> bytes:
+    # proto3 leaves out the fields holding their default value
+    if not value:
+        return b''
+    return _length_delimited(tag, value.encode('utf-8'))
+
+
+def _bytes(tag: bytes, value: bytes) -> bytes:
+    if not value:
+        return b''
+    return _length_delimited(tag, value)
+
+
+# The tags of the fields, numbered as in server.proto
+_F1, _F2, _F3, _F4, _F5 = (_tag(n, 2) for n in range(1, 6))
+_V2, _V3, _V4 = (_tag(n, 0) for n in range(2, 5))
+
+
+class EncodedRequest:
+    """
+    A request which is already encoded to its wire bytes, sent through a pass-through request serializer
+
+    It mimics the few parts of a protobuf message the transport policies use, so that they treat it as the message
+    it stands for
+
+    :param data: (bytes) The encoded request
+    :param meta: (Meta) The meta of the request
+    """
+    __slots__ = ("data", "meta")
+
+    def __init__(self, data: bytes, meta: Meta):
+        self.data = data
+        self.meta = meta
+
+    def ByteSize(self) -> int:
+        return len(self.data)
+
+    def SerializeToString(self, deterministic: bool = False) -> bytes:
+        return self.data
+
+
+def serialize(request) -> bytes:
+    """
+    The request serializer of the RPCs sent by the lanes, for EncodedRequest and protobuf messages alike
+
+    :param request: (EncodedRequest) The encoded request, or a gRPC request object
+    :return: (bytes) The wire bytes
+    """
+    if isinstance(request, EncodedRequest):
+        return request.data
+    return request.SerializeToString()
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def decode_response(data: bytes) -> Tuple[int, Optional[str], Optional[memoryview]]:
+    """
+    Decodes the status, error and result of an encoded Response message, without building it. The result is a view
+    of the encoded bytes, so it is not copied
+
+    :param data: (bytes) The encoded Response message
+    :return: (Tuple[int, str, memoryview]) The status, the (optional) error and the (optional) encoded result
+    """
+    view = memoryview(data)
+    status, error, result = 0, None, None
+    pos, end = 0, len(data)
+    while pos < end:
+        key, pos = _read_varint(data, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+            if field == 1:
+                # int32 values are sign extended to 64 bits
+                status = value - (1 << 64) if value >= 1 << 63 else value
+        elif wire_type == 2:
+            size, pos = _read_varint(data, pos)
+            if field == 2:
+                error = str(view[pos:pos + size], 'utf-8')
+            elif field == 3:
+                result = view[pos:pos + size]
+            pos += size
+        elif wire_type == 1:
+            pos += 8
+        elif wire_type == 5:
+            pos += 4
+        else:
+            raise ValueError(f"Unexpected wire type {wire_type} in a Response message")
+    return status, error or None, result if result else None
+
+
+def encode_read_options(select: Optional[Dict[str, int]] = None, sort: Optional[Dict[str, int]] = None,
+                        skip: Optional[int] = None, limit: Optional[int] = None,
+                        distinct: Optional[str] = None) -> bytes:
+    """
+    Encodes a ReadOptions message, without building it (see make_read_options)
+
+    :param select: (dict{str:int}) The select parameters
+    :param sort: (dict{str:int}) The sort parameters
+    :param skip: (int) The number of records to skip
+    :param limit: (int) The maximum number of results returned
+    :param distinct: (str) Get distinct results only
+    :return: (bytes) The encoded ReadOptions
+    """
+    parts = []
+    for tag, fields in ((_F1, select), (_F2, sort)):
+        for key, value in (fields or {}).items():
+            entry = _string(_F1, key) + (_V2 + _varint(value) if value else b'')
+            parts.append(_length_delimited(tag, entry))
+    if skip:
+        parts.append(_V3 + _varint(skip))
+    if limit:
+        parts.append(_V4 + _varint(limit))
+    parts.append(_string(_F5, distinct))
+    return b''.join(parts)
+
+
+class Encoder:
+    """
+    Encodes the requests of the hot unary RPCs straight to their wire bytes
+
+    The encoded Meta of every (project, token, database type, collection) is cached, and a request is encoded by
+    joining it with the encoded find, document and options, which skips building and serializing the protobuf
+    messages
+
+    :param cache_size: (int) The maximum number of encoded Meta kept (defaults to constants.MetaCacheSize)
+    """
+
+    def __init__(self, cache_size: int = constants.MetaCacheSize):
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._metas = {}
+
+    def meta(self, project: str, token: Optional[str], db_type: Optional[str] = None,
+             col: Optional[str] = None) -> bytes:
+        """
+        Returns the encoded Meta field of a request
+
+        :param project: (str) The project ID
+        :param token: (str) The (optional) JWT token
+        :param db_type: (str) The (optional) database type
+        :param col: (str) The (optional) collection name
+        :return: (bytes) The encoded Meta message
+        """
+        key = (project, token, db_type, col)
+        encoded = self._metas.get(key)
+        if encoded is None:
+            encoded = _string(_F1, project) + _string(_F2, db_type) + _string(_F3, col) + _string(_F4, token)
+            with self._lock:
+                if len(self._metas) >= self.cache_size:
+                    self._metas.clear()
+                self._metas[key] = encoded
+        return encoded
+
+    def _request(self, data: bytes, project: str, token: Optional[str], db_type: str, col: str) -> EncodedRequest:
+        return EncodedRequest(data, Meta(project, db_type, col, token))
+
+    def read(self, find: bytes, operation: str, options: Union[bytes, server_pb2.ReadOptions], project: str,
+             token: Optional[str], db_type: str, col: str) -> EncodedRequest:
+        """
+        Encodes a ReadRequest
+
+        :param find: (bytes) The encoded find parameters
+        :param operation: (str) The operation to perform
+        :param options: (bytes or server_pb2.ReadOptions) The (encoded) read options
+        :param project: (str) The project ID
+        :param token: (str) The (optional) JWT token
+        :param db_type: (str) The database type
+        :param col: (str) The collection name
+        :return: (EncodedRequest) The encoded request
+        """
+        if not isinstance(options, bytes):
+            options = options.SerializeToString()
+        data = b''.join((_bytes(_F1, find), _string(_F2, operation), _length_delimited(_F3, options),
+                         _length_delimited(_F4, self.meta(project, token, db_type, col))))
+        return self._request(data, project, token, db_type, col)
+
+    def create(self, document: bytes, operation: str, project: str, token: Optional[str], db_type: str,
+               col: str) -> EncodedRequest:
+        """
+        Encodes a CreateRequest (see read)
+        """
+        data = b''.join((_bytes(_F1, document), _string(_F2, operation),
+                         _length_delimited(_F3, self.meta(project, token, db_type, col))))
+        return self._request(data, project, token, db_type, col)
+
+    def update(self, find: bytes, operation: str, update: bytes, project: str, token: Optional[str], db_type: str,
+               col: str) -> EncodedRequest:
+        """
+        Encodes an UpdateRequest (see read)
+        """
+        data = b''.join((_bytes(_F1, find), _string(_F2, operation), _bytes(_F3, update),
+                         _length_delimited(_F4, self.meta(project, token, db_type, col))))
+        return self._request(data, project, token, db_type, col)
+
+    def delete(self, find: bytes, operation: str, project: str, token: Optional[str], db_type: str,
+               col: str) -> EncodedRequest:
+        """
+        Encodes a DeleteRequest (see read)
+        """
+        data = b''.join((_bytes(_F1, find), _string(_F2, operation),
+                         _length_delimited(_F3, self.meta(project, token, db_type, col))))
+        return self._request(data, project, token, db_type, col)
+
+    def aggregate(self, pipeline: bytes, operation: str, project: str, token: Optional[str], db_type: str,
+                  col: str) -> EncodedRequest:
+        """
+        Encodes an AggregateRequest (see read)
+        """
+        data = b''.join((_bytes(_F1, pipeline), _string(_F2, operation),
+                         _length_delimited(_F3, self.meta(project, token, db_type, col))))
+        return self._request(data, project, token, db_type, col)
+
+
+__all__ = ["Encoder", "EncodedRequest", "Meta", "encode_read_options", "decode_response", "serialize"]
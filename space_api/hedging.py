@@ -0,0 +1,229 @@
+import collections
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Optional, Iterable
+from space_api.retry import RetryBudget
+
+# HedgedRPCs are the idempotent unary RPCs which are hedged by default
+HedgedRPCs = frozenset(("Read", "Aggregate"))
+
+
+class LatencyTracker:
+    """
+    Tracks a rolling window of call latencies per RPC, and their percentiles
+
+    :param window: (int) The number of latest latencies kept per RPC (defaults to 1000)
+    :param refresh: (int) Recompute the percentiles every `refresh` new latencies (defaults to 50)
+    """
+
+    def __init__(self, window: int = 1000, refresh: int = 50):
+        self.window = window
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._recorded = {}
+        self._percentiles = {}
+
+    def record(self, rpc: str, seconds: float):
+        """
+        Records the latency of a call
+
+        :param rpc: (str) The name of the RPC
+        :param seconds: (float) The latency in seconds
+        """
+        with self._lock:
+            latencies = self._latencies.get(rpc)
+            if latencies is None:
+                latencies = self._latencies[rpc] = collections.deque(maxlen=self.window)
+            latencies.append(seconds)
+            self._recorded[rpc] = self._recorded.get(rpc, 0) + 1
+            if self._recorded[rpc] % self.refresh == 0:
+                self._percentiles[rpc] = sorted(latencies)
+
+    def count(self, rpc: str) -> int:
+        """
+        Returns the number of latencies in the window of an RPC
+
+        :param rpc: (str) The name of the RPC
+        :return: (int) The number of latencies
+        """
+        with self._lock:
+            return len(self._latencies.get(rpc, ()))
+
+    def percentile(self, rpc: str, p: float) -> Optional[float]:
+        """
+        Returns a percentile of the latencies of an RPC, as of the last refresh
+
+        :param rpc: (str) The name of the RPC
+        :param p: (float) The percentile, between 0 and 1
+        :return: (float) The latency in seconds, or None if too few latencies are recorded
+        """
+        with self._lock:
+            ordered = self._percentiles.get(rpc)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+class Scheduler:
+    """
+    Runs delayed callbacks on a single daemon thread, which is started on first use
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._heap = []
+        self._counter = itertools.count()
+        self._thread = None
+
+    def call_later(self, delay: float, callback: Callable) -> list:
+        """
+        Schedules a callback
+
+        :param delay: (float) The delay in seconds
+        :param callback: (Callable) The function to call
+        :return: (list) A handle which can be passed to cancel
+        """
+        handle = [callback]
+        with self._condition:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), handle))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="space-api-scheduler", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return handle
+
+    @staticmethod
+    def cancel(handle: Optional[list]):
+        """
+        Cancels a scheduled callback, if it has not run yet
+
+        :param handle: (list) The handle returned by call_later, if any
+        """
+        if handle is not None:
+            handle[0] = None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    self._condition.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                _, _, handle = heapq.heappop(self._heap)
+            callback = handle[0]
+            if callback is not None:
+                try:
+                    callback()
+                except Exception:
+                    pass
+
+
+class HedgePolicy:
+    """
+    The hedging policy of the idempotent unary calls of a Transport
+
+    If a call has not been answered within the hedging delay, a duplicate is sent on another channel of the pool.
+    The first answer wins and the other call is cancelled. The delay is either fixed, or a percentile of the rolling
+    latencies of the RPC, in which case hedging starts once `min_samples` calls were made. A budget caps the share of
+    the calls which can be hedged
+    ::
+        from space_api import API
+        from space_api.hedging import HedgePolicy
+        api = API("My-Project", "localhost:4124", channels=4, hedging=HedgePolicy(percentile=0.95))
+        print(api.metrics()['hedging'])
+
+    :param delay: (float) The (optional) fixed hedging delay in seconds
+    :param percentile: (float) The latency percentile used as hedging delay, if no fixed delay is given
+        (defaults to 0.95)
+    :param min_delay: (float) The minimum hedging delay in seconds (defaults to 0.001)
+    :param min_samples: (int) The number of latencies needed before hedging on a percentile (defaults to 50)
+    :param budget: (RetryBudget) The hedge budget (defaults to RetryBudget(ratio=0.05, reserve=5))
+    :param rpcs: (Iterable[str]) The RPCs which are hedged (defaults to HedgedRPCs), which must be idempotent
+    """
+
+    def __init__(self, delay: Optional[float] = None, percentile: float = 0.95, min_delay: float = 0.001,
+                 min_samples: int = 50, budget: Optional[RetryBudget] = None, rpcs: Iterable[str] = HedgedRPCs):
+        self.delay = delay
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.budget = budget if budget is not None else RetryBudget(ratio=0.05, reserve=5)
+        self.rpcs = frozenset(rpcs)
+        self.latencies = LatencyTracker()
+        self.scheduler = Scheduler()
+        self._lock = threading.Lock()
+        self._counters = {'calls': 0, 'hedges': 0, 'hedge_wins': 0, 'budget_exhausted': 0}
+
+    def applies(self, rpc: str) -> bool:
+        """
+        Returns whether the calls of an RPC are hedged
+
+        :param rpc: (str) The name of the RPC
+        :return: (bool) Whether the RPC is hedged
+        """
+        return rpc in self.rpcs
+
+    def hedge_delay(self, rpc: str) -> Optional[float]:
+        """
+        Returns the delay after which a call is hedged
+
+        :param rpc: (str) The name of the RPC
+        :return: (float) The delay in seconds, or None if the call should not be hedged (yet)
+        """
+        if self.delay is not None:
+            return max(self.min_delay, self.delay)
+        if self.latencies.count(rpc) < self.min_samples:
+            return None
+        delay = self.latencies.percentile(rpc, self.percentile)
+        return None if delay is None else max(self.min_delay, delay)
+
+    def record_call(self):
+        """
+        Records a new call, which refills the hedge budget
+        """
+        self.budget.deposit()
+        self._count('calls')
+
+    def record_latency(self, rpc: str, seconds: float, hedge: bool):
+        """
+        Records the latency of the call which answered first
+
+        :param rpc: (str) The name of the RPC
+        :param seconds: (float) The latency in seconds
+        :param hedge: (bool) Whether the answer came from the hedge
+        """
+        self.latencies.record(rpc, seconds)
+        if hedge:
+            self._count('hedge_wins')
+
+    def allow(self) -> bool:
+        """
+        Takes a token from the hedge budget
+
+        :return: (bool) Whether the hedge fits in the budget
+        """
+        if not self.budget.withdraw():
+            self._count('budget_exhausted')
+            return False
+        self._count('hedges')
+        return True
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def metrics(self) -> dict:
+        """
+        Returns the hedging counters
+
+        :return: (dict) The number of calls, hedges, hedges which answered first, hedges skipped for lack of budget,
+            and the current hedging delay per RPC
+        """
+        with self._lock:
+            metrics = dict(self._counters)
+        metrics['delays'] = {rpc: self.hedge_delay(rpc) for rpc in self.rpcs}
+        return metrics
+
+
+__all__ = ["HedgePolicy", "LatencyTracker", "Scheduler", "HedgedRPCs"]
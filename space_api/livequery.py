@@ -2,13 +2,12 @@ from typing import Callable
 import uuid
 from multiprocessing.pool import ThreadPool
 import grpc
-import json
 from concurrent import futures
 from typing import List
-from space_api.utils import generate_find, AND
+from space_api.utils import generate_find, encode_find, AND
 from space_api.proto import server_pb2
 from space_api import constants
-from space_api.utils import Client, obj_to_utf8_bytes
+from space_api.utils import Client
 from space_api.transport import Transport
 
 
@@ -47,9 +46,7 @@ class LiveQuery:
     """
 
     def __init__(self, transport: Transport, db_type: str, collection: str):
-        self.stub = transport.stub
-        self.project_id = transport.project_id
-        self.token = transport.token
+        self.transport = transport
         self.db_type = db_type
         self.store = []
         self.collection = collection
@@ -61,11 +58,25 @@ class LiveQuery:
         self.on_snapshot = None
         self.on_error = None
         self.id = str(uuid.uuid1())
-        self.pool = futures.ThreadPoolExecutor()
-        self.run_pool = ThreadPool(processes=1)
+        # The threads sending the requests and reading the feed, started on subscribe
+        self.pool = None
+        self.run_pool = None
         self.subscription = None
         # TODO Register Callbacks for Reconnect
 
+    @property
+    def stub(self):
+        # Fetched on use, so that a reconnected transport is picked up
+        return self.transport.stream_stub('RealTime')
+
+    @property
+    def project_id(self) -> str:
+        return self.transport.project_id
+
+    @property
+    def token(self) -> str:
+        return self.transport.token
+
     def where(self, *conditions) -> 'LiveQuery':
         """
         Prepares the find parameters
@@ -83,11 +94,12 @@ class LiveQuery:
         """
         if len(rows) == 0:
             return
+        loads = self.transport.codec.loads
         if self.changes_only:
             for feed_data in rows:
                 if not (self.skip_initial and feed_data.type == constants.Initial):
                     if feed_data.type != constants.Delete:
-                        self.on_snapshot([], feed_data.type, json.loads(feed_data.payload))
+                        self.on_snapshot([], feed_data.type, loads(feed_data.payload))
                     else:
                         if self.db_type == constants.Mongo:
                             self.on_snapshot([], feed_data.type, {"_id": feed_data.docId})
@@ -125,21 +137,21 @@ class LiveQuery:
             change_type = rows[0].type
             if change_type == constants.Initial:
                 if not self.skip_initial:
-                    doc = [json.loads(row['payload']) for row in self.store if not row['is_deleted']]
+                    doc = [loads(row['payload']) for row in self.store if not row['is_deleted']]
                     self.subscription._snapshot = doc
                     self.on_snapshot(doc, change_type, {})
             else:  # There is definitely only 1 row
                 if change_type != constants.Delete:
-                    doc = [json.loads(row['payload']) for row in self.store if not row['is_deleted']]
+                    doc = [loads(row['payload']) for row in self.store if not row['is_deleted']]
                     self.subscription._snapshot = doc
-                    self.on_snapshot(doc, change_type, json.loads(rows[0].payload))
+                    self.on_snapshot(doc, change_type, loads(rows[0].payload))
                 else:
                     if self.db_type == constants.Mongo:
-                        doc = [json.loads(row['payload']) for row in self.store if not row['is_deleted']]
+                        doc = [loads(row['payload']) for row in self.store if not row['is_deleted']]
                         self.subscription._snapshot = doc
                         self.on_snapshot(doc, change_type, {"_id": rows[0].docId})
                     else:
-                        doc = [json.loads(row['payload']) for row in self.store if not row['is_deleted']]
+                        doc = [loads(row['payload']) for row in self.store if not row['is_deleted']]
                         self.subscription._snapshot = doc
                         self.on_snapshot(doc, change_type, {"id": int(rows[0].docId)})
 
@@ -160,6 +172,17 @@ class LiveQuery:
             self.unsubscribe()
             return
 
+    def _request(self, _type: str) -> server_pb2.RealTimeRequest:
+        """
+        Makes the gRPC RealTimeRequest object subscribing to or unsubscribing from the live query
+
+        :param _type: (str) The request type (constants.TypeRealtimeSubscribe or constants.TypeRealtimeUnsubscribe)
+        """
+        options = self.transport.codec.dumps({"skipInitial": self.skip_initial})
+        return server_pb2.RealTimeRequest(token=self.token, dbType=self.db_type, project=self.project_id,
+                                          group=self.collection, options=options, type=_type, id=self.id,
+                                          where=encode_find(self.find, self.transport.codec))
+
     def _send(self, payload: server_pb2.RealTimeRequest):
         return self.client.add_request(payload)
 
@@ -186,26 +209,21 @@ class LiveQuery:
         self.on_snapshot = on_snapshot
         self.on_error = on_error
 
+        self.pool = futures.ThreadPoolExecutor()
+        self.run_pool = ThreadPool(processes=1)
         self.async_result = self.run_pool.apply_async(self._run_client, (self.id,))
-        options = obj_to_utf8_bytes({"skipInitial": self.skip_initial})
-        self.pool.map(self._send, (
-            server_pb2.RealTimeRequest(token=self.token, dbType=self.db_type, project=self.project_id,
-                                       group=self.collection, options=options,
-                                       type=constants.TypeRealtimeSubscribe, id=self.id,
-                                       where=obj_to_utf8_bytes(self.find)),))
+        self.pool.map(self._send, (self._request(constants.TypeRealtimeSubscribe),))
         self.subscription = LiveQuerySubscription(self.unsubscribe, [])
         return self.subscription
 
     def unsubscribe(self):
         """
-        Unsubscribes from the particular LiveQuery instance
+        Unsubscribes from the particular LiveQuery instance, if it is subscribed
         """
-        options = obj_to_utf8_bytes({"skipInitial": self.skip_initial})
-        self.pool.map(self._send, (
-            server_pb2.RealTimeRequest(token=self.token, dbType=self.db_type, project=self.project_id,
-                                       group=self.collection, options=options,
-                                       type=constants.TypeRealtimeUnsubscribe, id=self.id,
-                                       where=obj_to_utf8_bytes(self.find)),))
+        if self.pool is None:
+            return
+        pool, self.pool = self.pool, None
+        pool.map(self._send, (self._request(constants.TypeRealtimeUnsubscribe),))
         self.client.close()
         self.run_pool.close()
         try:
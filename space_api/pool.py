@@ -0,0 +1,421 @@
+import itertools
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Union
+import grpc
+from space_api.proto import server_pb2
+from space_api.proto.server_pb2_grpc import SpaceCloudStub
+from space_api.encoding import serialize
+from space_api import constants
+
+# The streaming RPCs, each of which gets a lane of its own in a pool of more than one channel
+StreamingRPCs = ("RealTime", "Service", "PubsubSubscribe", "UploadFile", "DownloadFile")
+
+# The weight of the latest latency in the EWMA latency of an endpoint
+EWMAWeight = 0.3
+
+# The seconds over which the EWMA latency of an idle endpoint decays (by a factor e), so that an endpoint which was
+# once slow gets probed again
+EWMADecay = 1.0
+
+# The maximum seconds a lane waits for gRPC to stop polling the connectivity of its channel before closing it. gRPC
+# polls a subscribed channel on a thread of its own, which only stops on its next poll (every 0.2 seconds) once the
+# channel has no subscribers left, and raises if the channel is closed under it
+ConnectivityPollWait = 1.0
+
+
+class Endpoint:
+    """
+    A space-cloud server of a pool, along with its health and load
+
+    :param url: (str) The URL of the space-cloud server
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.lanes: List['Lane'] = []
+        self.healthy = True
+        self.failures = 0
+        self.ejections = 0
+        self.calls = 0
+        self.ewma = 0.0
+        self.updated = 0.0
+
+    @property
+    def outstanding(self) -> int:
+        return sum(lane.outstanding for lane in self.lanes)
+
+    def cost(self, now: float) -> float:
+        """
+        Returns the expected latency of a new call, i.e. the decayed EWMA latency weighted by the calls in flight
+
+        :param now: (float) The current monotonic time
+        :return: (float) The cost, 0 if the endpoint has not been measured yet
+        """
+        return self.ewma * math.exp((self.updated - now) / EWMADecay) * (self.outstanding + 1)
+
+    def metrics(self) -> dict:
+        return {'healthy': self.healthy, 'calls': self.calls, 'outstanding': self.outstanding,
+                'ewma_latency': self.ewma, 'ejections': self.ejections}
+
+
+class Lane:
+    """
+    A single gRPC channel (and hence HTTP/2 connection) with its stub
+
+    The lane watches the connectivity of its channel. Once the channel loses its connection, the lane has it reconnect
+    right away, rather than on the next call
+
+    :param url: (str) The URL of space-cloud server
+    :param options: (list) The (optional) gRPC channel options
+    :param endpoint: (Endpoint) The (optional) endpoint the lane connects to
+    :param pool: (ChannelPool) The (optional) pool the lane belongs to, which its calls are released to
+    """
+
+    def __init__(self, url: str, options: Optional[list] = None, endpoint: Optional[Endpoint] = None,
+                 pool: Optional['ChannelPool'] = None):
+        self.url = url
+        self.endpoint = endpoint if endpoint is not None else Endpoint(url)
+        self.pool = pool
+        self.channel = grpc.insecure_channel(url, options=options)
+        self.stub = SpaceCloudStub(self.channel)
+        self.outstanding = 0
+        self.state = grpc.ChannelConnectivity.IDLE
+        self.connecting_since = time.monotonic()
+        self.time_to_ready: Optional[float] = None
+        self.ready_at = 0.0
+        self.reconnects = 0
+        self.closed = False
+        self._methods = {}
+        # The pending future of the connection, shared by the callers until it is done (see connect)
+        self._lock = threading.Lock()
+        self._ready: Optional[grpc.Future] = None
+        self.channel.subscribe(self._on_state)
+
+    def _on_state(self, state: grpc.ChannelConnectivity):
+        """
+        Tracks the connectivity of the channel
+
+        :param state: (grpc.ChannelConnectivity) The new state of the channel
+        """
+        previous, self.state = self.state, state
+        if state == grpc.ChannelConnectivity.READY:
+            if self.time_to_ready is not None:
+                self.reconnects += 1
+            self.ready_at = time.monotonic()
+            self.time_to_ready = self.ready_at - self.connecting_since
+        elif previous == grpc.ChannelConnectivity.READY and not self.closed:
+            # The connection was lost, so reconnect eagerly
+            self.connecting_since = time.monotonic()
+            try:
+                self.connect()
+            except ValueError:
+                # The lane was closed meanwhile
+                pass
+
+    def unary(self, rpc: str, raw: bool = False) -> grpc.UnaryUnaryMultiCallable:
+        """
+        Returns a callable of a unary RPC, which sends an EncodedRequest as is
+
+        :param rpc: (str) The name of the unary RPC
+        :param raw: (bool) Whether the callable returns the encoded Response rather than decoding it
+        :return: (grpc.UnaryUnaryMultiCallable) The callable, made once per lane, RPC and mode
+        """
+        method = self._methods.get((rpc, raw))
+        if method is None:
+            method = self._methods[(rpc, raw)] = self.channel.unary_unary(
+                f'/proto.SpaceCloud/{rpc}', request_serializer=serialize,
+                response_deserializer=None if raw else server_pb2.Response.FromString)
+        return method
+
+    def connect(self) -> grpc.Future:
+        """
+        Has the channel connect, if it is not connected yet
+
+        The lane keeps a single pending future, which is cancelled when the lane is closed, since a future stays
+        subscribed to the channel until the channel gets ready
+
+        :return: (grpc.Future) A future which resolves once the channel is ready
+        """
+        with self._lock:
+            if self.closed:
+                raise ValueError("The lane is closed")
+            if self._ready is None or self._ready.done():
+                self._ready = grpc.channel_ready_future(self.channel)
+            return self._ready
+
+    def unwatch(self):
+        """
+        Stops watching the connectivity of the channel, ahead of closing it (see close)
+        """
+        with self._lock:
+            self.closed = True
+            ready, self._ready = self._ready, None
+        self.channel.unsubscribe(self._on_state)
+        if ready is not None:
+            ready.cancel()
+
+    def close(self):
+        """
+        Closes the channel of the lane, once gRPC stopped polling its connectivity
+        """
+        self.unwatch()
+        state = getattr(self.channel, '_connectivity_state', None)
+        deadline = time.monotonic() + ConnectivityPollWait
+        while state is not None and state.polling and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.channel.close()
+
+
+class ChannelPool:
+    """
+    A pool of gRPC channels to one or more space-cloud servers (endpoints), which spreads the unary calls across its
+    lanes and pins every streaming RPC to a lane of its own
+
+    An endpoint is ejected after `eject_after` consecutive UNAVAILABLE calls, or when its channel does not get ready
+    during an active health check, and is re-admitted once it passes one. If every endpoint is ejected, the calls are
+    spread over all of them
+    ::
+        pool = ChannelPool(["10.0.0.1:4124", "10.0.0.2:4124"], size=2, balance=constants.EWMALatency)
+        lane = pool.acquire()
+        try:
+            response = lane.stub.Read(read_request)
+        finally:
+            pool.release(lane)
+
+    :param url: (str or List[str]) The URL(s) of the space-cloud server(s)
+    :param size: (int) The number of channels per endpoint used for unary calls (defaults to 1)
+    :param balance: (str) The balancing policy, constants.RoundRobin, constants.LeastOutstanding or
+        constants.EWMALatency
+    :param health_check_interval: (float) The seconds between the active health checks of a pool of more than one
+        endpoint, or None to disable them (defaults to constants.HealthCheckInterval)
+    :param eject_after: (int) The number of consecutive UNAVAILABLE calls which ejects an endpoint
+        (defaults to constants.EjectAfterFailures)
+    """
+
+    def __init__(self, url: Union[str, List[str]], size: int = 1, balance: str = constants.RoundRobin,
+                 health_check_interval: Optional[float] = constants.HealthCheckInterval,
+                 eject_after: int = constants.EjectAfterFailures):
+        urls = [url] if isinstance(url, str) else list(url)
+        if not urls:
+            raise ValueError("The pool needs at least one endpoint")
+        if size < 1:
+            raise ValueError("The pool needs at least one channel")
+        if balance not in (constants.RoundRobin, constants.LeastOutstanding, constants.EWMALatency):
+            raise ValueError(f"Unknown balancing policy: {balance}")
+        self.url = url
+        self.size = size
+        self.balance = balance
+        self.health_check_interval = health_check_interval
+        self.eject_after = eject_after
+        self._lock = threading.Lock()
+        # Notified whenever a lane has no unary call in flight left, which a draining pool waits for
+        self._idle = threading.Condition(self._lock)
+        self._counter = itertools.count()
+        self._closed = threading.Event()
+        self.endpoints: List[Endpoint] = [Endpoint(u) for u in urls]
+        self.lanes: List[Lane] = []
+        for endpoint in self.endpoints:
+            endpoint.lanes = [Lane(endpoint.url, self._options(), endpoint, self) for _ in range(size)]
+            self.lanes.extend(endpoint.lanes)
+        self.stream_lanes: Dict[str, Lane] = {}
+        if len(self.endpoints) > 1 and health_check_interval is not None:
+            threading.Thread(target=self._health_check, name="space-api-health-check", daemon=True).start()
+
+    def _options(self) -> Optional[list]:
+        # gRPC shares subchannels (connections) between channels to the same target by default, so every
+        # lane of a pool needs a local subchannel pool to get a connection of its own
+        if self.size == 1:
+            return None
+        return [('grpc.use_local_subchannel_pool', 1)]
+
+    def _candidates(self, exclude: Optional[Lane], accept: Optional[Callable[[Endpoint], bool]]) -> List[Lane]:
+        lanes = [lane for lane in self.lanes if lane.endpoint.healthy] or self.lanes
+        if accept is not None:
+            lanes = [lane for lane in lanes if accept(lane.endpoint)] or lanes
+        if exclude is not None:
+            # Prefer a lane of another endpoint, then another lane of the same endpoint
+            lanes = [lane for lane in lanes if lane.endpoint is not exclude.endpoint] or \
+                    [lane for lane in lanes if lane is not exclude] or lanes
+        return lanes
+
+    def acquire(self, exclude: Optional[Lane] = None, accept: Optional[Callable[[Endpoint], bool]] = None) -> Lane:
+        """
+        Picks a lane for a unary call, which must be handed back with release
+
+        :param exclude: (Lane) A lane to avoid if the pool has others, e.g. the lane of a call being hedged
+        :param accept: (Callable[[Endpoint], bool]) An (optional) filter of the endpoints to prefer, e.g. the ones
+            whose circuit is not open
+        :return: (Lane) The lane to send the call on
+        """
+        with self._lock:
+            lanes = self._candidates(exclude, accept) if len(self.lanes) > 1 else self.lanes
+            if len(lanes) == 1:
+                lane = lanes[0]
+            else:
+                # Rotate the candidates, so that ties are broken round robin
+                offset = next(self._counter) % len(lanes)
+                lanes = lanes[offset:] + lanes[:offset]
+                if self.balance == constants.LeastOutstanding:
+                    lane = min(lanes, key=lambda l: l.outstanding)
+                elif self.balance == constants.EWMALatency:
+                    now = time.monotonic()
+                    lane = min(lanes, key=lambda l: (l.endpoint.cost(now), l.outstanding))
+                else:
+                    lane = lanes[0]
+            lane.outstanding += 1
+        return lane
+
+    def release(self, lane: Lane, elapsed: Optional[float] = None, code: Optional[grpc.StatusCode] = None):
+        """
+        Marks a unary call on the lane as finished
+
+        :param lane: (Lane) The lane returned by acquire
+        :param elapsed: (float) The (optional) latency of the call in seconds
+        :param code: (grpc.StatusCode) The (optional) status code the call failed with; if neither the latency nor the
+            code is given, the call is taken as never sent
+        """
+        endpoint = lane.endpoint
+        with self._lock:
+            lane.outstanding -= 1
+            if lane.outstanding == 0:
+                self._idle.notify_all()
+            if elapsed is None and code is None:
+                return
+            endpoint.calls += 1
+            if code == grpc.StatusCode.UNAVAILABLE:
+                endpoint.failures += 1
+                if endpoint.healthy and endpoint.failures >= self.eject_after and len(self.endpoints) > 1:
+                    endpoint.healthy = False
+                    endpoint.ejections += 1
+            elif code is None:
+                endpoint.failures = 0
+                if elapsed is not None:
+                    endpoint.ewma = elapsed if not endpoint.ewma else endpoint.ewma + EWMAWeight * (
+                            elapsed - endpoint.ewma)
+                    endpoint.updated = time.monotonic()
+
+    def _health_check(self):
+        """
+        Checks whether the channel of every endpoint gets ready, ejecting and re-admitting the endpoints, until the
+        pool is closed
+        """
+        while not self._closed.wait(self.health_check_interval):
+            for endpoint in self.endpoints:
+                try:
+                    # The pending future of the lane is shared with its other callers, and cancelled when it is closed
+                    endpoint.lanes[0].connect().result(timeout=self.health_check_interval)
+                    ready = True
+                except grpc.FutureTimeoutError:
+                    ready = False
+                except Exception:
+                    # The lane was closed under us
+                    return
+                with self._lock:
+                    if ready and not endpoint.healthy:
+                        endpoint.healthy = True
+                        endpoint.failures = 0
+                    elif not ready and endpoint.healthy:
+                        endpoint.healthy = False
+                        endpoint.ejections += 1
+
+    def stream(self, rpc: str) -> Lane:
+        """
+        Returns the lane the streaming RPC is pinned to
+
+        :param rpc: (str) The name of the streaming RPC
+        :return: (Lane) The lane to open the stream on
+        """
+        if rpc not in StreamingRPCs:
+            raise ValueError(f"{rpc} is not a streaming RPC")
+        if len(self.lanes) == 1:
+            return self.lanes[0]
+        with self._lock:
+            lane = self.stream_lanes.get(rpc)
+            if lane is None:
+                endpoints = [endpoint for endpoint in self.endpoints if endpoint.healthy] or self.endpoints
+                endpoint = endpoints[len(self.stream_lanes) % len(endpoints)]
+                lane = Lane(endpoint.url, self._options(), endpoint, self)
+                self.stream_lanes[rpc] = lane
+        return lane
+
+    def warm_up(self, wait: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Has every channel of the pool connect, so that the first calls do not pay for the connection setup
+
+        :param wait: (bool) Whether to wait for the channels to be ready (defaults to False)
+        :param timeout: (float) The (optional) maximum seconds to wait
+        :return: (bool) Whether all the channels are ready
+        """
+        ready = [lane.connect() for lane in self.lanes]
+        if not wait:
+            return all(future.done() for future in ready)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in ready:
+            try:
+                future.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+            except grpc.FutureTimeoutError:
+                return False
+        return True
+
+    def connectivity(self) -> dict:
+        """
+        Returns the connectivity of the channels
+
+        :return: (dict) The number of channels per state, the number of reconnects, and the time (in seconds) the
+            channels took to get ready, at most and on their last connection
+        """
+        with self._lock:
+            lanes = self.lanes + list(self.stream_lanes.values())
+        states = {}
+        for lane in lanes:
+            states[lane.state.name] = states.get(lane.state.name, 0) + 1
+        ready = [lane for lane in lanes if lane.time_to_ready is not None]
+        return {'states': states, 'reconnects': sum(lane.reconnects for lane in lanes),
+                'max_time_to_ready': max((lane.time_to_ready for lane in ready), default=None),
+                'last_time_to_ready': max(ready, key=lambda lane: lane.ready_at).time_to_ready if ready else None}
+
+    def metrics(self) -> dict:
+        """
+        Returns the health and load of every endpoint
+
+        :return: (dict) Whether the endpoint is healthy, its number of calls, outstanding calls, EWMA latency and
+            ejections, keyed by URL
+        """
+        with self._lock:
+            return {endpoint.url: endpoint.metrics() for endpoint in self.endpoints}
+
+    def drain(self, grace: float = constants.DrainTimeout):
+        """
+        Closes the pool in the background once its unary calls in flight are finished, or after a grace period,
+        e.g. once it was replaced by another pool. The pool must not be handed out for new calls anymore
+
+        :param grace: (float) The maximum seconds to wait for the calls in flight (defaults to constants.DrainTimeout)
+        """
+        threading.Thread(target=self._drain, args=(grace,), name="space-api-drain", daemon=True).start()
+
+    def _drain(self, grace: float):
+        deadline = time.monotonic() + grace
+        with self._idle:
+            while any(lane.outstanding for lane in self.lanes) and time.monotonic() < deadline:
+                self._idle.wait(deadline - time.monotonic())
+        self.close()
+
+    def close(self):
+        """
+        Closes all the channels of the pool, cancelling the calls in flight
+        """
+        self._closed.set()
+        with self._lock:
+            lanes = self.lanes + list(self.stream_lanes.values())
+        # The channels are closed outside of the lock, as closing a channel waits for the callbacks of its calls, which
+        # release their lanes. Every lane stops watching its channel first, so that their waits for gRPC to stop
+        # polling overlap
+        for lane in lanes:
+            lane.unwatch()
+        for lane in lanes:
+            lane.close()
+
+
+__all__ = ["ChannelPool", "Endpoint", "Lane", "StreamingRPCs"]
@@ -2,7 +2,6 @@ from typing import Callable
 import uuid
 from multiprocessing.pool import ThreadPool
 import grpc
-import json
 from concurrent import futures
 from space_api.proto import server_pb2
 from space_api.response import Response
@@ -39,9 +38,6 @@ class Pubsub:
 
     def __init__(self, transport: Transport):
         self.transport = transport
-        self.stub = transport.stub
-        self.project_id = transport.project_id
-        self.token = transport.token
         self.client = Client()
         self.async_result = None
         self.on_receive = None
@@ -51,13 +47,26 @@ class Pubsub:
         self.subscription = None
         # TODO Register Callbacks for Reconnect
 
+    @property
+    def stub(self):
+        # Fetched on use, so that a reconnected transport is picked up
+        return self.transport.stream_stub('PubsubSubscribe')
+
+    @property
+    def project_id(self) -> str:
+        return self.transport.project_id
+
+    @property
+    def token(self) -> str:
+        return self.transport.token
+
     def _run_client(self, _id: str):
         responses = self.stub.PubsubSubscribe(self.client)
         try:
             for response in responses:
                 if response.id == _id:
                     if response.type == constants.TypePubsubSubscribeFeed:
-                        msg = json.loads(response.msg)
+                        msg = self.transport.codec.loads(response.msg)
                         self.on_receive(msg['subject'], msg['data'])
                     elif response.status != 200:
                         print("Pubsub Error:", f"OperationType={response.type}", f"Status={response.status}",
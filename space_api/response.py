@@ -1,4 +1,9 @@
-import json
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+from space_api.encoding import decode_response
+from space_api.codec import JSONCodec, get_codec
+from space_api.columns import Column, to_columns, to_records
 
 
 class Response:
@@ -6,16 +11,128 @@ class Response:
     The Response class
     Contains: status, error, result
 
+    The result is only JSON decoded when first read, so that the responses only checked for their status (e.g. those
+    of the writes) are never decoded. The result is decoded once, even if the response is shared by several threads
+    (e.g. when it is cached or coalesced). The size of the encoded result and the time its decoding took are kept
+
     :param response: (space_api.proto.server_pb2.Response) gRPC Response
+    :param codec: (JSONCodec) The (optional) JSON codec decoding the result (defaults to the default codec)
     """
+    __slots__ = ("status", "error", "encoded_size", "decode_time", "_encoded", "_result", "_codec", "_lock")
 
-    def __init__(self, response):
+    def __init__(self, response, codec: Optional[JSONCodec] = None):
         self.status = response.status
         self.error = response.error if len(response.error) > 0 else None
-        self.result = json.loads(response.result) if len(response.result) > 0 else None
+        # The size in bytes of the encoded result
+        self.encoded_size = len(response.result)
+        # The seconds the decoding of the result took, None until it is decoded
+        self.decode_time = None
+        self._encoded = response.result if self.encoded_size > 0 else None
+        self._result = None
+        self._codec = codec
+        self._lock = threading.Lock()
+
+    @property
+    def result(self):
+        """
+        The result, decoded on first access
+        """
+        if self._encoded is not None:
+            with self._lock:
+                encoded = self._encoded
+                if encoded is not None:
+                    start = time.perf_counter()
+                    self._result = (self._codec or get_codec()).loads(encoded)
+                    self.decode_time = time.perf_counter() - start
+                    self._encoded = None
+        return self._result
+
+    @result.setter
+    def result(self, result):
+        with self._lock:
+            self._result = result
+            self._encoded = None
+
+    def iter_result(self) -> Iterator:
+        """
+        Iterates over the documents of the result, decoding them one at a time unless the result is already decoded.
+        The decoded documents are not kept, so that a large result is never held decoded as a whole
+        ::
+            for doc in db.get('events').apply().iter_result():
+                process(doc)
+
+        :return: (Iterator) The documents of the result (a single document if the result is not a list)
+        """
+        encoded = self._encoded
+        if encoded is not None:
+            return (self._codec or get_codec()).iter_array(encoded)
+        if isinstance(self._result, list):
+            return iter(self._result)
+        return iter(() if self._result is None else (self._result,))
+
+    def to_columns(self, fields: List[str], dtypes: Optional[Dict[str, str]] = None,
+                   use_numpy: Optional[bool] = None) -> Dict[str, Column]:
+        """
+        Turns the documents of the result into typed columns with null masks, in a single pass over them which decodes
+        them one at a time if the result is not decoded yet (see columns.to_columns)
+        ::
+            columns = db.get('orders').apply().to_columns(['id', 'total'], {'id': 'q', 'total': 'd'})
+
+        :param fields: (List[str]) The fields to make columns of, nested fields being joined by dots
+        :param dtypes: (dict{str:str}) The array typecodes of the fields; the other fields are kept as Python objects
+        :param use_numpy: (bool) Whether to return NumPy arrays (defaults to whether NumPy is installed)
+        :return: (dict{str:Column}) The columns by field
+        """
+        return to_columns(self.iter_result(), fields, dtypes, use_numpy)
+
+    def to_records(self, fields: List[str], dtypes: Optional[Dict[str, str]] = None):
+        """
+        Turns the documents of the result into a NumPy structured array (see columns.to_records)
+
+        :param fields: (List[str]) The fields of the records, nested fields being joined by dots
+        :param dtypes: (dict{str:str}) The array typecodes of the fields; the other fields are kept as Python objects
+        :return: (numpy.ndarray) The structured array, with one record per document
+        """
+        return to_records(self.iter_result(), fields, dtypes)
 
     def __str__(self) -> str:
         return f'Response(status={self.status}, error={self.error}, result={self.result})'
 
 
-__all__ = ["Response"]
+class ResponseError(Exception):
+    """
+    Raised by the calls which return the result of a request rather than its Response, if the request failed
+
+    :param status: (int) The status of the response
+    :param error: (str) The error of the response
+    """
+
+    def __init__(self, status: int, error: Optional[str]):
+        super().__init__(f"The request failed with status {status}: {error}")
+        self.status = status
+        self.error = error
+
+
+class RawResponse:
+    """
+    The Response class of the raw calls, whose result is left encoded
+    Contains: status, error, result
+
+    The result is a memoryview of the JSON encoded result as received, e.g. to be forwarded as is
+    ::
+        response = db.get('posts').apply(raw=True)
+        http_response.write(response.result)
+
+    :param data: (bytes) The encoded gRPC Response
+    """
+    __slots__ = ("status", "error", "result")
+
+    def __init__(self, data: bytes):
+        self.status, self.error, self.result = decode_response(data)
+
+    def __str__(self) -> str:
+        result = None if self.result is None else bytes(self.result)
+        return f'RawResponse(status={self.status}, error={self.error}, result={result})'
+
+
+__all__ = ["Response", "RawResponse", "ResponseError"]
@@ -0,0 +1,145 @@
+import random
+import threading
+from typing import Optional, Iterable
+import grpc
+
+# IdempotentRPCs are the unary RPCs which are always safe to retry
+IdempotentRPCs = frozenset(("Read", "Aggregate", "Profile", "Profiles", "ListFiles"))
+
+# OptInRPCs are the unary RPCs which are only retried when the caller opts in, as they may have been applied before
+# the call failed
+OptInRPCs = frozenset(("Create", "Update", "Delete", "Batch"))
+
+
+class RetryBudget:
+    """
+    A token bucket capping the share of the traffic which can be retries
+
+    Every request deposits `ratio` tokens and every retry withdraws one, so that in the long run at most `ratio` of
+    the calls are retries. The bucket holds at most `reserve` tokens, which is the burst of retries allowed under
+    low traffic
+
+    :param ratio: (float) The maximum ratio of retries to requests (defaults to 0.1)
+    :param reserve: (float) The size of the bucket (defaults to 10)
+    """
+
+    def __init__(self, ratio: float = 0.1, reserve: float = 10):
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = reserve
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """
+        Records a request
+        """
+        with self._lock:
+            self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Takes a token for a retry
+
+        :return: (bool) Whether the retry fits in the budget
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    The retry policy of the unary calls of a Transport
+
+    Failed calls are retried with an exponential backoff and full jitter, within a retry budget. The RPCs in
+    IdempotentRPCs are always retried, while the ones in OptInRPCs are only retried if `retry_writes` is set or the
+    caller opts in per call (e.g. db.insert('posts').doc(...).apply(retry=True))
+    ::
+        from space_api import API
+        from space_api.retry import RetryPolicy
+        api = API("My-Project", "localhost:4124", retry_policy=RetryPolicy(max_attempts=4))
+        print(api.metrics()['retry'])
+
+    :param max_attempts: (int) The maximum number of attempts per call, including the first one (defaults to 3)
+    :param base_delay: (float) The backoff ceiling (in seconds) of the first retry (defaults to 0.05)
+    :param max_delay: (float) The maximum backoff ceiling (in seconds) (defaults to 2)
+    :param multiplier: (float) The growth of the backoff ceiling per attempt (defaults to 2)
+    :param codes: (Iterable[grpc.StatusCode]) The status codes which are retried (defaults to UNAVAILABLE)
+    :param budget: (RetryBudget) The retry budget (defaults to RetryBudget())
+    :param retry_writes: (bool) Retry the RPCs in OptInRPCs by default (defaults to False)
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.05, max_delay: float = 2.0,
+                 multiplier: float = 2.0, codes: Iterable[grpc.StatusCode] = (grpc.StatusCode.UNAVAILABLE,),
+                 budget: Optional[RetryBudget] = None, retry_writes: bool = False):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.codes = frozenset(codes)
+        self.budget = budget if budget is not None else RetryBudget()
+        self.retry_writes = retry_writes
+        self._lock = threading.Lock()
+        self._counters = {'calls': 0, 'retries': 0, 'budget_exhausted': 0, 'attempts_exhausted': 0}
+        self._retries_by_rpc = {}
+
+    def record_call(self):
+        """
+        Records a new call (not a retry), which refills the retry budget
+        """
+        self.budget.deposit()
+        self._count('calls')
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns the (jittered) delay before a retry
+
+        :param attempt: (int) The number of the failed attempt, starting at 0
+        :return: (float) The delay in seconds
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * self.multiplier ** attempt))
+
+    def delay(self, rpc: str, error: grpc.RpcError, attempt: int, opt_in: Optional[bool] = None) -> Optional[float]:
+        """
+        Decides whether a failed call is retried
+
+        :param rpc: (str) The name of the RPC
+        :param error: (grpc.RpcError) The error of the failed attempt
+        :param attempt: (int) The number of the failed attempt, starting at 0
+        :param opt_in: (bool) The (optional) per call choice to retry the RPCs in OptInRPCs
+        :return: (float) The delay in seconds before the retry, or None if the call should fail
+        """
+        if rpc not in IdempotentRPCs:
+            if rpc not in OptInRPCs or not (self.retry_writes if opt_in is None else opt_in):
+                return None
+        if not isinstance(error, grpc.Call) or error.code() not in self.codes:
+            return None
+        if attempt + 1 >= self.max_attempts:
+            self._count('attempts_exhausted')
+            return None
+        if not self.budget.withdraw():
+            self._count('budget_exhausted')
+            return None
+        self._count('retries')
+        with self._lock:
+            self._retries_by_rpc[rpc] = self._retries_by_rpc.get(rpc, 0) + 1
+        return self.backoff(attempt)
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def metrics(self) -> dict:
+        """
+        Returns the retry counters
+
+        :return: (dict) The number of calls, retries, retries per RPC and calls which were not retried because the
+            budget or the attempts ran out
+        """
+        with self._lock:
+            return dict(self._counters, retries_by_rpc=dict(self._retries_by_rpc))
+
+
+__all__ = ["RetryPolicy", "RetryBudget", "IdempotentRPCs", "OptInRPCs"]
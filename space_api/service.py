@@ -1,12 +1,11 @@
 import uuid
-import json
 import grpc
 from concurrent import futures
 from multiprocessing.pool import ThreadPool
 from typing import Callable
 from space_api.proto import server_pb2
 from space_api import constants
-from space_api.utils import obj_to_utf8_bytes, Client
+from space_api.utils import Client
 from space_api.transport import Transport
 
 
@@ -27,15 +26,26 @@ class Service:
     """
 
     def __init__(self, transport: Transport, service: str):
-        self.stub = transport.stub
-        self.project_id = transport.project_id
-        self.token = transport.token
+        self.transport = transport
         self.service = service
         self.storage = {}
         self.client = Client()
         self.uid = str(uuid.uuid1())
         self.pool = futures.ThreadPoolExecutor()
 
+    @property
+    def stub(self):
+        # Fetched on use, so that a reconnected transport is picked up
+        return self.transport.stream_stub('Service')
+
+    @property
+    def project_id(self) -> str:
+        return self.transport.project_id
+
+    @property
+    def token(self) -> str:
+        return self.transport.token
+
     def register_func(self, func_name: str, function: Callable):
         """
         Register a function with the Service
@@ -50,12 +60,13 @@ class Service:
 
     def _run_client(self):
         responses = self.stub.Service(self.client)
+        codec = self.transport.codec
         try:
             for response in responses:
                 if response.type == constants.TypeServiceRegister:
                     if response.id == self.uid:
                         if len(response.params) > 0:
-                            if json.loads(response.params).get('ack'):
+                            if codec.loads(response.params).get('ack'):
                                 print("Registered Service:", self.service)
                 if response.type == constants.TypeServiceRequest:
                     if response.function in self.storage:
@@ -65,11 +76,11 @@ class Service:
                                     self.pool.map(self._func, (
                                         server_pb2.FunctionsPayload(id=response.id, type=constants.TypeServiceRequest,
                                                                     service=self.service,
-                                                                    params=obj_to_utf8_bytes(result)),))
+                                                                    params=codec.dumps(result)),))
                                 else:
                                     raise ValueError("The kind (1st parameter) should be 'response'")
 
-                            self.storage[response.function](json.loads(response.params), json.loads(response.auth),
+                            self.storage[response.function](codec.loads(response.params), codec.loads(response.auth),
                                                             callback)
                         except ValueError as e:
                             if str(e) == "The kind (1st parameter) should be 'response'":
@@ -1,12 +1,29 @@
 import grpc
 import io
-from typing import Optional, Dict, List
+import math
+import time
+import threading
+from concurrent import futures
+from typing import Optional, Dict, Iterable, List, Tuple, Union
 from space_api.proto import server_pb2
-from space_api.utils import obj_to_utf8_bytes
 from space_api.proto.server_pb2_grpc import SpaceCloudStub
-from space_api.response import Response
+from space_api.response import Response, RawResponse
+from space_api.pool import ChannelPool, Lane
+from space_api.compression import Compression
+from space_api.retry import RetryPolicy
+from space_api.hedging import HedgePolicy
+from space_api.breaker import CircuitBreaker, CircuitOpenError
+from space_api.coalescing import Coalescer
+from space_api.cache import ReadCache
+from space_api.deadline import DeadlineExceededError, resolve, remaining
+from space_api.encoding import Encoder, EncodedRequest
+from space_api.codec import JSONCodec, get_codec
+from space_api.utils import encode_find
 from space_api import constants
 
+# The error of resolving a future which was cancelled meanwhile (Python 3.8+, earlier versions resolve it anyway)
+_InvalidStateError = getattr(futures, 'InvalidStateError', ())
+
 
 def make_read_options(select: Dict[str, int], sort: Dict[str, int], skip: int, limit: int,
                       distinct: str) -> server_pb2.ReadOptions:
@@ -23,52 +40,57 @@ def make_read_options(select: Dict[str, int], sort: Dict[str, int], skip: int, l
     return server_pb2.ReadOptions(select=select, sort=sort, skip=skip, limit=limit, distinct=distinct)
 
 
-class Transport:
+class BaseTransport:
     """
-        The SpaceUp Transport Instance
-        ::
-            transport = Transport("localhost:4124")
+    The state and the request building shared by Transport and the asyncio AsyncTransport, which send the requests
+    over their own channels
 
-        :param url: (str) The URL of space-cloud server
-
-        """
+    :param url: (str or List[str]) The URL of space-cloud server, or the URLs of several replicas
+    :param project_id: (str) The project ID
+    :param token: (str) The (optional) JWT token
+    :param timeout: (float) The (optional) default timeout of the unary calls in seconds
+    :param codec: (str or JSONCodec) The (optional) JSON codec, or its name (defaults to the first installed one
+        of constants.JSONCodecs)
+    :param encoder: (Encoder) The (optional) encoder of the reads and writes, which are built as protobuf messages
+        without one
+    """
 
-    def __init__(self, url: str, project_id: str, token: Optional[str] = None):
+    def __init__(self, url: Union[str, List[str]], project_id: str, token: Optional[str] = None,
+                 timeout: Optional[float] = None, codec: Union[str, JSONCodec, None] = None,
+                 encoder: Optional[Encoder] = None):
         self.url = url
         self.project_id = project_id
         self.token = token
-        self.channel = grpc.insecure_channel(self.url)
-        # self.channel = grpc.insecure_channel(self.url, options=[('grpc.keepalive_timeout_ms', 10000),
-        #                                                         ('grpc.keepalive_permit_without_calls', 1)])
-        self.stub = SpaceCloudStub(self.channel)
+        self.timeout = timeout
+        self.codec = get_codec(codec)
+        self.encoder = encoder
+        self._deadlines_lock = threading.Lock()
+        self._deadlines_exceeded = {}
 
-    def close(self):
-        """
-        Closes the communication channel
+    def _timeout(self, rpc: str, at: Optional[float]) -> Optional[float]:
         """
-        self.channel.close()
+        Returns the timeout of an attempt of a unary call
 
-    def connect(self):
-        """
-        Connects to the Space Cloud Instance
+        :param rpc: (str) The name of the unary RPC
+        :param at: (float) The deadline of the call as a time.monotonic() timestamp, if any
+        :return: (float) The seconds left until the deadline, or None if the call has none
         """
-        self.channel = grpc.insecure_channel(self.url)
-        self.stub = SpaceCloudStub(self.channel)
+        timeout = remaining(at)
+        if timeout is not None and timeout <= 0:
+            raise DeadlineExceededError(rpc)
+        return timeout
 
-    def faas(self, service: str, function: str, params, timeout: int) -> Response:
+    def _failed(self, rpc: str, error: BaseException):
         """
-        Calls the gRPC Call function
+        Counts the calls which failed for running out of time
 
-        :param service: (str) The name of service(engine) with which the function is registered
-        :param function: (str) The name of function to be called
-        :param params: The params for the function
-        :param timeout: (int) The timeout in milliseconds
-        :return: (Response) The response object containing values corresponding to the request
+        :param rpc: (str) The name of the unary RPC
+        :param error: (BaseException) The error the call failed with
         """
-        params = obj_to_utf8_bytes(params)
-        functions_request = server_pb2.FunctionsRequest(params=params, timeout=timeout // 1000, service=service,
-                                                        function=function, token=self.token, project=self.project_id)
-        return Response(self.stub.Call(functions_request))
+        if isinstance(error, grpc.RpcError) and hasattr(error, 'code') and \
+                error.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+            with self._deadlines_lock:
+                self._deadlines_exceeded[rpc] = self._deadlines_exceeded.get(rpc, 0) + 1
 
     def _make_meta(self, db_type: Optional[str] = None, col: Optional[str] = None) -> server_pb2.Meta:
         """
@@ -87,95 +109,869 @@ class Transport:
             meta.col = col
         return meta
 
-    def read(self, find, operation: str, options: server_pb2.ReadOptions, db_type: str, col: str) -> Response:
+    def _functions_request(self, service: str, function: str, params, timeout: int) -> server_pb2.FunctionsRequest:
+        """
+        Makes a gRPC FunctionsRequest object (see faas)
+        """
+        params = self.codec.dumps(params)
+        return server_pb2.FunctionsRequest(params=params, timeout=math.ceil(timeout / 1000), service=service,
+                                           function=function, token=self.token, project=self.project_id)
+
+    def _encode(self, value) -> bytes:
+        """
+        Encodes a JSON parameter of a request, unless it is already encoded, e.g. by a prepared query
+        """
+        return value if type(value) is bytes else self.codec.dumps(value)
+
+    def _read_request(self, find, operation: str, options: Union[server_pb2.ReadOptions, bytes], db_type: str,
+                      col: str) -> Union[server_pb2.ReadRequest, EncodedRequest]:
+        """
+        Makes a gRPC ReadRequest object, or encodes it if the transport has an encoder (see read)
+        """
+        find = encode_find(find, self.codec)
+        if self.encoder is not None:
+            return self.encoder.read(find, operation, options, self.project_id, self.token, db_type, col)
+        if isinstance(options, bytes):
+            options = server_pb2.ReadOptions.FromString(options)
+        meta = self._make_meta(db_type, col)
+        return server_pb2.ReadRequest(find=find, operation=operation, options=options, meta=meta)
+
+    def _create_request(self, document, operation: str, db_type: str,
+                        col: str) -> Union[server_pb2.CreateRequest, EncodedRequest]:
+        """
+        Makes a gRPC CreateRequest object, or encodes it if the transport has an encoder (see create)
+        """
+        document = self._encode(document)
+        if self.encoder is not None:
+            return self.encoder.create(document, operation, self.project_id, self.token, db_type, col)
+        meta = self._make_meta(db_type, col)
+        return server_pb2.CreateRequest(document=document, operation=operation, meta=meta)
+
+    def _update_request(self, find, operation: str, _update, db_type: str,
+                        col: str) -> Union[server_pb2.UpdateRequest, EncodedRequest]:
+        """
+        Makes a gRPC UpdateRequest object, or encodes it if the transport has an encoder (see update)
+        """
+        find = encode_find(find, self.codec)
+        _update = self._encode(_update)
+        if self.encoder is not None:
+            return self.encoder.update(find, operation, _update, self.project_id, self.token, db_type, col)
+        meta = self._make_meta(db_type, col)
+        return server_pb2.UpdateRequest(find=find, operation=operation, update=_update, meta=meta)
+
+    def _delete_request(self, find, operation: str, db_type: str,
+                        col: str) -> Union[server_pb2.DeleteRequest, EncodedRequest]:
+        """
+        Makes a gRPC DeleteRequest object, or encodes it if the transport has an encoder (see delete)
+        """
+        find = encode_find(find, self.codec)
+        if self.encoder is not None:
+            return self.encoder.delete(find, operation, self.project_id, self.token, db_type, col)
+        meta = self._make_meta(db_type, col)
+        return server_pb2.DeleteRequest(find=find, operation=operation, meta=meta)
+
+    def _aggregate_request(self, pipeline, operation: str, db_type: str,
+                           col: str) -> Union[server_pb2.AggregateRequest, EncodedRequest]:
+        """
+        Makes a gRPC AggregateRequest object, or encodes it if the transport has an encoder (see aggregate)
+        """
+        pipeline = self._encode(pipeline)
+        if self.encoder is not None:
+            return self.encoder.aggregate(pipeline, operation, self.project_id, self.token, db_type, col)
+        meta = self._make_meta(db_type, col)
+        return server_pb2.AggregateRequest(pipeline=pipeline, operation=operation, meta=meta)
+
+    def _batch_request(self, all_requests: List[server_pb2.AllRequest], db_type: str) -> server_pb2.BatchRequest:
+        """
+        Makes a gRPC BatchRequest object (see batch)
+        """
+        meta = self._make_meta(db_type)
+        return server_pb2.BatchRequest(meta=meta, batchrequest=all_requests)
+
+    def _edit_profile_request(self, _id: str, email: str, name: str, password: str,
+                              db_type: str) -> server_pb2.EditProfileRequest:
+        """
+        Makes a gRPC EditProfileRequest object (see edit_profile)
+        """
+        meta = self._make_meta(db_type=db_type)
+        edit_profile_request = server_pb2.EditProfileRequest(id=_id, meta=meta)
+        if email is not None:
+            edit_profile_request.email = email
+        if name is not None:
+            edit_profile_request.name = name
+        if password is not None:
+            edit_profile_request.password = password
+        return edit_profile_request
+
+    def _upload_file_requests(self, path: str, name: str, stream: io.BufferedReader):
+        """
+        Yields the gRPC UploadFileRequest objects (see upload_file)
+        """
+        yield server_pb2.UploadFileRequest(path=path, name=name, meta=self._make_meta())
+        for chunk in iter(lambda: stream.read(constants.PayloadSize), b''):
+            yield server_pb2.UploadFileRequest(payload=chunk)
+
+    def _publish_request(self, subject: str, msg) -> server_pb2.PubsubPublishRequest:
+        """
+        Makes a gRPC PubsubPublishRequest object (see pubsub_publish)
+        """
+        msg = self.codec.dumps(msg)
+        meta = self._make_meta()
+        return server_pb2.PubsubPublishRequest(subject=subject, msg=msg, meta=meta)
+
+
+class Transport(BaseTransport):
+    """
+        The SpaceUp Transport Instance
+        ::
+            transport = Transport("localhost:4124")
+
+        :param url: (str or List[str]) The URL of space-cloud server, or the URLs of several replicas
+        :param project_id: (str) The project ID
+        :param token: (str) The (optional) JWT token
+        :param channels: (int) The number of gRPC channels per server the unary calls are spread over (defaults to 1)
+        :param balance: (str) How the unary calls are spread over the channels, constants.RoundRobin (default),
+            constants.LeastOutstanding or constants.EWMALatency
+        :param compression: (Compression) The (optional) compression policy of the unary calls
+        :param retry_policy: (RetryPolicy) The (optional) retry policy of the unary calls
+        :param hedging: (HedgePolicy) The (optional) hedging policy of the idempotent unary calls
+        :param health_check_interval: (float) The seconds between the health checks of several servers, or None to
+            disable them (defaults to constants.HealthCheckInterval)
+        :param breaker: (CircuitBreaker) The (optional) circuit breaker of the unary calls
+        :param coalescer: (Coalescer) The (optional) coalescer of the identical concurrent reads
+        :param timeout: (float) The (optional) default timeout of the unary calls in seconds, including their retries
+        :param codec: (str or JSONCodec) The (optional) JSON codec, or its name (defaults to the first installed one
+            of constants.JSONCodecs)
+        :param cache: (ReadCache) The (optional) cache of the reads, invalidated by the writes of the transport and the
+            realtime feeds of its live collections
+
+        """
+
+    def __init__(self, url: Union[str, List[str]], project_id: str, token: Optional[str] = None, channels: int = 1,
+                 balance: str = constants.RoundRobin, compression: Optional[Compression] = None,
+                 retry_policy: Optional[RetryPolicy] = None, hedging: Optional[HedgePolicy] = None,
+                 health_check_interval: Optional[float] = constants.HealthCheckInterval,
+                 breaker: Optional[CircuitBreaker] = None, coalescer: Optional[Coalescer] = None,
+                 timeout: Optional[float] = None, codec: Union[str, JSONCodec, None] = None,
+                 cache: Optional[ReadCache] = None):
+        # The reads and writes are encoded straight to their wire bytes, unless the encoder is set to None
+        super().__init__(url, project_id, token, timeout, codec, Encoder())
+        self.channels = channels
+        self.balance = balance
+        self.compression = compression
+        self.retry_policy = retry_policy
+        self.hedging = hedging
+        self.health_check_interval = health_check_interval
+        self.breaker = breaker
+        self.coalescer = coalescer
+        self.cache = cache
+        if cache is not None:
+            cache.bind(self)
+        self.connects = 0
+        self.pool = ChannelPool(self.url, channels, balance, health_check_interval)
+        # self.channel = grpc.insecure_channel(self.url, options=[('grpc.keepalive_timeout_ms', 10000),
+        #                                                         ('grpc.keepalive_permit_without_calls', 1)])
+
+    @property
+    def channel(self) -> grpc.Channel:
+        """
+        The channel of the first lane of the current pool
+        """
+        return self.pool.lanes[0].channel
+
+    @property
+    def stub(self) -> SpaceCloudStub:
+        """
+        The stub of the first lane of the current pool
+        """
+        return self.pool.lanes[0].stub
+
+    def close(self):
+        """
+        Closes the communication channel
+        """
+        if self.cache is not None:
+            self.cache.close()
+        self.pool.close()
+
+    def connect(self):
+        """
+        Connects to the Space Cloud Instance, replacing the channels
+
+        The components of the API fetch their stubs from the transport on use, so they all pick up the new channels.
+        The old channels are drained: they are closed once the unary calls in flight on them are answered, or after
+        constants.DrainTimeout seconds, cancelling the calls still in flight. Streams opened on the old channels are
+        closed along with them
+        """
+        pool, self.pool = self.pool, ChannelPool(self.url, self.channels, self.balance, self.health_check_interval)
+        self.connects += 1
+        self.pool.warm_up()
+        pool.drain()
+
+    def warm_up(self, wait: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Has every channel connect, so that the first calls do not pay for DNS, TCP and HTTP/2 setup
+
+        :param wait: (bool) Whether to wait for the channels to be ready (defaults to False)
+        :param timeout: (float) The (optional) maximum seconds to wait
+        :return: (bool) Whether all the channels are ready
+        """
+        return self.pool.warm_up(wait, timeout)
+
+    def stream_stub(self, rpc: str) -> SpaceCloudStub:
+        """
+        Returns the stub of the lane the streaming RPC is pinned to
+
+        :param rpc: (str) The name of the streaming RPC (RealTime, Service, PubsubSubscribe, UploadFile, DownloadFile)
+        :return: (SpaceCloudStub) The gRPC stub to open the stream with
+        """
+        return self.pool.stream(rpc).stub
+
+    def metrics(self) -> dict:
+        """
+        Returns the counters of the transport policies, and the health and load of the servers
+
+        :return: (dict) The counters, keyed by policy, the server metrics under 'endpoints', the number of calls
+            which ran out of time per RPC under 'deadline_exceeded' and the channel metrics under 'connectivity'
+        """
+        with self._deadlines_lock:
+            metrics = {'endpoints': self.pool.metrics(), 'deadline_exceeded': dict(self._deadlines_exceeded)}
+        metrics['connectivity'] = dict(self.pool.connectivity(), connects=self.connects)
+        if self.compression is not None:
+            metrics['compression'] = self.compression.metrics()
+        if self.retry_policy is not None:
+            metrics['retry'] = self.retry_policy.metrics()
+        if self.hedging is not None:
+            metrics['hedging'] = self.hedging.metrics()
+        if self.breaker is not None:
+            metrics['breaker'] = self.breaker.metrics()
+        if self.coalescer is not None:
+            metrics['coalescing'] = self.coalescer.metrics()
+        if self.cache is not None:
+            metrics['cache'] = self.cache.metrics()
+        return metrics
+
+    def _compression(self, request) -> Optional[grpc.Compression]:
+        """
+        Picks the compression for a unary call
+
+        :param request: The gRPC request object
+        :return: (grpc.Compression) The compression algorithm, or None to send the request uncompressed
+        """
+        if self.compression is None:
+            return None
+        return self.compression.choose(request)
+
+    def _retry_delay(self, rpc: str, error: grpc.RpcError, attempt: int, retry: Optional[bool],
+                     at: Optional[float] = None) -> Optional[float]:
+        """
+        Asks the retry policy whether a failed call is retried
+
+        :param rpc: (str) The name of the unary RPC
+        :param error: (grpc.RpcError) The error of the failed attempt
+        :param attempt: (int) The number of the failed attempt, starting at 0
+        :param retry: (bool) The (optional) per call choice to retry a non idempotent RPC
+        :param at: (float) The deadline of the call as a time.monotonic() timestamp, if any
+        :return: (float) The delay in seconds before the retry, or None if the call should fail
+        """
+        if self.retry_policy is None or (at is not None and remaining(at) <= 0):
+            return None
+        delay = self.retry_policy.delay(rpc, error, attempt, retry)
+        if delay is not None and at is not None and delay >= remaining(at):
+            # The retry could not be sent before the deadline
+            return None
+        return delay
+
+    def _acquire(self, request, exclude: Optional[Lane] = None) -> Tuple[Lane, Optional[str]]:
+        """
+        Picks a lane for a unary call, preferring the endpoints whose circuit is not open
+
+        :param request: The gRPC request object
+        :param exclude: (Lane) A lane to avoid if the pool has others
+        :return: (Tuple[Lane, str]) The lane, and the key of its circuit if a circuit breaker is used
+        """
+        if self.breaker is None:
+            return self.pool.acquire(exclude), None
+        lane = self.pool.acquire(exclude, lambda endpoint: self.breaker.available(
+            self.breaker.key(endpoint.url, request)))
+        key = self.breaker.key(lane.endpoint.url, request)
+        if not self.breaker.allow(key):
+            lane.pool.release(lane)
+            raise CircuitOpenError(key)
+        return lane, key
+
+    def _release(self, lane: Lane, key: Optional[str], start: float, call: Optional[grpc.Call] = None):
+        """
+        Hands a lane back to the channel pool, along with the latency and status of the call
+
+        :param lane: (Lane) The lane the call was sent on
+        :param key: (str) The key of the circuit of the call, if any
+        :param start: (float) The monotonic time the call was sent at
+        :param call: (grpc.Call) The finished call or the error it raised, None if it succeeded
+        """
+        code = call.code() if isinstance(call, grpc.Call) else None
+        if code == grpc.StatusCode.OK:
+            code = None
+        if code is None:
+            lane.pool.release(lane, time.monotonic() - start)
+        else:
+            lane.pool.release(lane, code=code)
+        if key is not None:
+            self.breaker.record(key, code)
+
+    def _abort(self, lane: Lane, key: Optional[str], start: float, error: Exception):
+        """
+        Hands a lane back to the channel pool after a call failed to be made, e.g. on a closed channel
+
+        :param lane: (Lane) The lane the call was made on
+        :param key: (str) The key of the circuit of the call, if any
+        :param start: (float) The monotonic time the call was made at
+        :param error: (Exception) The error the call raised
+        """
+        if isinstance(error, grpc.RpcError):
+            self._release(lane, key, start, error)
+            return
+        # The call was never sent, but a trial call of a half-open circuit must still be accounted for
+        lane.pool.release(lane)
+        if key is not None:
+            self.breaker.record(key, grpc.StatusCode.CANCELLED)
+
+    @staticmethod
+    def _method(lane: Lane, rpc: str, request, raw: bool = False) -> grpc.UnaryUnaryMultiCallable:
+        """
+        Returns the callable sending a unary call on a lane
+
+        :param lane: (Lane) The lane the call is sent on
+        :param rpc: (str) The name of the unary RPC
+        :param request: The gRPC request object, or an EncodedRequest
+        :param raw: (bool) Whether the callable returns the encoded Response
+        :return: (grpc.UnaryUnaryMultiCallable) The callable of the stub, or the one of the lane
+        """
+        if raw or isinstance(request, EncodedRequest):
+            return lane.unary(rpc, raw)
+        return getattr(lane.stub, rpc)
+
+    def _call(self, rpc: str, request, compression: Optional[grpc.Compression], at: Optional[float] = None,
+              raw: bool = False) -> Union[server_pb2.Response, bytes]:
+        """
+        Makes a single attempt of a unary call, hedging it as per the hedging policy
+
+        :param rpc: (str) The name of the unary RPC
+        :param request: The gRPC request object
+        :param compression: (grpc.Compression) The compression of the call
+        :param at: (float) The deadline of the call as a time.monotonic() timestamp, if any
+        :param raw: (bool) Whether to return the encoded Response (defaults to False)
+        :return: (server_pb2.Response or bytes) gRPC Response object, or its encoding
+        """
+        if self.hedging is not None and self.hedging.applies(rpc):
+            return self._hedged_call(rpc, request, compression, at, raw).result()
+        timeout = self._timeout(rpc, at)
+        lane, key = self._acquire(request)
+        start = time.monotonic()
+        try:
+            response = self._method(lane, rpc, request, raw)(request, timeout=timeout, compression=compression)
+        except Exception as e:
+            self._abort(lane, key, start, e)
+            raise
+        self._release(lane, key, start)
+        return response
+
+    def _call_future(self, rpc: str, request, compression: Optional[grpc.Compression], at: Optional[float] = None,
+                     raw: bool = False):
+        """
+        Makes a single attempt of a unary call without blocking, hedging it as per the hedging policy
+
+        :param rpc: (str) The name of the unary RPC
+        :param request: The gRPC request object
+        :param compression: (grpc.Compression) The compression of the call
+        :param at: (float) The deadline of the call as a time.monotonic() timestamp, if any
+        :param raw: (bool) Whether the future resolves to the encoded Response (defaults to False)
+        :return: A (gRPC or concurrent) future resolving to the gRPC Response object, which can be cancelled
+        """
+        if self.hedging is not None and self.hedging.applies(rpc):
+            return self._hedged_call(rpc, request, compression, at, raw)
+        timeout = self._timeout(rpc, at)
+        lane, key = self._acquire(request)
+        start = time.monotonic()
+        try:
+            call = self._method(lane, rpc, request, raw).future(request, timeout=timeout, compression=compression)
+        except Exception as e:
+            self._abort(lane, key, start, e)
+            raise
+        call.add_done_callback(lambda _call: self._release(lane, key, start, _call))
+        return call
+
+    def _hedged_call(self, rpc: str, request, compression: Optional[grpc.Compression], at: Optional[float] = None,
+                     raw: bool = False) -> futures.Future:
+        """
+        Sends a unary call, and a duplicate on another lane if it is not answered within the hedging delay. The first
+        answer wins and the other call is cancelled
+
+        :param rpc: (str) The name of the unary (idempotent) RPC
+        :param request: The gRPC request object
+        :param compression: (grpc.Compression) The compression of the call
+        :param at: (float) The deadline of the call (and its hedge) as a time.monotonic() timestamp, if any
+        :param raw: (bool) Whether the future resolves to the encoded Response (defaults to False)
+        :return: (futures.Future[server_pb2.Response]) A future resolving to the gRPC Response object
+        """
+        self.hedging.record_call()
+        future = futures.Future()
+        lock = threading.Lock()
+        calls = []
+        timer = [None]
+        answered = [False]
+
+        def send(exclude: Optional[Lane] = None) -> Lane:
+            timeout = self._timeout(rpc, at)
+            lane, key = self._acquire(request, exclude)
+            start = time.monotonic()
+            try:
+                call = self._method(lane, rpc, request, raw).future(request, timeout=timeout, compression=compression)
+            except Exception as e:
+                self._abort(lane, key, start, e)
+                raise
+            with lock:
+                calls.append(call)
+            call.add_done_callback(lambda _call: on_call_done(_call, lane, key, start, exclude is not None))
+            return lane
+
+        def on_call_done(call, lane: Lane, key: Optional[str], start: float, hedge: bool):
+            self._release(lane, key, start, call)
+            try:
+                response = call.result()
+            except Exception as e:
+                with lock:
+                    calls.remove(call)
+                    # Only fail once no other attempt is (or can be) in flight
+                    if answered[0] or calls:
+                        return
+                    answered[0] = True
+                self.hedging.scheduler.cancel(timer[0])
+                future.set_exception(e)
+                return
+            with lock:
+                if answered[0]:
+                    return
+                answered[0] = True
+                losers = [c for c in calls if c is not call]
+            self.hedging.scheduler.cancel(timer[0])
+            for loser in losers:
+                loser.cancel()
+            self.hedging.record_latency(rpc, time.monotonic() - start, hedge)
+            future.set_result(response)
+
+        def hedge():
+            with lock:
+                if answered[0] or not calls:
+                    return
+            if self.hedging.allow():
+                try:
+                    send(exclude=primary)
+                except (CircuitOpenError, DeadlineExceededError):
+                    pass
+
+        def on_cancel(f: futures.Future):
+            if f.cancelled():
+                with lock:
+                    pending = list(calls)
+                for call in pending:
+                    call.cancel()
+
+        primary = send()
+        delay = self.hedging.hedge_delay(rpc)
+        with lock:
+            if delay is not None and not answered[0]:
+                timer[0] = self.hedging.scheduler.call_later(delay, hedge)
+        future.add_done_callback(on_cancel)
+        return future
+
+    def _unary(self, rpc: str, request, retry: Optional[bool] = None, timeout: Optional[float] = None,
+               raw: bool = False) -> Union[Response, RawResponse]:
+        """
+        Sends a unary call, coalescing it with the identical calls in flight as per the coalescer
+
+        :param rpc: (str) The name of the unary RPC
+        :param request: The gRPC request object
+        :param retry: (bool) The (optional) per call choice to retry a non idempotent RPC
+        :param timeout: (float) The (optional) timeout of the call in seconds (defaults to the transport's timeout)
+        :param raw: (bool) Whether to leave the result encoded, in a RawResponse (defaults to False)
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        at = resolve(self.timeout if timeout is None else timeout)
+        if self.coalescer is not None and self.coalescer.applies(rpc):
+            return self.coalescer.do(self._coalescing_key(rpc, request, raw),
+                                     lambda: self._send(rpc, request, retry, at, raw), at,
+                                     lambda: self._expired(rpc))
+        return self._send(rpc, request, retry, at, raw)
+
+    def _unary_future(self, rpc: str, request, retry: Optional[bool] = None, timeout: Optional[float] = None,
+                      raw: bool = False) -> futures.Future:
+        """
+        Sends a unary call without blocking, coalescing it with the identical calls in flight as per the coalescer
+
+        :param rpc: (str) The name of the unary RPC
+        :param request: The gRPC request object
+        :param retry: (bool) The (optional) per call choice to retry a non idempotent RPC
+        :param timeout: (float) The (optional) timeout of the call in seconds (defaults to the transport's timeout)
+        :param raw: (bool) Whether to leave the result encoded, in a RawResponse (defaults to False)
+        :return: (futures.Future[Response]) A future resolving to the response object, cancelling it cancels the call
+        """
+        at = resolve(self.timeout if timeout is None else timeout)
+        if self.coalescer is not None and self.coalescer.applies(rpc):
+            return self.coalescer.do_future(self._coalescing_key(rpc, request, raw),
+                                            lambda: self._send_future(rpc, request, retry, at, raw), at,
+                                            lambda: self._expired(rpc))
+        return self._send_future(rpc, request, retry, at, raw)
+
+    def _expired(self, rpc: str) -> DeadlineExceededError:
+        """
+        Returns the error of a coalesced call whose deadline passed while it waited for the identical call in flight,
+        counting it along with the calls which failed for running out of time
+
+        :param rpc: (str) The name of the unary RPC
+        :return: (DeadlineExceededError) The error
+        """
+        error = DeadlineExceededError(rpc, "while waiting for the identical call in flight")
+        self._failed(rpc, error)
+        return error
+
+    def _coalescing_key(self, rpc: str, request, raw: bool) -> bytes:
+        """
+        Returns the key under which identical calls are coalesced, raw calls only being identical to raw calls
+        """
+        key = self.coalescer.key(rpc, request)
+        return b'raw\0' + key if raw else key
+
+    def _write(self, rpc: str, request, scopes: Iterable[Tuple[str, str]], retry: Optional[bool] = None,
+               timeout: Optional[float] = None) -> Response:
+        """
+        Sends a write, invalidating the cached reads of its collections both when it is sent and when it is answered,
+        so that the reads sent in between are not cached either
+        """
+        if self.cache is None:
+            return self._unary(rpc, request, retry=retry, timeout=timeout)
+        self._invalidate(scopes)
+        try:
+            return self._unary(rpc, request, retry=retry, timeout=timeout)
+        finally:
+            self._invalidate(scopes)
+
+    def _write_future(self, rpc: str, request, scopes: Iterable[Tuple[str, str]], retry: Optional[bool] = None,
+                      timeout: Optional[float] = None) -> futures.Future:
+        """
+        Sends a write without blocking, invalidating the cached reads of its collections (see _write)
+        """
+        if self.cache is None:
+            return self._unary_future(rpc, request, retry=retry, timeout=timeout)
+        self._invalidate(scopes)
+        future = self._unary_future(rpc, request, retry=retry, timeout=timeout)
+        future.add_done_callback(lambda _: self._invalidate(scopes))
+        return future
+
+    def _invalidate(self, scopes: Iterable[Tuple[str, str]]):
+        for db_type, col in scopes:
+            self.cache.invalidate(db_type, col)
+
+    def _send(self, rpc: str, request, retry: Optional[bool] = None, at: Optional[float] = None,
+              raw: bool = False) -> Union[Response, RawResponse]:
+        """
+        Sends a unary call on a lane picked by the channel pool, retrying it as per the retry policy
+
+        :param rpc: (str) The name of the unary RPC
+        :param request: The gRPC request object
+        :param retry: (bool) The (optional) per call choice to retry a non idempotent RPC
+        :param at: (float) The deadline of the call (including its retries) as a time.monotonic() timestamp, if any
+        :param raw: (bool) Whether to leave the result encoded, in a RawResponse (defaults to False)
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        compression = self._compression(request)
+        if self.retry_policy is not None:
+            self.retry_policy.record_call()
+        attempt = 0
+        while True:
+            try:
+                response = self._call(rpc, request, compression, at, raw)
+                return RawResponse(response) if raw else Response(response, self.codec)
+            except grpc.RpcError as e:
+                delay = self._retry_delay(rpc, e, attempt, retry, at)
+                if delay is None:
+                    self._failed(rpc, e)
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    def _send_future(self, rpc: str, request, retry: Optional[bool] = None, at: Optional[float] = None,
+                     raw: bool = False) -> futures.Future:
+        """
+        Sends a unary call on a lane picked by the channel pool without blocking, retrying it as per the retry policy
+
+        :param rpc: (str) The name of the unary RPC
+        :param request: The gRPC request object
+        :param retry: (bool) The (optional) per call choice to retry a non idempotent RPC
+        :param at: (float) The deadline of the call (including its retries) as a time.monotonic() timestamp, if any
+        :param raw: (bool) Whether to leave the result encoded, in a RawResponse (defaults to False)
+        :return: (futures.Future[Response]) A future resolving to the response object, cancelling it cancels the call
+        """
+        compression = self._compression(request)
+        if self.retry_policy is not None:
+            self.retry_policy.record_call()
+        future = futures.Future()
+        lock = threading.Lock()
+        # The call in flight, or the timer of the next attempt, which is cancelled along with the future
+        pending = [None]
+        cancelled = [False]
+
+        def settle(resolve, outcome):
+            try:
+                resolve(outcome)
+            except _InvalidStateError:
+                # The future was cancelled meanwhile
+                pass
+
+        def send(attempt: int):
+            with lock:
+                if cancelled[0]:
+                    return
+            try:
+                call = self._call_future(rpc, request, compression, at, raw)
+            except Exception as e:
+                self._failed(rpc, e)
+                settle(future.set_exception, e)
+                return
+            with lock:
+                pending[0] = call
+                stop = cancelled[0]
+            if stop:
+                call.cancel()
+                return
+
+            def on_call_done(_call):
+                with lock:
+                    if cancelled[0]:
+                        return
+                try:
+                    response = _call.result()
+                    settle(future.set_result, RawResponse(response) if raw else Response(response, self.codec))
+                except grpc.RpcError as e:
+                    delay = self._retry_delay(rpc, e, attempt, retry, at)
+                    if delay is None:
+                        self._failed(rpc, e)
+                        settle(future.set_exception, e)
+                        return
+                    timer = threading.Timer(delay, send, (attempt + 1,))
+                    with lock:
+                        if cancelled[0]:
+                            return
+                        pending[0] = timer
+                    timer.start()
+                except Exception as e:
+                    settle(future.set_exception, e)
+
+            call.add_done_callback(on_call_done)
+
+        def on_cancel(f: futures.Future):
+            if f.cancelled():
+                with lock:
+                    cancelled[0] = True
+                    current = pending[0]
+                if current is not None:
+                    current.cancel()
+
+        future.add_done_callback(on_cancel)
+        send(0)
+        return future
+
+    def faas(self, service: str, function: str, params, timeout: int) -> Response:
+        """
+        Calls the gRPC Call function
+
+        :param service: (str) The name of service(engine) with which the function is registered
+        :param function: (str) The name of function to be called
+        :param params: The params for the function
+        :param timeout: (int) The timeout in milliseconds
+        :return: (Response) The response object containing values corresponding to the request
+        """
+        # The server times the function out first, so that its error is returned rather than a bare deadline error
+        return self._unary('Call', self._functions_request(service, function, params, timeout),
+                           timeout=math.ceil(timeout / 1000) + constants.FunctionDeadlineMargin)
+
+    def read(self, find, operation: str, options: Union[server_pb2.ReadOptions, bytes], db_type: str, col: str,
+             timeout: Optional[float] = None, raw: bool = False) -> Union[Response, RawResponse]:
         """
         Calls the gRPC Read function
 
-        :param find: The find parameters
+        :param find: The find parameters, or their JSON encoding
         :param operation: (str) The operation to perform
-        :param options: (server_pb2.ReadOptions)
+        :param options: (server_pb2.ReadOptions or bytes) The read options, or their encoding (see
+            encoding.encode_read_options)
         :param db_type: (str) The database type
         :param col: (str) The (optional) collection name
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the transport's timeout)
+        :param raw: (bool) Whether to leave the result encoded, in a RawResponse (defaults to False)
         :return: (Response) The response object containing values corresponding to the request
         """
-        find = obj_to_utf8_bytes(find)
-        meta = self._make_meta(db_type, col)
-        read_request = server_pb2.ReadRequest(find=find, operation=operation, options=options, meta=meta)
-        return Response(self.stub.Read(read_request))
+        read_request = self._read_request(find, operation, options, db_type, col)
+        if self.cache is None:
+            return self._unary('Read', read_request, timeout=timeout, raw=raw)
+        return self.cache.read(self._cache_key(read_request, raw), (db_type, col), operation,
+                               lambda: self._unary('Read', read_request, timeout=timeout, raw=raw),
+                               lambda: self._unary_future('Read', read_request, timeout=timeout, raw=raw),
+                               read_request)
+
+    def read_future(self, find, operation: str, options: Union[server_pb2.ReadOptions, bytes], db_type: str, col: str,
+                    timeout: Optional[float] = None, raw: bool = False) -> futures.Future:
+        """
+        Calls the gRPC Read function without blocking (see read)
+
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        read_request = self._read_request(find, operation, options, db_type, col)
+        if self.cache is None:
+            return self._unary_future('Read', read_request, timeout=timeout, raw=raw)
+        return self.cache.read_future(self._cache_key(read_request, raw), (db_type, col), operation,
+                                      lambda: self._unary_future('Read', read_request, timeout=timeout, raw=raw),
+                                      read_request)
+
+    @staticmethod
+    def _cache_key(request, raw: bool) -> bytes:
+        """
+        Returns the key under which a read is cached, raw reads only being cached for raw reads
+        """
+        key = request.SerializeToString(deterministic=True)
+        return b'raw\0' + key if raw else key
 
-    def create(self, document, operation: str, db_type: str, col: str) -> Response:
+    def create(self, document, operation: str, db_type: str, col: str, retry: Optional[bool] = None,
+               timeout: Optional[float] = None) -> Response:
         """
         Calls the gRPC Create function
 
-        :param document: The document to create
+        :param document: The document to create, or its JSON encoding
         :param operation: (str) The operation to perform
         :param db_type: (str) The database type
         :param col: (str) The (optional) collection name
+        :param retry: (bool) Whether the call may be retried as per the retry policy (defaults to the policy's
+            retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the transport's timeout)
         :return: (Response) The response object containing values corresponding to the request
         """
-        document = obj_to_utf8_bytes(document)
-        meta = self._make_meta(db_type, col)
-        create_request = server_pb2.CreateRequest(document=document, operation=operation, meta=meta)
-        return Response(self.stub.Create(create_request))
+        create_request = self._create_request(document, operation, db_type, col)
+        return self._write('Create', create_request, [(db_type, col)], retry=retry, timeout=timeout)
+
+    def create_future(self, document, operation: str, db_type: str, col: str, retry: Optional[bool] = None,
+                      timeout: Optional[float] = None) -> futures.Future:
+        """
+        Calls the gRPC Create function without blocking (see create)
 
-    def update(self, find, operation: str, _update, db_type: str, col: str) -> Response:
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        create_request = self._create_request(document, operation, db_type, col)
+        return self._write_future('Create', create_request, [(db_type, col)], retry=retry, timeout=timeout)
+
+    def update(self, find, operation: str, _update, db_type: str, col: str, retry: Optional[bool] = None,
+               timeout: Optional[float] = None) -> Response:
         """
         Calls the gRPC Update function
 
-        :param find: The find parameters
+        :param find: The find parameters, or their JSON encoding
         :param operation: (str) The operation to perform
-        :param _update: The update parameters
+        :param _update: The update parameters, or their JSON encoding
         :param db_type: (str) The database type
         :param col: (str) The (optional) collection name
+        :param retry: (bool) Whether the call may be retried as per the retry policy (defaults to the policy's
+            retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the transport's timeout)
         :return: (Response) The response object containing values corresponding to the request
         """
-        find = obj_to_utf8_bytes(find)
-        _update = obj_to_utf8_bytes(_update)
-        meta = self._make_meta(db_type, col)
-        update_request = server_pb2.UpdateRequest(find=find, operation=operation, update=_update, meta=meta)
-        return Response(self.stub.Update(update_request))
+        update_request = self._update_request(find, operation, _update, db_type, col)
+        return self._write('Update', update_request, [(db_type, col)], retry=retry, timeout=timeout)
 
-    def delete(self, find, operation: str, db_type: str, col: str) -> Response:
+    def update_future(self, find, operation: str, _update, db_type: str, col: str, retry: Optional[bool] = None,
+                      timeout: Optional[float] = None) -> futures.Future:
+        """
+        Calls the gRPC Update function without blocking (see update)
+
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        update_request = self._update_request(find, operation, _update, db_type, col)
+        return self._write_future('Update', update_request, [(db_type, col)], retry=retry, timeout=timeout)
+
+    def delete(self, find, operation: str, db_type: str, col: str, retry: Optional[bool] = None,
+               timeout: Optional[float] = None) -> Response:
         """
         Calls the gRPC Delete function
 
-        :param find: The find parameters
+        :param find: The find parameters, or their JSON encoding
         :param operation: (str) The operation to perform
         :param db_type: (str) The database type
         :param col: (str) The (optional) collection name
+        :param retry: (bool) Whether the call may be retried as per the retry policy (defaults to the policy's
+            retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the transport's timeout)
         :return: (Response) The response object containing values corresponding to the request
         """
-        find = obj_to_utf8_bytes(find)
-        meta = self._make_meta(db_type, col)
-        delete_request = server_pb2.DeleteRequest(find=find, operation=operation, meta=meta)
-        return Response(self.stub.Delete(delete_request))
+        delete_request = self._delete_request(find, operation, db_type, col)
+        return self._write('Delete', delete_request, [(db_type, col)], retry=retry, timeout=timeout)
+
+    def delete_future(self, find, operation: str, db_type: str, col: str, retry: Optional[bool] = None,
+                      timeout: Optional[float] = None) -> futures.Future:
+        """
+        Calls the gRPC Delete function without blocking (see delete)
+
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        delete_request = self._delete_request(find, operation, db_type, col)
+        return self._write_future('Delete', delete_request, [(db_type, col)], retry=retry, timeout=timeout)
 
-    def aggregate(self, pipeline, operation: str, db_type: str, col: str) -> Response:
+    def aggregate(self, pipeline, operation: str, db_type: str, col: str, timeout: Optional[float] = None,
+                  raw: bool = False) -> Union[Response, RawResponse]:
         """
         Calls the gRPC Aggregate function
 
-        :param pipeline: The pipeline parameters
+        :param pipeline: The pipeline parameters, or their JSON encoding
         :param operation: (str) The operation to perform
         :param db_type: (str) The database type
         :param col: (str) The (optional) collection name
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the transport's timeout)
+        :param raw: (bool) Whether to leave the result encoded, in a RawResponse (defaults to False)
         :return: (Response) The response object containing values corresponding to the request
         """
-        pipeline = obj_to_utf8_bytes(pipeline)
-        meta = self._make_meta(db_type, col)
-        aggregate_request = server_pb2.AggregateRequest(pipeline=pipeline, operation=operation, meta=meta)
-        return Response(self.stub.Aggregate(aggregate_request))
+        aggregate_request = self._aggregate_request(pipeline, operation, db_type, col)
+        return self._unary('Aggregate', aggregate_request, timeout=timeout, raw=raw)
+
+    def aggregate_future(self, pipeline, operation: str, db_type: str, col: str, timeout: Optional[float] = None,
+                         raw: bool = False) -> futures.Future:
+        """
+        Calls the gRPC Aggregate function without blocking (see aggregate)
 
-    def batch(self, all_requests: List[server_pb2.AllRequest], db_type: str) -> Response:
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        aggregate_request = self._aggregate_request(pipeline, operation, db_type, col)
+        return self._unary_future('Aggregate', aggregate_request, timeout=timeout, raw=raw)
+
+    def batch(self, all_requests: List[server_pb2.AllRequest], db_type: str, retry: Optional[bool] = None,
+              timeout: Optional[float] = None) -> Response:
         """
         Calls the gRPC Batch function
 
         :param all_requests: (List) A list of gRPC AllRequest objects
         :param db_type: (str) The database type
+        :param retry: (bool) Whether the call may be retried as per the retry policy (defaults to the policy's
+            retry_writes)
+        :param timeout: (float) The (optional) timeout in seconds (defaults to the transport's timeout)
         :return: (Response) The response object containing values corresponding to the request
         """
-        meta = self._make_meta(db_type)
-        batch_request = server_pb2.BatchRequest(meta=meta, batchrequest=all_requests)
-        return Response(self.stub.Batch(batch_request))
+        return self._write('Batch', self._batch_request(all_requests, db_type),
+                           {(db_type, request.col) for request in all_requests}, retry=retry, timeout=timeout)
+
+    def batch_future(self, all_requests: List[server_pb2.AllRequest], db_type: str, retry: Optional[bool] = None,
+                     timeout: Optional[float] = None) -> futures.Future:
+        """
+        Calls the gRPC Batch function without blocking (see batch)
+
+        :return: (futures.Future[Response]) A future resolving to the response object
+        """
+        return self._write_future('Batch', self._batch_request(all_requests, db_type),
+                                  {(db_type, request.col) for request in all_requests}, retry=retry, timeout=timeout)
 
     def profile(self, _id: str, db_type: str) -> Response:
         """
@@ -187,7 +983,7 @@ class Transport:
         """
         meta = self._make_meta(db_type=db_type)
         profile_request = server_pb2.ProfileRequest(id=_id, meta=meta)
-        return Response(self.stub.Profile(profile_request))
+        return self._unary('Profile', profile_request)
 
     def profiles(self, db_type: str) -> Response:
         """
@@ -198,7 +994,7 @@ class Transport:
         """
         meta = self._make_meta(db_type=db_type)
         profiles_request = server_pb2.ProfilesRequest(meta=meta)
-        return Response(self.stub.Profiles(profiles_request))
+        return self._unary('Profiles', profiles_request)
 
     def edit_profile(self, _id: str, email: str, name: str, password: str, db_type: str) -> Response:
         """
@@ -211,15 +1007,7 @@ class Transport:
         :param db_type: (str) The database type
         :return: (Response) The response object containing values corresponding to the request
         """
-        meta = self._make_meta(db_type=db_type)
-        edit_profile_request = server_pb2.EditProfileRequest(id=_id, meta=meta)
-        if email is not None:
-            edit_profile_request.email = email
-        if name is not None:
-            edit_profile_request.name = name
-        if password is not None:
-            edit_profile_request.password = password
-        return Response(self.stub.EditProfile(edit_profile_request))
+        return self._unary('EditProfile', self._edit_profile_request(_id, email, name, password, db_type))
 
     def sign_in(self, email: str, password: str, db_type: str) -> Response:
         """
@@ -232,7 +1020,7 @@ class Transport:
         """
         meta = self._make_meta(db_type=db_type)
         sign_in_request = server_pb2.SignInRequest(email=email, password=password, meta=meta)
-        return Response(self.stub.SignIn(sign_in_request))
+        return self._unary('SignIn', sign_in_request)
 
     def sign_up(self, email: str, name: str, password: str, role: str, db_type: str) -> Response:
         """
@@ -247,7 +1035,7 @@ class Transport:
         """
         meta = self._make_meta(db_type=db_type)
         sign_up_request = server_pb2.SignUpRequest(email=email, name=name, password=password, role=role, meta=meta)
-        return Response(self.stub.SignUp(sign_up_request))
+        return self._unary('SignUp', sign_up_request)
 
     def create_folder(self, path: str, name: str) -> Response:
         """
@@ -259,7 +1047,7 @@ class Transport:
         """
         meta = self._make_meta()
         create_folder_request = server_pb2.CreateFolderRequest(path=path, name=name, meta=meta)
-        return Response(self.stub.CreateFolder(create_folder_request))
+        return self._unary('CreateFolder', create_folder_request)
 
     def delete_file(self, path: str) -> Response:
         """
@@ -270,7 +1058,7 @@ class Transport:
         """
         meta = self._make_meta()
         delete_file_request = server_pb2.DeleteFileRequest(path=path, meta=meta)
-        return Response(self.stub.DeleteFile(delete_file_request))
+        return self._unary('DeleteFile', delete_file_request)
 
     def list_files(self, path: str) -> Response:
         """
@@ -281,7 +1069,7 @@ class Transport:
         """
         meta = self._make_meta()
         list_files_request = server_pb2.ListFilesRequest(path=path, meta=meta)
-        return Response(self.stub.ListFiles(list_files_request))
+        return self._unary('ListFiles', list_files_request)
 
     def upload_file(self, path: str, name: str, stream: io.BufferedReader) -> Response:
         """
@@ -292,14 +1080,8 @@ class Transport:
         :param stream: (io.BufferedReader) A BufferedReader to read from
         :return: (Response) The response object containing values corresponding to the request
         """
-        meta = self._make_meta()
-
-        def iterator():
-            yield server_pb2.UploadFileRequest(path=path, name=name, meta=meta)
-            for chunk in iter(lambda: stream.read(constants.PayloadSize), b''):
-                yield server_pb2.UploadFileRequest(payload=chunk)
-
-        return Response(self.stub.UploadFile(iterator()))
+        stub = self.stream_stub('UploadFile')
+        return Response(stub.UploadFile(self._upload_file_requests(path, name, stream)), self.codec)
 
     def download_file(self, path: str, stream: io.BufferedWriter) -> Response:
         """
@@ -311,7 +1093,7 @@ class Transport:
         """
         meta = self._make_meta()
         download_file_request = server_pb2.DownloadFileRequest(path=path, meta=meta)
-        for response in self.stub.DownloadFile(download_file_request):
+        for response in self.stream_stub('DownloadFile').DownloadFile(download_file_request):
             if response.status == 200:
                 stream.write(response.payload)
             else:
@@ -326,10 +1108,7 @@ class Transport:
         :param msg: The message to be published
         :return: (Response) The response object containing values corresponding to the request
         """
-        msg = obj_to_utf8_bytes(msg)
-        meta = self._make_meta()
-        publish_request = server_pb2.PubsubPublishRequest(subject=subject, msg=msg, meta=meta)
-        return Response(self.stub.PubsubPublish(publish_request))
+        return self._unary('PubsubPublish', self._publish_request(subject, msg))
 
 
-__all__ = ["Transport", "make_read_options"]
+__all__ = ["BaseTransport", "Transport", "make_read_options"]
@@ -1,55 +1,345 @@
-import json
 import collections
 import threading
+from typing import Optional
+from space_api import constants
+from space_api.codec import get_codec
 
 
-def generate_find(condition: dict) -> dict:
-    if condition.get('type') == 'and':
+# The Mongo-style operators of the condition operators
+_operators = {">": "$gt", "<": "$lt", ">=": "$gte", "<=": "$lte", "!=": "$ne", "in": "$in", "notIn": "$nin"}
+
+
+# The types of the values which are hashable as they are
+_scalars = {str, int, float, bool, type(None)}
+
+
+def _freeze(value):
+    """
+    Returns a hashable key of a value, which tells apart the values encoded differently (e.g. 1, 1.0 and True)
+    """
+    if type(value) in _scalars:
+        return type(value), value
+    if isinstance(value, dict):
+        return dict, tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return list, tuple(_freeze(v) for v in value)
+    hash(value)
+    return type(value), value
+
+
+class Condition:
+    """
+    An immutable node of a condition tree, made by COND, AND and OR
+
+    Conditions are hashable and compared by structure, so that the find parameters of a condition are compiled once
+    and memoized (see generate_find). Their values should not be changed once given to COND. They are read like the
+    dicts they used to be, e.g. condition['type']
+    """
+    # The hash of a condition is None if one of its values cannot be hashed, the condition then being only equal to
+    # itself
+    __slots__ = ('_hash',)
+    type = None
+    _fields = ('type',)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Conditions are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Conditions are immutable")
+
+    def __hash__(self) -> int:
+        return object.__hash__(self) if self._hash is None else self._hash
+
+    def __getitem__(self, item):
+        if item not in self._fields:
+            raise KeyError(item)
+        return getattr(self, item)
+
+    def get(self, item, default=None):
+        return getattr(self, item) if item in self._fields else default
+
+
+class Cond(Condition):
+    """
+    The condition on a field (see COND)
+
+    :param f1: (str) The field
+    :param op: (str) The operator (==, !=, >, <, >=, <=, in, notIn)
+    :param f2: The value
+    """
+    __slots__ = ('f1', 'op', 'f2')
+    type = 'cond'
+    _fields = ('type', 'f1', 'op', 'f2')
+
+    def __init__(self, f1: str, op: str, f2):
+        _set_f1(self, f1)
+        _set_op(self, op)
+        _set_f2(self, f2)
+        try:
+            # The equal values of different types, e.g. 1 and True, only collide, since they are told apart by __eq__
+            _set_hash(self, hash((f1, op, f2 if type(f2) in _scalars else _freeze(f2))))
+        except TypeError:
+            _set_hash(self, None)
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if type(other) is not Cond or self._hash is None or self._hash != other._hash:
+            return False
+        if self.f1 != other.f1 or self.op != other.op or type(self.f2) is not type(other.f2):
+            return False
+        if type(self.f2) in _scalars:
+            return self.f2 == other.f2
+        return _freeze(self.f2) == _freeze(other.f2)
+
+    __hash__ = Condition.__hash__
+
+    def __repr__(self) -> str:
+        return f"COND({self.f1!r}, {self.op!r}, {self.f2!r})"
+
+
+class And(Condition):
+    """
+    The conjunction of conditions (see AND)
+
+    :param clauses: (tuple) The conditions
+    """
+    __slots__ = ('clauses',)
+    type = 'and'
+    _fields = ('type', 'clauses')
+
+    def __init__(self, clauses: tuple):
+        _set_clauses(self, clauses)
+        try:
+            # A clause which cannot be hashed makes the conjunction unhashable too, rather than hashed by its identity
+            if any(isinstance(clause, Condition) and clause._hash is None for clause in clauses):
+                raise TypeError("unhashable clause")
+            _set_hash(self, hash((self.type,) + tuple(
+                clause._hash if isinstance(clause, Condition) else hash(_freeze(clause)) for clause in clauses)))
+        except TypeError:
+            _set_hash(self, None)
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if type(other) is not type(self) or self._hash is None or self._hash != other._hash:
+            return False
+        if len(self.clauses) != len(other.clauses):
+            return False
+        for a, b in zip(self.clauses, other.clauses):
+            if not (a == b if isinstance(a, Condition) else _freeze(a) == _freeze(b)):
+                return False
+        return True
+
+    __hash__ = Condition.__hash__
+
+    def __repr__(self) -> str:
+        return f"{self.type.upper()}({', '.join(map(repr, self.clauses))})"
+
+
+class Or(And):
+    """
+    The disjunction of conditions (see OR)
+
+    :param clauses: (tuple) The conditions
+    """
+    __slots__ = ()
+    type = 'or'
+
+
+# Conditions are immutable, so that their slots are set through their descriptors
+_set_hash = Condition._hash.__set__
+_set_f1, _set_op, _set_f2 = Cond.f1.__set__, Cond.op.__set__, Cond.f2.__set__
+_set_clauses = And.clauses.__set__
+
+
+class _ReadOnlyDict(dict):
+    """
+    A read-only dict of compiled find parameters (see Find)
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Compiled find parameters are read-only, copy them with dict(find) to change them")
+
+    __setitem__ = __delitem__ = __ior__ = update = pop = popitem = setdefault = clear = _read_only
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class _ReadOnlyList(list):
+    """
+    A read-only list of compiled find parameters, e.g. the clauses of $or or the values of $in (see Find)
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Compiled find parameters are read-only, copy them with list(values) to change them")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = extend = insert = pop = remove = clear = sort = \
+        reverse = _read_only
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _read_only(value):
+    """
+    Returns a read-only copy of a value of find parameters, the nested dicts and lists included
+    """
+    if isinstance(value, dict):
+        return _ReadOnlyDict((k, _read_only(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return _ReadOnlyList(_read_only(v) for v in value)
+    if isinstance(value, tuple):
+        return tuple(_read_only(v) for v in value)
+    return value
+
+
+class Find(_ReadOnlyDict):
+    """
+    The find parameters compiled from a condition, which are shared by the requests of the condition and are therefore
+    read-only, down to their nested operators and lists (copy them with dict(find) to change them). Their encoding is
+    kept alongside them (see encode_find)
+    """
+    __slots__ = ('_encoded',)
+
+    def __init__(self, find: dict):
+        dict.__init__(self, ((k, _read_only(v)) for k, v in find.items()))
+        # The codec of the encoding, and the encoding, set at once so that they always match
+        self._encoded = (None, None)
+
+
+_lock = threading.Lock()
+# The compiled find parameters by condition, from the least to the most recently used
+_finds = {}
+
+
+def _from_dict(condition: dict) -> Optional[Condition]:
+    """
+    Makes a condition of a condition given as a dict, as COND, AND and OR used to make them
+    """
+    _type = condition.get('type')
+    if _type == 'cond':
+        return Cond(condition.get('f1'), condition.get('op'), condition.get('f2'))
+    if _type == 'and':
+        return And(tuple(condition.get('clauses')))
+    if _type == 'or':
+        return Or(tuple(condition.get('clauses')))
+    return None
+
+
+def _compile(condition: Condition) -> dict:
+    if type(condition) is Cond:
+        if condition.op == "==":
+            return {condition.f1: condition.f2}
+        elif condition.op in _operators:
+            return {condition.f1: {_operators[condition.op]: condition.f2}}
+    elif type(condition) is And:
         d = {}
-        for clause in condition.get('clauses'):
-            generated = generate_find(clause)
-            if clause.get('type') == 'cond':
-                if clause.get('f1') not in d:
-                    d.update(generated)
-                else:
-                    d[clause.get('f1')].update(generated[clause.get('f1')])
+        for clause in condition.clauses:
+            if not isinstance(clause, Condition):
+                clause = _from_dict(clause)
+            generated = _compile(clause)
+            if type(clause) is Cond and clause.f1 in d:
+                d[clause.f1].update(generated[clause.f1])
             else:
                 d.update(generated)
         return d
-    elif condition.get('type') == 'or':
-        new_conditions = []
-        for clause in condition.get('clauses'):
-            new_conditions.append(generate_find(clause))
-        return {'$or': new_conditions}
-    elif condition.get('type') == 'cond':
-        if condition.get('op') == "==":
-            return {condition.get('f1'): condition.get('f2')}
-        elif condition.get('op') == ">":
-            return {condition.get('f1'): {"$gt": condition.get('f2')}}
-        elif condition.get('op') == "<":
-            return {condition.get('f1'): {"$lt": condition.get('f2')}}
-        elif condition.get('op') == ">=":
-            return {condition.get('f1'): {"$gte": condition.get('f2')}}
-        elif condition.get('op') == "<=":
-            return {condition.get('f1'): {"$lte": condition.get('f2')}}
-        elif condition.get('op') == "!=":
-            return {condition.get('f1'): {"$ne": condition.get('f2')}}
-        elif condition.get('op') == "in":
-            return {condition.get('f1'): {"$in": condition.get('f2')}}
-        elif condition.get('op') == "notIn":
-            return {condition.get('f1'): {"$nin": condition.get('f2')}}
-
-
-def AND(*conditions) -> dict:
-    return {'type': 'and', 'clauses': conditions}
-
-
-def COND(f1: str, op: str, f2) -> dict:
-    return {'type': 'cond', 'f1': f1, 'op': op, 'f2': f2}
-
-
-def OR(*conditions) -> dict:
-    return {'type': 'or', 'clauses': conditions}
+    elif type(condition) is Or:
+        return {'$or': [_compile(clause if isinstance(clause, Condition) else _from_dict(clause))
+                        for clause in condition.clauses]}
+
+
+def generate_find(condition) -> dict:
+    """
+    Compiles a condition into Mongo-style find parameters
+
+    The find parameters of hashable conditions are memoized, in an LRU of constants.FindCacheSize entries, and returned
+    as a read-only Find which is shared by all the requests of the condition
+    ::
+        find = generate_find(AND(COND('author', '==', 'some-author'), COND('likes', '>', 10)))
+
+    :param condition: (Condition or dict) The condition
+    :return: (dict) The find parameters
+    """
+    if not isinstance(condition, Condition):
+        condition = _from_dict(condition)
+    if condition is None or condition._hash is None:
+        return _compile(condition)
+    with _lock:
+        # Popped and put back to be the most recently used, the condition being compared only once
+        find = _finds.pop(condition, None)
+        if find is not None:
+            _finds[condition] = find
+            return find
+    # Compiled outside of the lock, so that the lookups of other conditions don't wait for it
+    find = _compile(condition)
+    if not isinstance(find, dict):
+        return find
+    find = Find(find)
+    with _lock:
+        # Another thread may have compiled the condition meanwhile, whose find parameters are then kept
+        find = _finds.pop(condition, find)
+        if len(_finds) >= constants.FindCacheSize:
+            del _finds[next(iter(_finds))]
+        _finds[condition] = find
+    return find
+
+
+def encode_find(find, codec) -> bytes:
+    """
+    Encodes find parameters, reusing the encoding of compiled find parameters (see generate_find)
+
+    :param find: (dict or bytes) The find parameters, or their encoding which is returned as is
+    :param codec: (JSONCodec) The codec to encode with
+    :return: (bytes) The encoded find parameters
+    """
+    if type(find) is not Find:
+        return find if type(find) is bytes else codec.dumps(find)
+    encoded_codec, encoded = find._encoded
+    if encoded_codec is not codec:
+        encoded = codec.dumps(find)
+        find._encoded = (codec, encoded)
+    return encoded
+
+
+def AND(*conditions) -> And:
+    return And(conditions)
+
+
+def COND(f1: str, op: str, f2) -> Cond:
+    return Cond(f1, op, f2)
+
+
+def OR(*conditions) -> Or:
+    return Or(conditions)
+
+
+class Param:
+    """
+    A placeholder for a value of a prepared query, given when the query is bound (see DB.prepare)
+    ::
+        from space_api import COND, Param
+        user = db.prepare(db.get_one('users').where(COND('id', '==', Param('id'))))
+        response = user.bind(id=42).apply()
+
+    :param name: (str) The name of the parameter
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __eq__(self, other) -> bool:
+        return type(other) is Param and self.name == other.name
+
+    def __hash__(self) -> int:
+        return hash((Param, self.name))
+
+    def __repr__(self) -> str:
+        return f"Param({self.name!r})"
 
 
 def obj_to_utf8_bytes(obj) -> bytes:
@@ -58,7 +348,7 @@ def obj_to_utf8_bytes(obj) -> bytes:
     :param obj: A JavaScript object-like variable
     :return: (bytes) The utf-8 bytes of the object
     """
-    return json.dumps(obj, separators=(',', ':')).encode(encoding='utf-8')
+    return get_codec().dumps(obj)
 
 
 class Client:
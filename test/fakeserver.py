@@ -0,0 +1,211 @@
+"""
+An in-memory space-cloud server, which the tests run the client against
+"""
+import json
+import queue
+import threading
+import time
+from concurrent import futures
+import grpc
+from space_api.proto import server_pb2, server_pb2_grpc
+
+
+_operators = {'$gt': lambda a, b: a is not None and a > b, '$lt': lambda a, b: a is not None and a < b,
+              '$gte': lambda a, b: a is not None and a >= b, '$lte': lambda a, b: a is not None and a <= b,
+              '$ne': lambda a, b: a != b, '$in': lambda a, b: a in b, '$nin': lambda a, b: a not in b}
+
+
+def matches(doc: dict, find: dict) -> bool:
+    """
+    Returns whether a document matches Mongo-style find parameters
+    """
+    for field, value in find.items():
+        if field == '$or':
+            if not any(matches(doc, clause) for clause in value):
+                return False
+        elif field == '$and':
+            if not all(matches(doc, clause) for clause in value):
+                return False
+        elif isinstance(value, dict):
+            if not all(_operators[op](doc.get(field), operand) for op, operand in value.items()):
+                return False
+        elif doc.get(field) != value:
+            return False
+    return True
+
+
+class FakeSpaceCloud(server_pb2_grpc.SpaceCloudServicer):
+    """
+    A space-cloud server keeping the documents in memory, recording the calls it is sent, and failing or delaying
+    them on demand
+    ::
+        server = FakeSpaceCloud().start()
+        api = API('project', server.url)
+        ...
+        server.stop()
+    """
+
+    def __init__(self, port: int = 0):
+        self.store = {}
+        # The (rpc, request) of every call received
+        self.calls = []
+        # The seconds the calls of an RPC are delayed by, or a list of the delays of its next calls
+        self.delays = {}
+        # The number of the next calls failed with the failure code
+        self.failures = 0
+        self.failure_code = grpc.StatusCode.UNAVAILABLE
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._timestamp = 0
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=32))
+        server_pb2_grpc.add_SpaceCloudServicer_to_server(self, self.server)
+        self.port = self.server.add_insecure_port(f'localhost:{port}')
+        self.url = f'localhost:{self.port}'
+
+    def start(self) -> 'FakeSpaceCloud':
+        self.server.start()
+        return self
+
+    def stop(self):
+        self.server.stop(None)
+
+    def fail(self, n: int, code: grpc.StatusCode = grpc.StatusCode.UNAVAILABLE):
+        """
+        Fails the next n calls with a status code
+        """
+        self.failures = n
+        self.failure_code = code
+
+    def count(self, rpc: str) -> int:
+        """
+        Returns the number of calls of an RPC received
+        """
+        return sum(1 for name, _ in self.calls if name == rpc)
+
+    def _received(self, rpc: str, request, context):
+        with self._lock:
+            self.calls.append((rpc, request))
+            fail = self.failures > 0
+            if fail:
+                self.failures -= 1
+        if fail:
+            context.abort(self.failure_code, 'injected failure')
+        delay = self.delays.get(rpc)
+        if isinstance(delay, list):
+            with self._lock:
+                delay = delay.pop(0) if delay else 0
+        if delay:
+            time.sleep(delay)
+
+    def _feed(self, col: str, _type: str, doc: dict):
+        with self._lock:
+            self._timestamp += 1
+            subscriptions = [s for s in self._subscriptions if s[1] == col]
+            timestamp = self._timestamp
+        for responses, _, _id in subscriptions:
+            responses.put(server_pb2.RealTimeResponse(id=_id, ack=True, feedData=[server_pb2.FeedData(
+                docId=str(doc.get('id')), type=_type, group=col, payload=json.dumps(doc).encode(),
+                timeStamp=timestamp)]))
+
+    def Create(self, request, context):
+        self._received('Create', request, context)
+        docs = json.loads(request.document)
+        docs = docs if isinstance(docs, list) else [docs]
+        with self._lock:
+            self.store.setdefault(request.meta.col, []).extend(docs)
+        for doc in docs:
+            self._feed(request.meta.col, 'insert', doc)
+        return server_pb2.Response(status=200)
+
+    def Read(self, request, context):
+        self._received('Read', request, context)
+        find = json.loads(request.find) if request.find else {}
+        docs = [doc for doc in self.store.get(request.meta.col, []) if matches(doc, find)]
+        for field, order in reversed(list(request.options.sort.items())):
+            docs.sort(key=lambda doc: doc.get(field), reverse=order < 0)
+        if request.options.skip:
+            docs = docs[request.options.skip:]
+        if request.options.limit:
+            docs = docs[:request.options.limit]
+        if request.options.select:
+            docs = [{field: doc.get(field) for field in request.options.select} for doc in docs]
+        if request.operation == 'one':
+            if not docs:
+                return server_pb2.Response(status=404, error='not found')
+            return server_pb2.Response(status=200, result=json.dumps(docs[0]).encode())
+        if request.operation == 'count':
+            return server_pb2.Response(status=200, result=json.dumps(len(docs)).encode())
+        if request.operation == 'distinct':
+            values = []
+            for doc in docs:
+                if doc.get(request.options.distinct) not in values:
+                    values.append(doc.get(request.options.distinct))
+            return server_pb2.Response(status=200, result=json.dumps(values).encode())
+        return server_pb2.Response(status=200, result=json.dumps(docs).encode())
+
+    def Update(self, request, context):
+        self._received('Update', request, context)
+        find = json.loads(request.find) if request.find else {}
+        update = json.loads(request.update)
+        for doc in self.store.get(request.meta.col, []):
+            if matches(doc, find):
+                doc.update(update.get('$set', {}))
+                self._feed(request.meta.col, 'update', doc)
+        return server_pb2.Response(status=200)
+
+    def Delete(self, request, context):
+        self._received('Delete', request, context)
+        find = json.loads(request.find) if request.find else {}
+        docs = self.store.get(request.meta.col, [])
+        self.store[request.meta.col] = [doc for doc in docs if not matches(doc, find)]
+        for doc in docs:
+            if matches(doc, find):
+                self._feed(request.meta.col, 'delete', doc)
+        return server_pb2.Response(status=200)
+
+    def Aggregate(self, request, context):
+        self._received('Aggregate', request, context)
+        return server_pb2.Response(status=200, result=request.pipeline)
+
+    def Batch(self, request, context):
+        self._received('Batch', request, context)
+        return server_pb2.Response(status=200, result=json.dumps(len(request.batchrequest)).encode())
+
+    def Call(self, request, context):
+        self._received('Call', request, context)
+        return server_pb2.Response(status=200, result=json.dumps(
+            {'params': json.loads(request.params), 'timeout': request.timeout}).encode())
+
+    def Profile(self, request, context):
+        self._received('Profile', request, context)
+        return server_pb2.Response(status=200, result=json.dumps({'id': request.id}).encode())
+
+    def RealTime(self, request_iterator, context):
+        self._received('RealTime', None, context)
+        responses = queue.Queue()
+
+        def read():
+            try:
+                for request in request_iterator:
+                    if request.type != 'realtime-subscribe':
+                        continue
+                    find = json.loads(request.where) if request.where else {}
+                    with self._lock:
+                        self._subscriptions.append((responses, request.group, request.id))
+                        timestamp = self._timestamp
+                    rows = [server_pb2.FeedData(docId=str(doc.get('id')), type='initial', group=request.group,
+                                                payload=json.dumps(doc).encode(), timeStamp=timestamp)
+                            for doc in self.store.get(request.group, []) if matches(doc, find)]
+                    responses.put(server_pb2.RealTimeResponse(id=request.id, ack=True, feedData=rows))
+            except Exception:
+                pass
+            finally:
+                responses.put(None)
+
+        threading.Thread(target=read, daemon=True).start()
+        try:
+            for response in iter(responses.get, None):
+                yield response
+        finally:
+            with self._lock:
+                self._subscriptions = [s for s in self._subscriptions if s[0] is not responses]
@@ -0,0 +1,68 @@
+import unittest
+import grpc
+from space_api import AsyncAPI, COND
+from fakeserver import FakeSpaceCloud
+
+
+class AsyncAPITest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_crud(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            db = api.mongo()
+            response = await db.insert('books').docs([{'id': 1, 'author': 'a'}, {'id': 2, 'author': 'b'}]).apply()
+            self.assertEqual(response.status, 200)
+            response = await db.get('books').where(COND('author', '==', 'b')).apply()
+            self.assertEqual(response.result, [{'id': 2, 'author': 'b'}])
+            await db.update('books').where(COND('id', '==', 1)).set({'author': 'c'}).apply()
+            response = await db.get_one('books').where(COND('id', '==', 1)).apply()
+            self.assertEqual(response.result, {'id': 1, 'author': 'c'})
+            await db.delete('books').where(COND('id', '==', 2)).apply()
+            response = await db.count('books').apply()
+            self.assertEqual(response.result, 1)
+
+    async def test_meta(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            api.set_token('my-token')
+            await api.mongo().get('books').apply()
+        _, request = self.server.calls[-1]
+        self.assertEqual(request.meta.project, 'books-app')
+        self.assertEqual(request.meta.token, 'my-token')
+        self.assertEqual(request.meta.dbType, 'mongo')
+        self.assertEqual(request.meta.col, 'books')
+
+    async def test_call(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            response = await api.call('service', 'function', {'msg': 'hi'}, 1000)
+        self.assertEqual(response.result, {'params': {'msg': 'hi'}, 'timeout': 1})
+
+    async def test_error(self):
+        self.server.fail(1, grpc.StatusCode.INTERNAL)
+        async with AsyncAPI('books-app', self.server.url) as api:
+            with self.assertRaises(grpc.RpcError):
+                await api.mongo().get('books').apply()
+
+    async def test_connect_replaces_the_channel(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            channel = api.transport.channel
+            await api.connect()
+            self.assertIsNot(api.transport.channel, channel)
+            self.assertEqual(channel.get_state(), grpc.ChannelConnectivity.SHUTDOWN)
+            response = await api.mongo().get('books').apply()
+            self.assertEqual(response.status, 200)
+
+    async def test_deadline_exceeded(self):
+        self.server.delays['Read'] = 0.5
+        async with AsyncAPI('books-app', self.server.url, timeout=0.1) as api:
+            with self.assertRaises(grpc.RpcError) as error:
+                await api.mongo().get('books').apply()
+            self.assertEqual(error.exception.code(), grpc.StatusCode.DEADLINE_EXCEEDED)
+            self.assertEqual(api.transport.metrics(), {'deadline_exceeded': {'Read': 1}})
+
+
+if __name__ == '__main__':
+    unittest.main()
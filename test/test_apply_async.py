@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+from concurrent import futures
+from space_api import API, AsyncAPI, COND
+from fakeserver import FakeSpaceCloud
+
+
+class ApplyAsyncTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.api = API('books-app', self.server.url)
+        self.db = self.api.mongo()
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_builders(self):
+        db = self.db
+        insert = db.insert('books').docs([{'id': 1, 'author': 'a'}, {'id': 2, 'author': 'b'}]).apply_async()
+        self.assertIsInstance(insert, futures.Future)
+        self.assertEqual(insert.result(timeout=5).status, 200)
+        update = db.update('books').where(COND('id', '==', 1)).set({'author': 'c'}).apply_async()
+        self.assertEqual(update.result(timeout=5).status, 200)
+        get = db.get('books').where(COND('id', '==', 1)).apply_async()
+        self.assertEqual(get.result(timeout=5).result, [{'id': 1, 'author': 'c'}])
+        aggregate = db.aggr('books').pipe([{'$match': {'id': 1}}]).apply_async()
+        self.assertEqual(aggregate.result(timeout=5).result, [{'$match': {'id': 1}}])
+        delete = db.delete('books').where(COND('id', '==', 2)).apply_async()
+        self.assertEqual(delete.result(timeout=5).status, 200)
+        batch = db.begin_batch()
+        batch.add(db.insert('books').doc({'id': 3}))
+        batch.add(db.delete('books').where(COND('id', '==', 1)))
+        self.assertEqual(batch.apply_async().result(timeout=5).result, 2)
+
+    def test_concurrent(self):
+        self.server.delays['Read'] = 0.2
+        pending = [self.db.get('books').apply_async() for _ in range(10)]
+        done, not_done = futures.wait(pending, timeout=1.5)
+        self.assertFalse(not_done)
+        self.assertTrue(all(future.result().status == 200 for future in done))
+
+    def test_cancel(self):
+        self.server.delays['Read'] = 0.5
+        future = self.db.get('books').apply_async()
+        self.assertTrue(future.cancel())
+        with self.assertRaises(futures.CancelledError):
+            future.result()
+
+    def test_call_not_started(self):
+        self.api.transport.pool.close()
+        # The closed channel refuses the call, which must not keep its lane busy
+        with self.assertRaises(ValueError):
+            self.db.get('books').apply_async().result(timeout=5)
+        self.assertEqual([lane.outstanding for lane in self.api.transport.pool.lanes], [0])
+
+
+class AsyncApplyAsyncTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_tasks(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            db = api.mongo()
+            insert = db.insert('books').doc({'id': 1}).apply_async()
+            self.assertIsInstance(insert, asyncio.Task)
+            self.assertEqual((await insert).status, 200)
+            reads = [db.get('books').apply_async() for _ in range(3)]
+            self.assertEqual([response.result for response in await asyncio.gather(*reads)], [[{'id': 1}]] * 3)
+            aggregate = db.aggr('books').pipe([{'$match': {}}]).apply_async(raw=True)
+            self.assertEqual(bytes((await aggregate).result), b'[{"$match":{}}]')
+
+
+if __name__ == '__main__':
+    unittest.main()
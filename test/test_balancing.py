@@ -0,0 +1,96 @@
+import time
+import unittest
+import grpc
+from space_api import API, constants
+from space_api.pool import ChannelPool
+from space_api.retry import RetryPolicy
+from fakeserver import FakeSpaceCloud
+
+
+class EndpointBalancingTest(unittest.TestCase):
+    def pool(self, **kwargs) -> ChannelPool:
+        pool = ChannelPool(['localhost:4124', 'localhost:4125'], health_check_interval=None, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_round_robin_across_endpoints(self):
+        pool = self.pool()
+        urls = [pool.acquire().endpoint.url for _ in range(4)]
+        self.assertEqual(sorted(urls), ['localhost:4124', 'localhost:4124', 'localhost:4125', 'localhost:4125'])
+
+    def test_ejection(self):
+        pool = self.pool(eject_after=2)
+        failing = pool.endpoints[0]
+        for _ in range(2):
+            pool.release(failing.lanes[0], code=grpc.StatusCode.UNAVAILABLE)
+        self.assertFalse(failing.healthy)
+        self.assertEqual(failing.ejections, 1)
+        self.assertTrue(all(pool.acquire().endpoint is pool.endpoints[1] for _ in range(4)))
+
+    def test_success_resets_the_failures(self):
+        pool = self.pool(eject_after=2)
+        endpoint = pool.endpoints[0]
+        pool.release(endpoint.lanes[0], code=grpc.StatusCode.UNAVAILABLE)
+        pool.release(endpoint.lanes[0], elapsed=0.01)
+        pool.release(endpoint.lanes[0], code=grpc.StatusCode.UNAVAILABLE)
+        self.assertTrue(endpoint.healthy)
+
+    def test_all_ejected(self):
+        pool = self.pool(eject_after=1)
+        for endpoint in pool.endpoints:
+            endpoint.healthy = False
+        self.assertEqual(len({pool.acquire().endpoint.url for _ in range(4)}), 2)
+
+    def test_ewma_latency(self):
+        pool = self.pool(balance=constants.EWMALatency)
+        slow, fast = pool.endpoints
+        for lane in [pool.acquire(), pool.acquire()]:
+            pool.release(lane, elapsed=0.5 if lane.endpoint is slow else 0.01)
+        self.assertTrue(all(pool.acquire().endpoint is fast for _ in range(3)))
+
+    def test_health_check(self):
+        server = FakeSpaceCloud().start()
+        self.addCleanup(server.stop)
+        pool = ChannelPool([server.url, 'localhost:1'], health_check_interval=0.1)
+        self.addCleanup(pool.close)
+        pool.endpoints[0].lanes[0].connect().result(timeout=5)
+        deadline = time.monotonic() + 5
+        while not (pool.endpoints[0].healthy and not pool.endpoints[1].healthy) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(pool.endpoints[1].healthy)
+        self.assertTrue(pool.endpoints[0].healthy)
+
+
+class TransportBalancingTest(unittest.TestCase):
+    def setUp(self):
+        self.servers = [FakeSpaceCloud().start(), FakeSpaceCloud().start()]
+
+    def tearDown(self):
+        for server in self.servers:
+            server.stop()
+
+    def test_calls_are_spread(self):
+        api = API('books-app', [server.url for server in self.servers], health_check_interval=None)
+        try:
+            for _ in range(4):
+                self.assertEqual(api.mongo().get('books').apply().status, 200)
+            self.assertEqual([server.count('Read') for server in self.servers], [2, 2])
+        finally:
+            api.close()
+
+    def test_failover(self):
+        api = API('books-app', [server.url for server in self.servers], health_check_interval=None,
+                  retry_policy=RetryPolicy(base_delay=0.01))
+        try:
+            self.servers[0].fail(100)
+            for _ in range(10):
+                self.assertEqual(api.mongo().get('books').apply().status, 200)
+            endpoints = api.metrics()['endpoints']
+            self.assertFalse(endpoints[self.servers[0].url]['healthy'])
+            self.assertEqual(endpoints[self.servers[0].url]['ejections'], 1)
+        finally:
+            api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
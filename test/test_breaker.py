@@ -0,0 +1,96 @@
+import time
+import unittest
+import grpc
+from space_api import API, constants
+from space_api.breaker import CircuitBreaker, CircuitOpenError
+from space_api.proto import server_pb2
+from fakeserver import FakeSpaceCloud
+
+UNAVAILABLE = grpc.StatusCode.UNAVAILABLE
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_the_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3)
+        for _ in range(2):
+            self.assertTrue(breaker.allow('a'))
+            breaker.record('a', UNAVAILABLE)
+        self.assertEqual(breaker.state('a'), constants.CircuitClosed)
+        breaker.record('a', UNAVAILABLE)
+        self.assertEqual(breaker.state('a'), constants.CircuitOpen)
+        self.assertFalse(breaker.allow('a'))
+        self.assertFalse(breaker.available('a'))
+        self.assertTrue(breaker.allow('b'))
+        self.assertEqual(breaker.metrics()['a'], {'state': constants.CircuitOpen, 'trips': 1, 'rejected': 1,
+                                                  'failures': 3})
+
+    def test_success_resets_the_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record('a', UNAVAILABLE)
+        breaker.record('a')
+        breaker.record('a', UNAVAILABLE)
+        self.assertEqual(breaker.state('a'), constants.CircuitClosed)
+
+    def test_other_codes_are_not_failures(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record('a', grpc.StatusCode.INVALID_ARGUMENT)
+        breaker.record('a', grpc.StatusCode.CANCELLED)
+        self.assertEqual(breaker.state('a'), constants.CircuitClosed)
+
+    def test_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05, half_open_calls=1)
+        breaker.record('a', UNAVAILABLE)
+        time.sleep(0.06)
+        self.assertEqual(breaker.state('a'), constants.CircuitHalfOpen)
+        self.assertTrue(breaker.allow('a'))
+        self.assertFalse(breaker.allow('a'))
+        # A failed trial opens the circuit again
+        breaker.record('a', UNAVAILABLE)
+        self.assertEqual(breaker.state('a'), constants.CircuitOpen)
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow('a'))
+        # A successful trial closes it
+        breaker.record('a')
+        self.assertEqual(breaker.state('a'), constants.CircuitClosed)
+
+    def test_key(self):
+        request = server_pb2.ReadRequest(meta=server_pb2.Meta(dbType='mongo', col='books'))
+        self.assertEqual(CircuitBreaker().key('localhost:4124', request), 'localhost:4124')
+        self.assertEqual(CircuitBreaker(per_collection=True).key('localhost:4124', request),
+                         'localhost:4124/mongo/books')
+
+    def test_circuit_open_error(self):
+        error = CircuitOpenError('localhost:4124')
+        self.assertIsInstance(error, grpc.RpcError)
+        self.assertEqual(error.code(), UNAVAILABLE)
+
+
+class TransportBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_fails_fast(self):
+        api = API('books-app', self.server.url, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.1))
+        try:
+            db = api.mongo()
+            self.server.fail(2)
+            for _ in range(2):
+                with self.assertRaises(grpc.RpcError):
+                    db.get('books').apply()
+            with self.assertRaises(CircuitOpenError):
+                db.get('books').apply()
+            with self.assertRaises(CircuitOpenError):
+                db.get('books').apply_async().result(timeout=5)
+            self.assertEqual(self.server.count('Read'), 2)
+            time.sleep(0.15)
+            self.assertEqual(db.get('books').apply().status, 200)
+            self.assertEqual(api.metrics()['breaker'][self.server.url]['state'], constants.CircuitClosed)
+        finally:
+            api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import sys
+import time
+import unittest
+from space_api import API, COND
+from space_api.cache import ReadCache, _sizeof
+from fakeserver import FakeSpaceCloud
+
+
+class SizeofTest(unittest.TestCase):
+    def test_sizeof(self):
+        self.assertEqual(_sizeof(1), sys.getsizeof(1))
+        doc = {'id': 1, 'tags': ['a', 'b']}
+        expected = sum(map(sys.getsizeof, (doc, 'id', 1, 'tags', doc['tags'], 'a', 'b')))
+        self.assertEqual(_sizeof(doc), expected)
+
+
+class ReadCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.api = None
+
+    def tearDown(self):
+        if self.api is not None:
+            self.api.close()
+        self.server.stop()
+
+    def make(self, **kwargs):
+        self.cache = ReadCache(**kwargs)
+        self.api = API('books-app', self.server.url, cache=self.cache)
+        self.db = self.api.mongo()
+        self.db.insert('books').docs([{'id': i, 'title': f'title {i}'} for i in range(10)]).apply()
+        self.db.insert('authors').docs([{'id': 1}]).apply()
+        self.server.calls.clear()
+
+    def test_hits(self):
+        self.make()
+        first = self.db.get('books').where(COND('id', '<', 5)).apply()
+        second = self.db.get('books').where(COND('id', '<', 5)).apply()
+        self.assertIs(second, first)
+        self.assertEqual(self.server.count('Read'), 1)
+        # Another find, other read options or another raw mode are other reads
+        self.db.get('books').where(COND('id', '<', 6)).apply()
+        self.db.get('books').where(COND('id', '<', 5)).limit(2).apply()
+        self.db.get('books').where(COND('id', '<', 5)).apply(raw=True)
+        self.assertEqual(self.server.count('Read'), 4)
+        future = self.db.get('books').where(COND('id', '<', 5)).apply_async()
+        self.assertIs(future.result(timeout=5), first)
+        metrics = self.api.metrics()['cache']
+        self.assertEqual((metrics['hits'], metrics['misses'], metrics['entries']), (2, 4, 4))
+
+    def test_ttl(self):
+        self.make(ttl=0.2, ttls={'authors': 0})
+        self.db.get('books').apply()
+        self.db.get('books').apply()
+        self.db.get('authors').apply()
+        self.db.get('authors').apply()
+        self.assertEqual(self.server.count('Read'), 3)
+        time.sleep(0.3)
+        self.db.get('books').apply()
+        self.assertEqual(self.server.count('Read'), 4)
+        self.assertEqual(self.api.metrics()['cache']['expirations'], 1)
+
+    def test_writes_invalidate(self):
+        self.make()
+        self.db.get('books').apply()
+        self.db.get('authors').apply()
+        self.db.update('books').where(COND('id', '==', 1)).set({'title': 'new'}).apply()
+        response = self.db.get_one('books').where(COND('id', '==', 1)).apply()
+        self.assertEqual(response.result['title'], 'new')
+        self.assertEqual(len(self.db.get('books').apply().result), 10)
+        self.db.get('authors').apply()
+        self.assertEqual(self.server.count('Read'), 4)
+        for write in (self.db.insert('books').doc({'id': 10}), self.db.delete('books').where(COND('id', '==', 10))):
+            write.apply()
+            self.db.get('books').apply()
+        self.assertEqual(self.server.count('Read'), 6)
+        self.cache.clear()
+        self.db.get('authors').apply()
+        self.assertEqual(self.server.count('Read'), 7)
+
+    def test_negative(self):
+        self.make(negative_ttl=0.2)
+        for _ in range(3):
+            self.assertEqual(self.db.get_one('books').where(COND('id', '==', 42)).apply().status, 404)
+        self.assertEqual(self.server.count('Read'), 1)
+        self.assertEqual(self.api.metrics()['cache']['negative_hits'], 2)
+        time.sleep(0.3)
+        self.db.get_one('books').where(COND('id', '==', 42)).apply()
+        self.assertEqual(self.server.count('Read'), 2)
+
+    def test_max_entries(self):
+        self.make(max_entries=2)
+        for i in (1, 2, 1, 3):
+            self.db.get_one('books').where(COND('id', '==', i)).apply()
+        # 2 is the least recently used
+        self.db.get_one('books').where(COND('id', '==', 1)).apply()
+        self.assertEqual(self.server.count('Read'), 3)
+        self.db.get_one('books').where(COND('id', '==', 2)).apply()
+        self.assertEqual(self.server.count('Read'), 4)
+        metrics = self.api.metrics()['cache']
+        self.assertEqual((metrics['entries'], metrics['evictions']), (2, 2))
+
+    def test_max_bytes(self):
+        self.make(max_bytes=3000)
+        self.db.get('books').apply()
+        # The decoded result of the ten books takes more than the bytes allowed
+        self.assertEqual(self.api.metrics()['cache']['entries'], 0)
+        response = self.db.get_one('books').where(COND('id', '==', 1)).apply()
+        metrics = self.api.metrics()['cache']
+        self.assertEqual(metrics['entries'], 1)
+        self.assertGreaterEqual(metrics['bytes'], _sizeof(response.result))
+        for i in range(2, 10):
+            self.db.get_one('books').where(COND('id', '==', i)).apply()
+        self.assertLessEqual(self.api.metrics()['cache']['bytes'], 3000)
+        self.assertGreater(self.api.metrics()['cache']['evictions'], 0)
+
+    def test_stale_while_revalidate(self):
+        self.make(ttl=0.1, stale_while_revalidate=5)
+        authors = self.db.get('authors').apply()
+        # Written to the server's store directly, so that the cache is not invalidated
+        self.server.store['authors'].append({'id': 2})
+        time.sleep(0.15)
+        # The expired read is answered from the cache, while it is read again in the background
+        self.assertIs(self.db.get('authors').apply(), authors)
+        self.assertEqual(authors.result, [{'id': 1}])
+        deadline = time.monotonic() + 5
+        while self.db.get('authors').apply() is authors and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.db.get('authors').apply().result, [{'id': 1}, {'id': 2}])
+        metrics = self.api.metrics()['cache']
+        self.assertEqual(metrics['refreshes'], 1)
+        self.assertGreaterEqual(metrics['stale_hits'], 1)
+        self.assertEqual(self.server.count('Read'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import threading
+import time
+import unittest
+from concurrent import futures
+import grpc
+from space_api import API, COND
+from space_api.coalescing import Coalescer
+from fakeserver import FakeSpaceCloud
+
+
+class CoalescerTest(unittest.TestCase):
+    def test_do(self):
+        coalescer = Coalescer()
+        sent = []
+        started = threading.Event()
+
+        def send():
+            sent.append(1)
+            started.set()
+            time.sleep(0.2)
+            return object()
+
+        with futures.ThreadPoolExecutor(5) as executor:
+            leader = executor.submit(coalescer.do, b'key', send)
+            started.wait(1)
+            followers = [executor.submit(coalescer.do, b'key', send) for _ in range(4)]
+            results = [leader.result()] + [follower.result() for follower in followers]
+        self.assertEqual(len(sent), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(coalescer.metrics(), {'calls': 5, 'coalesced': 4})
+        # Once answered, the next call is sent again
+        coalescer.do(b'key', send)
+        self.assertEqual(len(sent), 2)
+
+    def test_do_error(self):
+        coalescer = Coalescer()
+        with self.assertRaises(ValueError):
+            coalescer.do(b'key', lambda: int('x'))
+        self.assertEqual(coalescer.do(b'key', lambda: 1), 1)
+
+    def test_do_future_cancel(self):
+        coalescer = Coalescer()
+        call = futures.Future()
+        first = coalescer.do_future(b'key', lambda: call)
+        second = coalescer.do_future(b'key', lambda: self.fail('joined the call in flight'))
+        first.cancel()
+        self.assertFalse(call.cancelled())
+        second.cancel()
+        # The call is only cancelled with its last waiter
+        self.assertTrue(call.cancelled())
+        third = coalescer.do_future(b'key', lambda: futures.Future())
+        self.assertFalse(third.done())
+
+    def test_do_future_result(self):
+        coalescer = Coalescer()
+        call = futures.Future()
+        waiters = [coalescer.do_future(b'key', lambda: call) for _ in range(3)]
+        call.set_result('response')
+        self.assertEqual([waiter.result(timeout=1) for waiter in waiters], ['response'] * 3)
+
+    def test_follower_deadline(self):
+        coalescer = Coalescer()
+        release = threading.Event()
+        with futures.ThreadPoolExecutor(1) as executor:
+            leader = executor.submit(coalescer.do, b'key', lambda: release.wait(5))
+            while coalescer.metrics()['calls'] == 0:
+                time.sleep(0.01)
+            start = time.monotonic()
+            with self.assertRaises(futures.TimeoutError):
+                coalescer.do(b'key', lambda: self.fail('joined the call in flight'), time.monotonic() + 0.1)
+            self.assertLess(time.monotonic() - start, 1)
+            release.set()
+            self.assertTrue(leader.result(timeout=1))
+
+    def test_do_future_follower_deadline(self):
+        coalescer = Coalescer()
+        call = futures.Future()
+        leader = coalescer.do_future(b'key', lambda: call)
+        follower = coalescer.do_future(b'key', lambda: call, time.monotonic() + 0.1, lambda: ValueError('expired'))
+        with self.assertRaisesRegex(ValueError, 'expired'):
+            follower.result(timeout=1)
+        self.assertFalse(leader.done())
+        leader.cancel()
+        # Once its follower expired, the call is cancelled with its leader
+        self.assertTrue(call.cancelled())
+
+
+class TransportCoalescingTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.api = API('books-app', self.server.url, coalescer=Coalescer())
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_identical_reads(self):
+        db = self.api.mongo()
+        db.insert('books').doc({'id': 1}).apply()
+        self.server.delays['Read'] = 0.2
+        with futures.ThreadPoolExecutor(8) as executor:
+            responses = list(executor.map(lambda _: db.get('books').where(COND('id', '==', 1)).apply(), range(8)))
+        self.assertLess(self.server.count('Read'), 8)
+        self.assertTrue(all(response.result == [{'id': 1}] for response in responses))
+
+    def test_different_reads(self):
+        db = self.api.mongo()
+        self.server.delays['Read'] = 0.1
+        pending = [db.get('books').where(COND('id', '==', i)).apply_async() for i in range(3)]
+        futures.wait(pending, timeout=5)
+        self.assertEqual(self.server.count('Read'), 3)
+
+    def test_async_reads(self):
+        db = self.api.mongo()
+        self.server.delays['Read'] = 0.2
+        pending = [db.get('books').apply_async() for _ in range(5)]
+        self.assertTrue(all(future.result(timeout=5).status == 200 for future in pending))
+        self.assertEqual(self.server.count('Read'), 1)
+        self.assertEqual(self.api.metrics()['coalescing'], {'calls': 5, 'coalesced': 4})
+
+    def test_follower_deadline(self):
+        db = self.api.mongo()
+        self.server.delays['Read'] = 1
+        leader = db.get('books').apply_async()
+        while self.server.count('Read') == 0:
+            time.sleep(0.01)
+        start = time.monotonic()
+        with self.assertRaises(grpc.RpcError) as error:
+            db.get('books').apply(timeout=0.2)
+        self.assertEqual(error.exception.code(), grpc.StatusCode.DEADLINE_EXCEEDED)
+        follower = db.get('books').apply_async(timeout=0.2)
+        self.assertEqual(follower.exception(timeout=1).code(), grpc.StatusCode.DEADLINE_EXCEEDED)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(self.api.metrics()['deadline_exceeded'], {'Read': 2})
+        # The slow leader is still answered
+        self.assertEqual(leader.result(timeout=5).status, 200)
+        self.assertEqual(self.server.count('Read'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
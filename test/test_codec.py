@@ -0,0 +1,97 @@
+import unittest
+from space_api import API, COND, codec
+from space_api.codec import JSONCodec, OrjsonCodec, get_codec
+from fakeserver import FakeSpaceCloud
+
+
+def _installed(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+class GetCodecTest(unittest.TestCase):
+    def test_by_name_and_instance(self):
+        self.assertIsInstance(get_codec('json'), JSONCodec)
+        self.assertIsInstance(get_codec('orjson'), OrjsonCodec)
+        instance = JSONCodec()
+        self.assertIs(get_codec(instance), instance)
+
+    def test_default(self):
+        # orjson is the first installed codec of constants.JSONCodecs
+        self.assertIsInstance(get_codec(), OrjsonCodec)
+        self.assertIs(get_codec(), get_codec())
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            get_codec('yaml')
+
+    @unittest.skipIf(_installed('ujson'), "ujson is installed")
+    def test_not_installed(self):
+        with self.assertRaises(ImportError):
+            get_codec('ujson')
+
+    def test_register(self):
+        class UpperCodec(JSONCodec):
+            name = 'upper'
+
+        codec.register('upper', UpperCodec)
+        try:
+            self.assertIsInstance(get_codec('upper'), UpperCodec)
+        finally:
+            del codec._factories['upper']
+
+
+class CodecTest(unittest.TestCase):
+    codecs = (JSONCodec(), OrjsonCodec())
+
+    def test_round_trip(self):
+        value = {'id': 1, 'name': 'Élodie', 'tags': ['a', 'b'], 'price': 1.5, 'sold': True, 'note': None}
+        for json_codec in self.codecs:
+            encoded = json_codec.dumps(value)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(json_codec.loads(encoded), value)
+            self.assertEqual(json_codec.loads(memoryview(encoded)), value)
+            self.assertEqual(json_codec.loads(bytearray(encoded)), value)
+            self.assertEqual(json_codec.loads(encoded.decode()), value)
+
+    def test_compact(self):
+        for json_codec in self.codecs:
+            self.assertEqual(json_codec.dumps({'a': [1, 2]}), b'{"a":[1,2]}')
+
+    def test_non_str_keys(self):
+        for json_codec in self.codecs:
+            self.assertEqual(json_codec.loads(json_codec.dumps({1: 'a'})), {'1': 'a'})
+
+    def test_fallback(self):
+        value = {'big': 1 << 70}
+        for json_codec in self.codecs:
+            self.assertEqual(json_codec.loads(json_codec.dumps(value)), value)
+
+
+class APICodecTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_codecs(self):
+        for name in ('json', 'orjson', JSONCodec()):
+            api = API('books-app', self.server.url, codec=name)
+            try:
+                if isinstance(name, JSONCodec):
+                    self.assertIs(api.transport.codec, name)
+                db = api.mongo()
+                db.delete('books').apply()
+                self.assertEqual(db.insert('books').doc({'id': 1, 'name': 'Élodie'}).apply().status, 200)
+                response = db.get_one('books').where(COND('id', '==', 1)).apply()
+                self.assertEqual(response.result, {'id': 1, 'name': 'Élodie'})
+            finally:
+                api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import array
+import math
+import unittest
+from space_api.columns import Column, to_columns, to_records
+from space_api.proto import server_pb2
+from space_api.response import Response
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DOCS = [{'id': 1, 'price': 1.5, 'sold': True, 'seller': {'name': 'a'}},
+        {'id': 2, 'price': None, 'seller': {}},
+        {'id': 3, 'price': 3.0, 'sold': False, 'seller': 'b'}]
+FIELDS = ['id', 'price', 'sold', 'seller.name']
+DTYPES = {'id': 'q', 'price': 'd', 'sold': '?'}
+
+
+class ToColumnsTest(unittest.TestCase):
+    def test_arrays(self):
+        columns = to_columns(DOCS, FIELDS, DTYPES, use_numpy=False)
+        self.assertEqual(list(columns), FIELDS)
+        self.assertEqual(columns['id'], Column(array.array('q', [1, 2, 3]), array.array('b', [0, 0, 0])))
+        self.assertEqual(columns['price'].values[0], 1.5)
+        self.assertTrue(math.isnan(columns['price'].values[1]))
+        self.assertEqual(columns['price'].mask, array.array('b', [0, 1, 0]))
+        self.assertEqual(columns['sold'], Column(array.array('b', [1, 0, 0]), array.array('b', [0, 1, 0])))
+        self.assertEqual(columns['seller.name'], Column(['a', None, None], array.array('b', [0, 1, 1])))
+
+    def test_single_pass(self):
+        columns = to_columns(iter(DOCS), ['id'], {'id': 'q'}, use_numpy=False)
+        self.assertEqual(list(columns['id'].values), [1, 2, 3])
+
+    def test_empty(self):
+        columns = to_columns([], ['id'], use_numpy=False)
+        self.assertEqual(columns['id'], Column([], array.array('b')))
+
+    def test_response(self):
+        response = Response(server_pb2.Response(status=200, result=b'[{"id":1,"total":2.5},{"id":2}]'))
+        columns = response.to_columns(['id', 'total'], {'id': 'q', 'total': 'd'}, use_numpy=False)
+        self.assertEqual(list(columns['id'].values), [1, 2])
+        self.assertEqual(list(columns['total'].mask), [0, 1])
+
+    @unittest.skipIf(numpy is not None, "NumPy is installed")
+    def test_numpy_required(self):
+        with self.assertRaises(ImportError):
+            to_columns(DOCS, FIELDS, DTYPES, use_numpy=True)
+        with self.assertRaises(ImportError):
+            to_records(DOCS, FIELDS, DTYPES)
+        # NumPy is used if it is installed only
+        self.assertIsInstance(to_columns(DOCS, ['id'], {'id': 'q'})['id'].values, array.array)
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class NumpyTest(unittest.TestCase):
+    def test_to_columns(self):
+        columns = to_columns(DOCS, FIELDS, DTYPES, use_numpy=True)
+        self.assertEqual(columns['id'].values.dtype, numpy.int64)
+        self.assertEqual(columns['id'].values.tolist(), [1, 2, 3])
+        self.assertEqual(columns['price'].mask.tolist(), [False, True, False])
+        self.assertEqual(columns['sold'].values.tolist(), [True, False, False])
+        self.assertEqual(columns['seller.name'].values.dtype, object)
+
+    def test_to_records(self):
+        records = to_records(DOCS, ['id', 'price'], {'id': 'q', 'price': 'd'})
+        self.assertEqual(records['id'].tolist(), [1, 2, 3])
+        self.assertTrue(numpy.isnan(records['price'][1]))
+        response = Response(server_pb2.Response(status=200, result=b'[{"id":1}]'))
+        self.assertEqual(response.to_records(['id'], {'id': 'q'})['id'].tolist(), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import grpc
+from space_api import API
+from space_api.compression import Compression
+from space_api.proto import server_pb2
+from fakeserver import FakeSpaceCloud
+
+
+class CompressionTest(unittest.TestCase):
+    def test_invalid_algorithm(self):
+        with self.assertRaises(ValueError):
+            Compression(algorithm=grpc.Compression.NoCompression)
+
+    def test_threshold(self):
+        compression = Compression(threshold=100)
+        small = server_pb2.CreateRequest(document=b'[]')
+        large = server_pb2.CreateRequest(document=b'[' + b'1,' * 100 + b'1]')
+        self.assertIsNone(compression.choose(small))
+        self.assertEqual(compression.choose(large), grpc.Compression.Gzip)
+        metrics = compression.metrics()
+        self.assertEqual(metrics['calls'], 2)
+        self.assertEqual(metrics['compressed_calls'], 1)
+        self.assertEqual(metrics['compressed_bytes'], large.ByteSize())
+        self.assertGreater(metrics['estimated_bytes_saved'], 0)
+
+    def test_sampling(self):
+        compression = Compression(threshold=0, sample_every=4)
+        request = server_pb2.CreateRequest(document=b'{"a":"' + b'x' * 1000 + b'"}')
+        for _ in range(8):
+            compression.choose(request)
+        self.assertEqual(compression.sampled_bytes, 2 * request.ByteSize())
+        self.assertEqual(compression.metrics()['compressed_bytes'], 8 * request.ByteSize())
+
+
+class TransportCompressionTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_compressed_calls(self):
+        api = API('books-app', self.server.url, compression=Compression(threshold=1024))
+        try:
+            db = api.mongo()
+            docs = [{'id': i, 'text': 'x' * 100} for i in range(100)]
+            self.assertEqual(db.insert('books').docs(docs).apply().status, 200)
+            self.assertEqual(db.get('books').apply().result, docs)
+            metrics = api.metrics()['compression']
+            self.assertEqual(metrics['calls'], 2)
+            self.assertEqual(metrics['compressed_calls'], 1)
+        finally:
+            api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
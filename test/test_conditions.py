@@ -0,0 +1,155 @@
+import copy
+import pickle
+import threading
+import unittest
+from unittest import mock
+from space_api import AND, COND, OR, constants, utils
+from space_api.codec import JSONCodec, OrjsonCodec
+from space_api.utils import Find, encode_find, generate_find
+
+
+class ConditionTest(unittest.TestCase):
+    def test_equality(self):
+        self.assertEqual(COND('a', '==', 1), COND('a', '==', 1))
+        self.assertEqual(hash(COND('a', '==', 1)), hash(COND('a', '==', 1)))
+        self.assertEqual(AND(COND('a', '==', 1), COND('b', 'in', [1, 2])),
+                         AND(COND('a', '==', 1), COND('b', 'in', [1, 2])))
+        self.assertEqual(OR(COND('a', '==', {'x': [1]})), OR(COND('a', '==', {'x': [1]})))
+        self.assertNotEqual(COND('a', '==', 1), COND('a', '!=', 1))
+        self.assertNotEqual(AND(COND('a', '==', 1)), OR(COND('a', '==', 1)))
+        self.assertNotEqual(AND(COND('a', '==', 1), COND('b', '==', 1)), AND(COND('b', '==', 1), COND('a', '==', 1)))
+
+    def test_values_encoded_differently_differ(self):
+        conditions = [COND('a', '==', 1), COND('a', '==', 1.0), COND('a', '==', True)]
+        self.assertEqual(len(set(conditions)), 3)
+        self.assertNotEqual(COND('a', 'in', [1]), COND('a', 'in', [True]))
+        self.assertNotEqual(COND('a', 'in', [1]), COND('a', 'in', (1,)))
+        self.assertEqual(generate_find(COND('a', '==', True)), {'a': True})
+        self.assertIs(type(generate_find(COND('a', '==', 1.0))['a']), float)
+
+    def test_unhashable(self):
+        condition = COND('a', '==', {1, 2})
+        self.assertIsNone(condition._hash)
+        self.assertEqual(condition, condition)
+        self.assertNotEqual(condition, COND('a', '==', {1, 2}))
+        self.assertIsNone(AND(condition, COND('b', '==', 1))._hash)
+        self.assertIsNone(OR(AND(condition))._hash)
+        self.assertEqual(len({condition: 1, COND('a', '==', {1, 2}): 2}), 2)
+
+    def test_immutable(self):
+        condition = COND('a', '==', 1)
+        with self.assertRaises(AttributeError):
+            condition.f2 = 2
+        with self.assertRaises(AttributeError):
+            del condition.f1
+
+    def test_read_as_dicts(self):
+        condition = AND(COND('a', '>', 1))
+        self.assertEqual(condition['type'], 'and')
+        self.assertEqual(condition['clauses'][0]['f1'], 'a')
+        self.assertIsNone(condition.get('f1'))
+        with self.assertRaises(KeyError):
+            condition['f1']
+
+    def test_dict_clauses(self):
+        condition = AND({'type': 'cond', 'f1': 'a', 'op': '>', 'f2': 1}, COND('a', '<', 5))
+        self.assertEqual(generate_find(condition), {'a': {'$gt': 1, '$lt': 5}})
+        self.assertEqual(generate_find({'type': 'or', 'clauses': [{'type': 'cond', 'f1': 'a', 'op': '==', 'f2': 1}]}),
+                         {'$or': [{'a': 1}]})
+
+
+class GenerateFindTest(unittest.TestCase):
+    def test_compile(self):
+        self.assertEqual(generate_find(COND('a', 'notIn', [1])), {'a': {'$nin': [1]}})
+        self.assertEqual(generate_find(AND(COND('a', '>=', 1), COND('a', '<=', 5), COND('b', '==', 'x'))),
+                         {'a': {'$gte': 1, '$lte': 5}, 'b': 'x'})
+        self.assertEqual(generate_find(OR(COND('a', '==', 1), AND(COND('b', '!=', 2)))),
+                         {'$or': [{'a': 1}, {'b': {'$ne': 2}}]})
+
+    def test_memoized(self):
+        find = generate_find(AND(COND('memo', '==', 1), COND('x', 'in', [1, 2])))
+        self.assertIsInstance(find, Find)
+        self.assertIs(generate_find(AND(COND('memo', '==', 1), COND('x', 'in', [1, 2]))), find)
+        self.assertIsNot(generate_find(AND(COND('memo', '==', 1.0), COND('x', 'in', [1, 2]))), find)
+
+    def test_unhashable_is_not_memoized(self):
+        condition = COND('a', 'in', {1})
+        self.assertIsNot(generate_find(condition), generate_find(condition))
+
+    def test_concurrent(self):
+        finds = []
+        barrier = threading.Barrier(8)
+
+        def compile_():
+            barrier.wait()
+            finds.append(generate_find(AND(COND('concurrent', '==', 1), COND('y', '>', 2))))
+
+        threads = [threading.Thread(target=compile_) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(find is finds[0] for find in finds))
+
+    def test_lru(self):
+        finds = dict(utils._finds)
+        utils._finds.clear()
+        try:
+            with mock.patch.object(constants, 'FindCacheSize', 2):
+                a = generate_find(COND('lru', '==', 'a'))
+                b = generate_find(COND('lru', '==', 'b'))
+                # a is used, so that b is the least recently used
+                self.assertIs(generate_find(COND('lru', '==', 'a')), a)
+                generate_find(COND('lru', '==', 'c'))
+                self.assertEqual(len(utils._finds), 2)
+                self.assertIs(generate_find(COND('lru', '==', 'a')), a)
+                self.assertIsNot(generate_find(COND('lru', '==', 'b')), b)
+        finally:
+            utils._finds.clear()
+            utils._finds.update(finds)
+
+
+class FindTest(unittest.TestCase):
+    def setUp(self):
+        self.find = generate_find(OR(AND(COND('read-only', 'in', [1, 2]), COND('b', '>', 1)), COND('c', '==', 1)))
+
+    def test_read_only(self):
+        with self.assertRaises(TypeError):
+            self.find['x'] = 1
+        with self.assertRaises(TypeError):
+            self.find.update({'x': 1})
+        with self.assertRaises(TypeError):
+            self.find['$or'].append({})
+        with self.assertRaises(TypeError):
+            self.find['$or'][0]['b']['$gt'] = 2
+        with self.assertRaises(TypeError):
+            self.find['$or'][0]['read-only']['$in'].sort()
+        with self.assertRaises(TypeError):
+            self.find['$or'][1].pop('c')
+        self.assertEqual(generate_find(OR(AND(COND('read-only', 'in', [1, 2]), COND('b', '>', 1)), COND('c', '==', 1))),
+                         {'$or': [{'read-only': {'$in': [1, 2]}, 'b': {'$gt': 1}}, {'c': 1}]})
+
+    def test_copies(self):
+        for copied in (pickle.loads(pickle.dumps(self.find)), copy.deepcopy(self.find)):
+            self.assertIs(type(copied), dict)
+            self.assertIs(type(copied['$or']), list)
+            self.assertIs(type(copied['$or'][0]['b']), dict)
+            self.assertEqual(copied, self.find)
+            copied['$or'][0]['b']['$gt'] = 2
+        changed = dict(self.find)
+        changed['x'] = 1
+        self.assertNotIn('x', self.find)
+
+    def test_encode_find(self):
+        json_codec, orjson_codec = JSONCodec(), OrjsonCodec()
+        encoded = encode_find(self.find, json_codec)
+        self.assertEqual(json_codec.loads(encoded), self.find)
+        self.assertIs(encode_find(self.find, json_codec), encoded)
+        self.assertEqual(encode_find(self.find, orjson_codec), encoded)
+        self.assertIsNot(encode_find(self.find, json_codec), encoded)
+        self.assertEqual(encode_find({'a': 1}, json_codec), b'{"a":1}')
+        self.assertIs(encode_find(encoded, json_codec), encoded)
+
+
+if __name__ == '__main__':
+    unittest.main()
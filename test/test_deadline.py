@@ -0,0 +1,88 @@
+import time
+import unittest
+import grpc
+from space_api import API
+from space_api.deadline import DeadlineExceededError, deadline, remaining, resolve
+from space_api.retry import RetryPolicy
+from fakeserver import FakeSpaceCloud
+
+
+class DeadlineTest(unittest.TestCase):
+    def test_resolve(self):
+        self.assertIsNone(resolve(None))
+        self.assertAlmostEqual(remaining(resolve(2)), 2, delta=0.1)
+        self.assertIsNone(remaining(None))
+
+    def test_nested_blocks_only_shorten(self):
+        with deadline(1) as outer:
+            with deadline(5) as inner:
+                self.assertEqual(inner, outer)
+                self.assertEqual(resolve(None), outer)
+            with deadline(0.5) as inner:
+                self.assertLess(inner, outer)
+            self.assertEqual(resolve(10), outer)
+            self.assertLess(resolve(0.1), outer)
+        self.assertIsNone(resolve(None))
+
+
+class TransportDeadlineTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_timeouts(self):
+        api = API('books-app', self.server.url, timeout=0.1)
+        try:
+            db = api.mongo()
+            self.server.delays['Read'] = 0.3
+            with self.assertRaises(grpc.RpcError) as error:
+                db.get('books').apply()
+            self.assertEqual(error.exception.code(), grpc.StatusCode.DEADLINE_EXCEEDED)
+            # A timeout per call overrides the default one
+            self.assertEqual(db.get('books').apply(timeout=2).status, 200)
+            self.assertEqual(api.metrics()['deadline_exceeded'], {'Read': 1})
+        finally:
+            api.close()
+
+    def test_deadline_block(self):
+        api = API('books-app', self.server.url)
+        try:
+            db = api.mongo()
+            self.server.delays['Read'] = 0.15
+            start = time.monotonic()
+            with self.assertRaises(grpc.RpcError):
+                with deadline(0.25):
+                    db.get('books').apply()
+                    db.get('books').apply()
+            self.assertLess(time.monotonic() - start, 0.4)
+        finally:
+            api.close()
+
+    def test_passed_deadline_is_not_sent(self):
+        api = API('books-app', self.server.url)
+        try:
+            with deadline(0.01):
+                time.sleep(0.02)
+                with self.assertRaises(DeadlineExceededError):
+                    api.mongo().get('books').apply()
+            self.assertEqual(self.server.count('Read'), 0)
+        finally:
+            api.close()
+
+    def test_retries_within_the_deadline(self):
+        api = API('books-app', self.server.url, timeout=0.3, retry_policy=RetryPolicy(max_attempts=100,
+                                                                                      base_delay=0.05))
+        try:
+            self.server.fail(1000)
+            start = time.monotonic()
+            with self.assertRaises(grpc.RpcError):
+                api.mongo().get('books').apply()
+            self.assertLess(time.monotonic() - start, 0.6)
+        finally:
+            api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
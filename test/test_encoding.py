@@ -0,0 +1,78 @@
+import unittest
+from space_api.encoding import EncodedRequest, Encoder, Meta, encode_read_options, serialize
+from space_api.proto import server_pb2
+from space_api.transport import make_read_options
+
+
+class EncoderTest(unittest.TestCase):
+    def setUp(self):
+        self.encoder = Encoder()
+
+    def meta(self, token=None) -> server_pb2.Meta:
+        return server_pb2.Meta(project='books-app', dbType='mongo', col='books', token=token or '')
+
+    def test_read(self):
+        options = make_read_options({'id': 1}, {'id': -1}, 10, 20, '')
+        for token in (None, 'my-token'):
+            request = self.encoder.read(b'{"id":{"$gt":1}}', 'all', options, 'books-app', token, 'mongo', 'books')
+            expected = server_pb2.ReadRequest(find=b'{"id":{"$gt":1}}', operation='all', options=options,
+                                              meta=self.meta(token))
+            self.assertEqual(server_pb2.ReadRequest.FromString(request.data), expected)
+            self.assertEqual(request.meta, Meta('books-app', 'mongo', 'books', token))
+
+    def test_create_update_delete_aggregate(self):
+        meta = self.meta()
+        request = self.encoder.create(b'{"id":1}', 'one', 'books-app', None, 'mongo', 'books')
+        self.assertEqual(server_pb2.CreateRequest.FromString(request.data),
+                         server_pb2.CreateRequest(document=b'{"id":1}', operation='one', meta=meta))
+        request = self.encoder.update(b'{}', 'all', b'{"$set":{"a":1}}', 'books-app', None, 'mongo', 'books')
+        self.assertEqual(server_pb2.UpdateRequest.FromString(request.data),
+                         server_pb2.UpdateRequest(find=b'{}', operation='all', update=b'{"$set":{"a":1}}', meta=meta))
+        request = self.encoder.delete(b'{"id":1}', 'one', 'books-app', None, 'mongo', 'books')
+        self.assertEqual(server_pb2.DeleteRequest.FromString(request.data),
+                         server_pb2.DeleteRequest(find=b'{"id":1}', operation='one', meta=meta))
+        request = self.encoder.aggregate(b'[]', 'all', 'books-app', None, 'mongo', 'books')
+        self.assertEqual(server_pb2.AggregateRequest.FromString(request.data),
+                         server_pb2.AggregateRequest(pipeline=b'[]', operation='all', meta=meta))
+
+    def test_lengths_and_unicode(self):
+        for size in (0, 127, 128, 16383, 16384, 1 << 21):
+            document = b'"' + b'x' * size + b'"'
+            request = self.encoder.create(document, 'one', 'projet-é', 'jeton-ü', 'mongo', 'livres-ß')
+            decoded = server_pb2.CreateRequest.FromString(request.data)
+            self.assertEqual(decoded.document, document)
+            self.assertEqual(decoded.meta, server_pb2.Meta(project='projet-é', dbType='mongo', col='livres-ß',
+                                                           token='jeton-ü'))
+            self.assertEqual(request.ByteSize(), len(request.data))
+
+    def test_meta_cache(self):
+        encoder = Encoder(cache_size=2)
+        first = encoder.meta('p', None, 'mongo', 'a')
+        self.assertIs(encoder.meta('p', None, 'mongo', 'a'), first)
+        encoder.meta('p', None, 'mongo', 'b')
+        encoder.meta('p', None, 'mongo', 'c')
+        self.assertLessEqual(len(encoder._metas), 2)
+        self.assertEqual(encoder.meta('p', None, 'mongo', 'a'), first)
+
+
+class ReadOptionsTest(unittest.TestCase):
+    def test_encode_read_options(self):
+        cases = [({}, {}, 0, 0, ''), ({'a': 1, 'b': 0}, {'a': -1}, 5, 10, 'c'), (None, None, None, None, None),
+                 ({'é': 1}, {'x': 1, 'y': -1}, 1 << 40, 300, '')]
+        for select, sort, skip, limit, distinct in cases:
+            encoded = encode_read_options(select, sort, skip, limit, distinct)
+            expected = make_read_options(select or {}, sort or {}, skip or 0, limit or 0, distinct or '')
+            self.assertEqual(server_pb2.ReadOptions.FromString(encoded), expected)
+
+
+class SerializeTest(unittest.TestCase):
+    def test_serialize(self):
+        message = server_pb2.Meta(project='p')
+        self.assertEqual(serialize(message), message.SerializeToString())
+        encoded = EncodedRequest(b'\x0a\x01p', Meta('p', None, None, None))
+        self.assertEqual(serialize(encoded), b'\x0a\x01p')
+        self.assertEqual(encoded.SerializeToString(deterministic=True), b'\x0a\x01p')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import threading
+import time
+import unittest
+from space_api import API
+from space_api.hedging import HedgePolicy, LatencyTracker, Scheduler
+from space_api.retry import RetryBudget
+from fakeserver import FakeSpaceCloud
+
+
+class LatencyTrackerTest(unittest.TestCase):
+    def test_percentile(self):
+        tracker = LatencyTracker(window=100, refresh=10)
+        for i in range(9):
+            tracker.record('Read', i / 100)
+        self.assertIsNone(tracker.percentile('Read', 0.5))
+        tracker.record('Read', 0.09)
+        self.assertEqual(tracker.percentile('Read', 0.5), 0.05)
+        self.assertEqual(tracker.percentile('Read', 1), 0.09)
+        self.assertEqual(tracker.count('Read'), 10)
+
+    def test_window(self):
+        tracker = LatencyTracker(window=5, refresh=5)
+        for i in range(20):
+            tracker.record('Read', i)
+        self.assertEqual(tracker.count('Read'), 5)
+        self.assertEqual(tracker.percentile('Read', 0), 15)
+
+
+class SchedulerTest(unittest.TestCase):
+    def test_order_and_cancel(self):
+        scheduler = Scheduler()
+        calls = []
+        done = threading.Event()
+        scheduler.call_later(0.05, lambda: calls.append(2))
+        cancelled = scheduler.call_later(0.02, lambda: calls.append('cancelled'))
+        scheduler.call_later(0.01, lambda: calls.append(1))
+        scheduler.call_later(0.1, done.set)
+        Scheduler.cancel(cancelled)
+        self.assertTrue(done.wait(2))
+        self.assertEqual(calls, [1, 2])
+
+
+class HedgePolicyTest(unittest.TestCase):
+    def test_delay(self):
+        self.assertEqual(HedgePolicy(delay=0).hedge_delay('Read'), 0.001)
+        policy = HedgePolicy(min_samples=50)
+        for _ in range(49):
+            policy.record_latency('Read', 0.2, False)
+        self.assertIsNone(policy.hedge_delay('Read'))
+        policy.record_latency('Read', 0.2, True)
+        self.assertEqual(policy.hedge_delay('Read'), 0.2)
+        self.assertEqual(policy.metrics()['hedge_wins'], 1)
+
+    def test_budget(self):
+        policy = HedgePolicy(delay=0.01, budget=RetryBudget(ratio=0, reserve=1))
+        self.assertTrue(policy.allow())
+        self.assertFalse(policy.allow())
+        self.assertEqual(policy.metrics()['budget_exhausted'], 1)
+
+    def test_rpcs(self):
+        policy = HedgePolicy()
+        self.assertTrue(policy.applies('Read'))
+        self.assertFalse(policy.applies('Create'))
+
+
+class TransportHedgingTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_hedge_wins(self):
+        api = API('books-app', self.server.url, channels=2, hedging=HedgePolicy(delay=0.05))
+        try:
+            self.server.delays['Read'] = [1.0, 0.0]
+            start = time.monotonic()
+            self.assertEqual(api.mongo().get('books').apply().status, 200)
+            self.assertLess(time.monotonic() - start, 0.8)
+            self.assertEqual(self.server.count('Read'), 2)
+            metrics = api.metrics()['hedging']
+            self.assertEqual((metrics['hedges'], metrics['hedge_wins']), (1, 1))
+        finally:
+            api.close()
+
+    def test_fast_calls_are_not_hedged(self):
+        api = API('books-app', self.server.url, channels=2, hedging=HedgePolicy(delay=0.5))
+        try:
+            self.assertEqual(api.mongo().get('books').apply_async().result(timeout=5).status, 200)
+            self.assertEqual(self.server.count('Read'), 1)
+            self.assertEqual(api.metrics()['hedging']['hedges'], 0)
+        finally:
+            api.close()
+
+    def test_writes_are_not_hedged(self):
+        api = API('books-app', self.server.url, channels=2, hedging=HedgePolicy(delay=0.01))
+        try:
+            self.server.delays['Create'] = 0.1
+            api.mongo().insert('books').doc({'id': 1}).apply()
+            self.assertEqual(self.server.count('Create'), 1)
+        finally:
+            api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
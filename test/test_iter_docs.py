@@ -0,0 +1,106 @@
+import json
+import unittest
+from space_api import API, AsyncAPI, COND
+from space_api.codec import JSONCodec, OrjsonCodec
+from space_api.proto import server_pb2
+from space_api.response import Response, ResponseError
+from fakeserver import FakeSpaceCloud
+
+
+class IterArrayTest(unittest.TestCase):
+    codecs = (JSONCodec(), OrjsonCodec())
+
+    def check(self, value, data=None):
+        data = json.dumps(value).encode() if data is None else data
+        expected = value if isinstance(value, list) else [] if value is None else [value]
+        for codec in self.codecs:
+            for encoded in (data, bytearray(data), memoryview(data)):
+                self.assertEqual(list(codec.iter_array(encoded)), expected)
+
+    def test_arrays(self):
+        self.check([])
+        self.check([], b' [ \n ] ')
+        self.check([1, 2.5, True, None, 'a'])
+        self.check([{'id': 1}, {'id': 2}])
+        self.check([{'id': 1}], b'\n [ {"id" : 1} ] \t')
+
+    def test_strings(self):
+        self.check(['[', ']', '{', '}', ',', '"', '\\', '\\"', 'a,b', '[{'])
+        self.check([{'text': 'a, "b"] {c}'}, {'text': '\\'}])
+        self.check(['é', '日本', ' '])
+        self.check(['é'], '["\\u00e9"]'.encode())
+
+    def test_nested(self):
+        self.check([[1, [2, [3, [4, [5]]]]], {'a': {'b': {'c': {'d': [1, {'e': '],'}]}}}}])
+        self.check([[], {}, [[]], [{}], {'a': []}])
+
+    def test_not_an_array(self):
+        self.check({'id': 1})
+        self.check(1)
+        self.check('a')
+        self.check(None)
+
+    def test_malformed(self):
+        for data in (b'[1, 2', b'[{"a": 1}', b'["a]', b'[1 2]', b'[1,]'):
+            for codec in self.codecs:
+                with self.assertRaises(ValueError):
+                    list(codec.iter_array(data))
+
+    def test_elements_are_decoded_one_at_a_time(self):
+        iterator = JSONCodec().iter_array(b'[{"id": 1}, oops]')
+        self.assertEqual(next(iterator), {'id': 1})
+        with self.assertRaises(ValueError):
+            next(iterator)
+
+
+class IterResultTest(unittest.TestCase):
+    def test_iter_result(self):
+        response = Response(server_pb2.Response(status=200, result=b'[{"id":1},{"id":2}]'))
+        self.assertEqual(list(response.iter_result()), [{'id': 1}, {'id': 2}])
+        self.assertEqual(list(Response(server_pb2.Response(status=200, result=b'{"id":1}')).iter_result()),
+                         [{'id': 1}])
+        self.assertEqual(list(Response(server_pb2.Response(status=404)).iter_result()), [])
+
+    def test_decoded_result(self):
+        response = Response(server_pb2.Response(status=200, result=b'[{"id":1}]'))
+        self.assertEqual(response.result, [{'id': 1}])
+        self.assertIs(next(response.iter_result()), response.result[0])
+
+
+class IterDocsTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.api = API('books-app', self.server.url)
+        self.db = self.api.mongo()
+        self.db.insert('books').docs([{'id': i, 'title': f'[{i}], "{i}"'} for i in range(100)]).apply()
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_iter_docs(self):
+        docs = list(self.db.get('books').where(COND('id', '<', 50)).iter_docs())
+        self.assertEqual(docs, [{'id': i, 'title': f'[{i}], "{i}"'} for i in range(50)])
+
+    def test_error(self):
+        with self.assertRaises(ResponseError) as error:
+            self.db.get_one('books').where(COND('id', '==', -1)).iter_docs()
+        self.assertEqual(error.exception.status, 404)
+
+
+class AsyncIterDocsTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_iter_docs(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            db = api.mongo()
+            await db.insert('books').docs([{'id': 1}, {'id': 2}]).apply()
+            self.assertEqual(list(await db.get('books').iter_docs()), [{'id': 1}, {'id': 2}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+from space_api import API, AsyncAPI, COND
+from space_api.db.keyset import merge_find
+from fakeserver import FakeSpaceCloud
+
+DOCS = [{'id': i, 'group': i % 3, 'type': 'even' if i % 2 == 0 else 'odd'} for i in range(20)]
+
+
+class MergeFindTest(unittest.TestCase):
+    def test_distinct_fields(self):
+        self.assertEqual(merge_find({'a': 1}, {'b': {'$gt': 2}}), {'a': 1, 'b': {'$gt': 2}})
+        self.assertEqual(merge_find({}, {'b': 2}), {'b': 2})
+
+    def test_bounds(self):
+        self.assertEqual(merge_find({'a': {'$gt': 1, '$lt': 10}}, {'a': {'$gt': 5}}), {'a': {'$gt': 5, '$lt': 10}})
+        self.assertEqual(merge_find({'a': {'$lte': 3}}, {'a': {'$lte': 7, '$gte': 1}}), {'a': {'$lte': 3, '$gte': 1}})
+
+    def test_conflicts(self):
+        cases = [({'$or': [{'a': 1}]}, {'$or': [{'b': 1}]}), ({'a': 1}, {'a': {'$gt': 0}}),
+                 ({'a': {'$ne': 1}}, {'a': {'$ne': 2}}), ({'a': {'$gt': 1}}, {'a': {'$gt': 'x'}})]
+        for find, extra in cases:
+            self.assertEqual(merge_find(find, extra), {'$and': [find, extra]})
+
+    def test_inputs_are_not_changed(self):
+        find, extra = {'a': {'$gt': 1}}, {'a': {'$gt': 5}}
+        merge_find(find, extra)
+        self.assertEqual((find, extra), ({'a': {'$gt': 1}}, {'a': {'$gt': 5}}))
+
+
+class KeysetPaginatorTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.api = API('books-app', self.server.url)
+        self.db = self.api.mongo()
+        self.db.insert('books').docs(DOCS).apply()
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def ids(self, pages) -> list:
+        return [[doc['id'] for doc in page] for page in pages]
+
+    def test_one_key(self):
+        self.assertEqual(self.ids(self.db.get('books').paginate_by('id', page_size=8)),
+                         [list(range(8)), list(range(8, 16)), list(range(16, 20))])
+        self.assertEqual(self.ids(self.db.get('books').paginate_by('-id', page_size=15)),
+                         [list(range(19, 4, -1)), list(range(4, -1, -1))])
+
+    def test_several_keys(self):
+        pages = self.db.get('books').paginate_by('-group', 'id', page_size=4)
+        expected = sorted(DOCS, key=lambda doc: (-doc['group'], doc['id']))
+        self.assertEqual([doc for page in pages for doc in page], expected)
+
+    def test_seeks_instead_of_skipping(self):
+        self.server.calls.clear()
+        list(self.db.get('books').paginate_by('id', page_size=10))
+        requests = [request for rpc, request in self.server.calls if rpc == 'Read']
+        self.assertEqual([request.options.skip for request in requests], [0, 0, 0])
+        self.assertEqual(self.server.count('Read'), 3)
+
+    def test_where_and_limit(self):
+        pages = self.db.get('books').where(COND('type', '==', 'even')).limit(7).paginate_by('id', page_size=3)
+        self.assertEqual(self.ids(pages), [[0, 2, 4], [6, 8, 10], [12]])
+
+    def test_where_on_a_key(self):
+        pages = self.db.get('books').where(COND('id', '>=', 5), COND('id', '<', 12)).paginate_by('id', page_size=4)
+        self.assertEqual(self.ids(pages), [[5, 6, 7, 8], [9, 10, 11]])
+
+    def test_cursor(self):
+        pages = self.db.get('books').paginate_by('group', 'id', page_size=5)
+        self.assertIsNone(pages.cursor)
+        first = next(pages)
+        resumed = self.db.get('books').paginate_by('group', 'id', page_size=5, cursor=pages.cursor)
+        expected = sorted(DOCS, key=lambda doc: (doc['group'], doc['id']))
+        self.assertEqual(first + [doc for page in resumed for doc in page], expected)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.db.get('books').paginate_by(page_size=5)
+        with self.assertRaises(ValueError):
+            self.db.get('books').paginate_by('id', page_size=0)
+        with self.assertRaises(ValueError):
+            self.db.get('books').paginate_by('id', page_size=5, cursor='not a cursor')
+        pages = self.db.get('books').paginate_by('id', page_size=5)
+        next(pages)
+        with self.assertRaises(ValueError):
+            self.db.get('books').paginate_by('-id', page_size=5, cursor=pages.cursor)
+        with self.assertRaises(ValueError):
+            next(self.db.get('books').select({'group': 1}).paginate_by('id', page_size=5))
+
+
+class AsyncKeysetPaginatorTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_paginate_by(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            db = api.mongo()
+            await db.insert('books').docs(DOCS).apply()
+            pages = db.get('books').paginate_by('id', page_size=6)
+            with self.assertRaises(TypeError):
+                iter(pages)
+            first = await pages.__anext__()
+            self.assertEqual(first, DOCS[:6])
+            resumed = db.get('books').paginate_by('id', page_size=6, cursor=pages.cursor)
+            self.assertEqual([doc async for page in resumed for doc in page], DOCS[6:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import time
+import unittest
+from space_api import API, COND
+from space_api.cache import ReadCache, _Watch, _matches
+from fakeserver import FakeSpaceCloud
+
+
+class MatchesTest(unittest.TestCase):
+    def test_matches(self):
+        doc = {'id': 1, 'age': 30, 'address': {'city': 'Paris'}, 'tags': ['a']}
+        self.assertTrue(_matches({'age': {'$gte': 30, '$lt': 40}}, doc))
+        self.assertFalse(_matches({'age': {'$gt': 30}}, doc))
+        self.assertTrue(_matches({'address.city': 'Paris'}, doc))
+        self.assertFalse(_matches({'address.city': {'$in': ['Rome']}}, doc))
+        self.assertTrue(_matches({'$or': [{'age': 1}, {'id': 1}]}, doc))
+        self.assertFalse(_matches({'$or': [{'age': 1}, {'id': 2}]}, doc))
+        # The operators and the fields which are not evaluated match any document
+        self.assertTrue(_matches({'tags.0': 'b', 'age': {'$regex': 'x'}, '$text': 'x'}, doc))
+        self.assertTrue(_matches({'age': {'$gt': 'a'}}, doc))
+
+    def test_changed_by(self):
+        watch = _Watch({'age': {'$lt': 30}}, frozenset({'1', '2'}))
+        self.assertTrue(watch.changed_by('insert', '3', {'id': 3, 'age': 10}))
+        self.assertFalse(watch.changed_by('insert', '3', {'id': 3, 'age': 50}))
+        self.assertTrue(watch.changed_by('update', '1', {'id': 1, 'age': 50}))
+        self.assertTrue(watch.changed_by('update', '3', {'id': 3, 'age': 10}))
+        self.assertFalse(watch.changed_by('update', '3', {'id': 3, 'age': 50}))
+        self.assertTrue(watch.changed_by('delete', '2', None))
+        self.assertFalse(watch.changed_by('delete', '3', None))
+        self.assertTrue(_Watch({}, None).changed_by('delete', '3', None))
+
+
+class LiveReadCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.cache = ReadCache(ttl=0.2, live=['users'])
+        self.api = API('books-app', self.server.url, cache=self.cache)
+        self.db = self.api.my_sql()
+        # The writes of another client, which the cache only learns about through the realtime feed
+        self.other_api = API('books-app', self.server.url)
+        self.other = self.other_api.my_sql()
+        self.other.insert('users').docs([{'id': i, 'age': i * 10} for i in range(10)]).apply()
+        self.db.get('users').apply()
+        self.wait(lambda: self.cache.metrics()['feeds'] == 1)
+
+    def tearDown(self):
+        self.api.close()
+        self.other_api.close()
+        self.server.stop()
+
+    def wait(self, predicate):
+        deadline = time.monotonic() + 5
+        while not predicate() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(predicate())
+
+    def write(self, write):
+        events = self.cache.metrics()['feed_events']
+        write.apply()
+        self.wait(lambda: self.cache.metrics()['feed_events'] > events)
+        self.server.calls.clear()
+
+    def young(self) -> list:
+        return self.db.get('users').where(COND('age', '<', 30)).apply().result
+
+    def one(self, i: int):
+        return self.db.get_one('users').where(COND('id', '==', i)).apply()
+
+    def test_kept_past_the_ttl(self):
+        self.young(), self.one(5), self.one(50)
+        self.server.calls.clear()
+        time.sleep(0.3)
+        self.young(), self.one(5), self.one(50)
+        self.assertEqual(self.server.count('Read'), 0)
+
+    def test_invalidated_by_the_changes_it_depends_on(self):
+        self.young(), self.one(5), self.one(50)
+        self.write(self.other.update('users').where(COND('id', '==', 7)).set({'age': 71}))
+        self.young(), self.one(5), self.one(50)
+        self.assertEqual(self.server.count('Read'), 0)
+
+        self.write(self.other.update('users').where(COND('id', '==', 5)).set({'age': 51}))
+        self.assertEqual(self.one(5).result, {'id': 5, 'age': 51})
+        self.young(), self.one(50)
+        self.assertEqual(self.server.count('Read'), 1)
+
+        self.write(self.other.update('users').where(COND('id', '==', 8)).set({'age': 5}))
+        self.assertEqual(len(self.young()), 4)
+        self.one(5), self.one(50)
+        self.assertEqual(self.server.count('Read'), 1)
+
+        self.write(self.other.insert('users').doc({'id': 50, 'age': 500}))
+        self.assertEqual(self.one(50).result, {'id': 50, 'age': 500})
+        self.young(), self.one(5)
+        self.assertEqual(self.server.count('Read'), 1)
+
+        self.write(self.other.delete('users').where(COND('id', '==', 0)))
+        self.assertEqual(len(self.young()), 3)
+        self.one(5), self.one(50)
+        self.assertEqual(self.server.count('Read'), 1)
+
+    def test_counts_are_invalidated_by_any_change(self):
+        self.assertEqual(self.db.count('users').apply().result, 10)
+        self.write(self.other.update('users').where(COND('id', '==', 1)).set({'age': 11}))
+        self.assertEqual(self.db.count('users').apply().result, 10)
+        self.assertEqual(self.server.count('Read'), 1)
+
+    def test_close(self):
+        self.api.close()
+        self.assertEqual(self.cache.metrics()['feeds'], 0)
+        self.assertEqual(self.cache.metrics()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import time
+import unittest
+from space_api import API
+from fakeserver import FakeSpaceCloud
+
+
+class LiveQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.api = API('books-app', self.server.url)
+        self.db = self.api.mongo()
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_unsubscribe(self):
+        snapshots = []
+        query = self.db.live_query('books')
+        # Unsubscribing a live query which is not subscribed does nothing
+        query.unsubscribe()
+        subscription = query.subscribe(lambda docs, kind, doc: snapshots.append(docs), print)
+        self.db.insert('books').doc({'id': 1}).apply()
+        deadline = time.monotonic() + 5
+        while [{'id': 1}] not in snapshots and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIn([{'id': 1}], snapshots)
+        subscription.unsubscribe()
+        subscription.unsubscribe()
+
+
+if __name__ == '__main__':
+    unittest.main()
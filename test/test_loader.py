@@ -0,0 +1,152 @@
+import asyncio
+import json
+import threading
+import unittest
+from concurrent import futures
+import grpc
+from space_api import API, AsyncAPI, utils
+from space_api.deadline import deadline
+from fakeserver import FakeSpaceCloud
+
+DOCS = [{'id': i, 'name': f'user {i}'} for i in range(20)]
+
+
+class CancelledMeanwhile(futures.Future):
+    """
+    A future cancelled by its caller right after the loader checked whether it is done
+    """
+
+    def done(self):
+        done = super().done()
+        self.cancel()
+        return done
+
+
+class LoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.api = API('books-app', self.server.url)
+        self.db = self.api.mongo()
+        self.db.insert('users').docs(DOCS).apply()
+        self.server.calls.clear()
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def reads(self) -> list:
+        return [request for rpc, request in self.server.calls if rpc == 'Read']
+
+    def test_batching(self):
+        users = self.db.loader('users', window=0.05)
+        results = {}
+        barrier = threading.Barrier(5)
+
+        def resolve(i):
+            barrier.wait()
+            results[i] = users.load(i).result(timeout=5)
+
+        threads = [threading.Thread(target=resolve, args=(i,)) for i in (1, 3, 5, 3, 42)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {1: DOCS[1], 3: DOCS[3], 5: DOCS[5], 42: None})
+        self.assertEqual(len(self.reads()), 1)
+        self.assertEqual(sorted(json.loads(self.reads()[0].find)['id']['$in']), [1, 3, 5, 42])
+
+    def test_max_keys(self):
+        users = self.db.loader('users', window=10, max_keys=4)
+        loads = users.load_many(range(10))
+        # The first eight keys are read right away, in two reads, the last ones waiting for the window
+        self.assertEqual([load.result(timeout=5) for load in loads[:8]], DOCS[:8])
+        self.assertFalse(loads[8].done())
+        users.dispatch()
+        self.assertEqual([load.result(timeout=5) for load in loads[8:]], DOCS[8:10])
+        self.assertEqual([len(json.loads(request.find)['id']['$in']) for request in self.reads()],
+                         [4, 4, 2])
+
+    def test_cache(self):
+        users = self.db.loader('users', window=0)
+        self.assertEqual(users.load(1).result(timeout=5), DOCS[1])
+        self.assertIs(users.load(1), users.load(1))
+        self.assertEqual(len(self.reads()), 1)
+        users.clear(1)
+        users.load(1).result(timeout=5)
+        users.clear()
+        users.load(1).result(timeout=5)
+        self.assertEqual(len(self.reads()), 3)
+        uncached = self.db.loader('users', window=0, cache=False)
+        uncached.load(1).result(timeout=5)
+        uncached.load(1).result(timeout=5)
+        self.assertEqual(len(self.reads()), 5)
+
+    def test_errors_are_not_cached(self):
+        users = self.db.loader('users', window=0)
+        self.server.fail(1, grpc.StatusCode.INTERNAL)
+        with self.assertRaises(grpc.RpcError):
+            users.load(1).result(timeout=5)
+        self.assertEqual(users.load(1).result(timeout=5), DOCS[1])
+
+    def test_finds_are_not_memoized(self):
+        size = len(utils._finds)
+        users = self.db.loader('users', window=0)
+        for i in range(10):
+            users.load(i).result(timeout=5)
+        self.assertEqual(len(utils._finds), size)
+
+    def test_cancelled_waiters(self):
+        users = self.db.loader('users', window=10)
+        for error in (None, grpc.StatusCode.INTERNAL):
+            if error is not None:
+                self.server.fail(1, error)
+            cancelled, other = users.load(1), users.load(2)
+            users._pending[1] = CancelledMeanwhile()
+            self.assertTrue(cancelled.cancel())
+            users.dispatch()
+            # The other waiters of the batch are still answered
+            if error is None:
+                self.assertEqual(other.result(timeout=5), DOCS[2])
+            else:
+                self.assertIsInstance(other.exception(timeout=5), grpc.RpcError)
+            users.clear()
+
+    def test_deadline(self):
+        users = self.db.loader('users', window=0.05)
+        self.server.delays['Read'] = 1
+        with deadline(0.2):
+            load = users.load(1)
+        # The read made on the timer's thread is bound by the deadline of the load
+        with self.assertRaises(grpc.RpcError) as error:
+            load.result(timeout=5)
+        self.assertEqual(error.exception.code(), grpc.StatusCode.DEADLINE_EXCEEDED)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.db.loader('users', max_keys=0)
+
+
+class AsyncLoaderTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_batching(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            db = api.mongo()
+            await db.insert('users').docs(DOCS).apply()
+            users = db.loader('users', window=0)
+            docs = await asyncio.gather(*(users.load(i) for i in (2, 4, 2, 42)))
+            self.assertEqual(docs, [DOCS[2], DOCS[4], DOCS[2], None])
+            self.assertEqual(self.server.count('Read'), 1)
+            self.assertEqual(await users.load(4), DOCS[4])
+            self.assertEqual(self.server.count('Read'), 1)
+            batches = db.loader('users', window=0, max_keys=2)
+            self.assertEqual(await asyncio.gather(*batches.load_many(range(5))), DOCS[:5])
+            self.assertEqual(self.server.count('Read'), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import time
+import unittest
+from space_api import API, AsyncAPI, COND
+from space_api.response import ResponseError
+from fakeserver import FakeSpaceCloud
+
+DOCS = [{'id': i, 'even': i % 2 == 0} for i in range(25)]
+
+
+class PagesTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.api = API('books-app', self.server.url)
+        self.db = self.api.mongo()
+        self.db.insert('books').docs(DOCS).apply()
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_pages(self):
+        for prefetch in (0, 1, 3):
+            pages = list(self.db.get('books').sort('id').pages(10, prefetch=prefetch))
+            self.assertEqual([len(page) for page in pages], [10, 10, 5])
+            self.assertEqual([doc for page in pages for doc in page], DOCS)
+
+    def test_stops_at_the_first_page_which_is_not_full(self):
+        self.server.calls.clear()
+        self.assertEqual(len(list(self.db.get('books').sort('id').pages(5, prefetch=0))), 5)
+        # The last page read is empty, as the documents fill the pages exactly
+        self.assertEqual(self.server.count('Read'), 6)
+
+    def test_skip_and_limit(self):
+        self.server.calls.clear()
+        pages = list(self.db.get('books').sort('id').skip(5).limit(12).pages(5, prefetch=2))
+        self.assertEqual([[doc['id'] for doc in page] for page in pages],
+                         [[5, 6, 7, 8, 9], [10, 11, 12, 13, 14], [15, 16]])
+        self.assertEqual(self.server.count('Read'), 3)
+
+    def test_iter(self):
+        docs = list(self.db.get('books').where(COND('even', '==', True)).sort('id').iter(4))
+        self.assertEqual(docs, [doc for doc in DOCS if doc['even']])
+
+    def test_prefetch(self):
+        self.server.delays['Read'] = 0.2
+        start = time.monotonic()
+        self.assertEqual(len(list(self.db.get('books').sort('id').pages(10, prefetch=2))), 3)
+        # The three pages are fetched at once
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_invalid_page_size(self):
+        with self.assertRaises(ValueError):
+            next(self.db.get('books').pages(0))
+
+    def test_error(self):
+        with self.assertRaises(ResponseError):
+            list(self.db.get_one('books').where(COND('id', '==', -1)).pages(10))
+
+
+class AsyncPagesTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_pages(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            db = api.mongo()
+            await db.insert('books').docs(DOCS).apply()
+            pages = [page async for page in db.get('books').sort('id').pages(10, prefetch=2)]
+            self.assertEqual([len(page) for page in pages], [10, 10, 5])
+            docs = [doc async for doc in db.get('books').sort('id').skip(20).iter(2, prefetch=0)]
+            self.assertEqual(docs, DOCS[20:])
+
+    async def test_break(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            db = api.mongo()
+            await db.insert('books').docs(DOCS).apply()
+            pages = db.get('books').sort('id').pages(5, prefetch=2)
+            async for page in pages:
+                self.assertEqual(page, DOCS[:5])
+                break
+            await pages.aclose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from space_api import API, constants
+from space_api.pool import ChannelPool
+from fakeserver import FakeSpaceCloud
+
+
+class ChannelPoolTest(unittest.TestCase):
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ChannelPool([])
+        with self.assertRaises(ValueError):
+            ChannelPool('localhost:4124', size=0)
+        with self.assertRaises(ValueError):
+            ChannelPool('localhost:4124', balance='random')
+
+    def test_round_robin(self):
+        pool = ChannelPool('localhost:4124', size=3)
+        try:
+            lanes = [pool.acquire() for _ in range(6)]
+            self.assertEqual(len(set(lanes)), 3)
+            self.assertEqual(lanes[:3], lanes[3:])
+            self.assertEqual([lane.outstanding for lane in pool.lanes], [2, 2, 2])
+            for lane in lanes:
+                pool.release(lane)
+            self.assertEqual([lane.outstanding for lane in pool.lanes], [0, 0, 0])
+        finally:
+            pool.close()
+
+    def test_least_outstanding(self):
+        pool = ChannelPool('localhost:4124', size=3, balance=constants.LeastOutstanding)
+        try:
+            busy = pool.acquire()
+            busy.outstanding += 10
+            lanes = [pool.acquire() for _ in range(4)]
+            self.assertNotIn(busy, lanes)
+            self.assertEqual(sorted(lane.outstanding for lane in pool.lanes), [2, 2, 11])
+        finally:
+            pool.close()
+
+    def test_exclude(self):
+        pool = ChannelPool('localhost:4124', size=2)
+        try:
+            lane = pool.acquire()
+            self.assertIsNot(pool.acquire(exclude=lane), lane)
+        finally:
+            pool.close()
+
+    def test_streams_are_pinned(self):
+        pool = ChannelPool('localhost:4124', size=2)
+        try:
+            lane = pool.stream('RealTime')
+            self.assertIs(pool.stream('RealTime'), lane)
+            self.assertNotIn(lane, pool.lanes)
+            with self.assertRaises(ValueError):
+                pool.stream('Read')
+        finally:
+            pool.close()
+
+    def test_single_channel(self):
+        pool = ChannelPool('localhost:4124')
+        try:
+            self.assertIs(pool.stream('RealTime'), pool.lanes[0])
+            self.assertIs(pool.acquire(), pool.lanes[0])
+        finally:
+            pool.close()
+
+
+class TransportPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_calls_are_spread(self):
+        api = API('books-app', self.server.url, channels=3)
+        try:
+            db = api.mongo()
+            db.insert('books').doc({'id': 1}).apply()
+            for _ in range(9):
+                self.assertEqual(db.get('books').apply().result, [{'id': 1}])
+            self.assertEqual(len(api.transport.pool.lanes), 3)
+            self.assertEqual(api.metrics()['endpoints'][self.server.url]['calls'], 10)
+            self.assertTrue(all(lane.outstanding == 0 for lane in api.transport.pool.lanes))
+        finally:
+            api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
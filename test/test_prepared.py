@@ -0,0 +1,107 @@
+import unittest
+from concurrent import futures
+from space_api import API, AsyncAPI, COND, Param
+from space_api.codec import JSONCodec
+from space_api.db.prepared import _Template
+from space_api.response import RawResponse
+from fakeserver import FakeSpaceCloud
+
+
+class TemplateTest(unittest.TestCase):
+    def test_render(self):
+        codec = JSONCodec()
+        template = _Template({'a': Param('x'), 'b': [1, Param('y'), {'c': Param('x')}], 'd': 'Param'}, codec)
+        self.assertEqual(template.names, ['x', 'y', 'x'])
+        for x, y in ((1, 2), ('a "quoted" string', None), ({'k': [1, 2]}, 'é'), (True, 1.5)):
+            self.assertEqual(template.render({'x': x, 'y': y}),
+                             codec.dumps({'a': x, 'b': [1, y, {'c': x}], 'd': 'Param'}))
+
+    def test_no_placeholders(self):
+        self.assertEqual(_Template({'a': 1}, JSONCodec()).render({}), b'{"a":1}')
+
+
+class PreparedQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.api = API('books-app', self.server.url)
+        self.db = self.api.mongo()
+        self.db.insert('books').docs([{'id': i, 'author': 'a' if i < 5 else 'b'} for i in range(10)]).apply()
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_get(self):
+        book = self.db.prepare(self.db.get_one('books').where(COND('id', '==', Param('id'))))
+        self.assertEqual(book.names, {'id'})
+        for i in (3, 7):
+            self.assertEqual(book.bind(id=i).apply().result, {'id': i, 'author': 'a' if i < 5 else 'b'})
+        self.assertEqual(book.bind(id=42).apply().status, 404)
+        _, request = self.server.calls[-1]
+        self.assertEqual(request.find, b'{"id":42}')
+
+    def test_read_options(self):
+        books = self.db.prepare(self.db.get('books').where(COND('author', '==', Param('author'))).sort('id')
+                                .skip(Param('skip')).limit(Param('n')))
+        response = books.bind(author='b', skip=1, n=2).apply()
+        self.assertEqual([doc['id'] for doc in response.result], [6, 7])
+        response = books.bind(author='a', skip=0, n=3).apply()
+        self.assertEqual([doc['id'] for doc in response.result], [0, 1, 2])
+
+    def test_writes(self):
+        insert = self.db.prepare(self.db.insert('books').doc({'id': Param('id'), 'author': Param('author')}))
+        update = self.db.prepare(self.db.update('books').where(COND('id', '==', Param('id')))
+                                 .set({'author': Param('author')}))
+        delete = self.db.prepare(self.db.delete('books').where(COND('id', '>=', Param('from'))))
+        self.assertEqual(insert.bind(id=10, author='c').apply().status, 200)
+        self.assertEqual(update.bind(id=0, author='d').apply().status, 200)
+        self.assertEqual(delete.bind(**{'from': 5}).apply().status, 200)
+        response = self.db.get('books').where(COND('author', 'in', ['c', 'd'])).apply()
+        self.assertEqual(response.result, [{'id': 0, 'author': 'd'}])
+        self.assertEqual(self.db.count('books').apply().result, 5)
+
+    def test_aggregate(self):
+        pipeline = self.db.prepare(self.db.aggr('books').pipe([{'$match': {'author': Param('author')}}]))
+        response = pipeline.bind(author='a "b"').apply(raw=True)
+        self.assertIsInstance(response, RawResponse)
+        self.assertEqual(bytes(response.result), b'[{"$match":{"author":"a \\"b\\""}}]')
+
+    def test_apply_async(self):
+        book = self.db.prepare(self.db.get_one('books').where(COND('id', '==', Param('id'))))
+        future = book.bind(id=1).apply_async()
+        self.assertIsInstance(future, futures.Future)
+        self.assertEqual(future.result(timeout=5).result, {'id': 1, 'author': 'a'})
+        insert = self.db.prepare(self.db.insert('books').doc({'id': Param('id')}))
+        self.assertEqual(insert.bind(id=11).apply_async(retry=True).result(timeout=5).status, 200)
+
+    def test_bind_errors(self):
+        book = self.db.prepare(self.db.get('books').where(COND('id', '==', Param('id'))).limit(Param('n')))
+        with self.assertRaisesRegex(ValueError, 'missing n'):
+            book.bind(id=1)
+        with self.assertRaisesRegex(ValueError, 'unknown other'):
+            book.bind(id=1, n=1, other=2)
+        with self.assertRaises(TypeError):
+            self.db.prepare(self.db.live_query('books'))
+
+
+class AsyncPreparedQueryTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_prepare(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            db = api.mongo()
+            insert = db.prepare(db.insert('books').doc({'id': Param('id')}))
+            for i in range(3):
+                self.assertEqual((await insert.bind(id=i).apply()).status, 200)
+            book = db.prepare(db.get_one('books').where(COND('id', '==', Param('id'))))
+            self.assertEqual((await book.bind(id=2).apply()).result, {'id': 2})
+            task = book.bind(id=1).apply_async()
+            self.assertEqual((await task).result, {'id': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
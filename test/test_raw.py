@@ -0,0 +1,72 @@
+import json
+import struct
+import unittest
+from space_api import API, COND
+from space_api.encoding import decode_response
+from space_api.proto import server_pb2
+from space_api.response import RawResponse
+from fakeserver import FakeSpaceCloud
+
+
+class DecodeResponseTest(unittest.TestCase):
+    def test_decode_response(self):
+        cases = [server_pb2.Response(), server_pb2.Response(status=200, result=b'[{"id":1}]'),
+                 server_pb2.Response(status=404, error='not found'), server_pb2.Response(status=-1, error='é'),
+                 server_pb2.Response(status=200, result=b'"' + b'x' * 100000 + b'"')]
+        for message in cases:
+            status, error, result = decode_response(message.SerializeToString())
+            self.assertEqual(status, message.status)
+            self.assertEqual(error, message.error or None)
+            self.assertEqual(None if result is None else bytes(result), message.result or None)
+
+    def test_result_is_a_view(self):
+        data = server_pb2.Response(status=200, result=b'[1,2,3]').SerializeToString()
+        _, _, result = decode_response(data)
+        self.assertIsInstance(result, memoryview)
+        self.assertIs(result.obj, data)
+
+    def test_unknown_fields_are_skipped(self):
+        data = server_pb2.Response(status=200, result=b'1').SerializeToString()
+        # A varint, a fixed64, a length-delimited and a fixed32 field the client does not know
+        unknown = b'\x48\x96\x01' + b'\x51' + struct.pack('<q', 7) + b'\x5a\x02ab' + b'\x65' + struct.pack('<i', 7)
+        self.assertEqual(decode_response(unknown + data)[0], 200)
+        self.assertEqual(bytes(decode_response(data + unknown)[2]), b'1')
+        with self.assertRaises(ValueError):
+            decode_response(b'\x0b' + data)
+
+
+class RawResultTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.api = API('books-app', self.server.url)
+        self.db = self.api.mongo()
+        self.db.insert('books').docs([{'id': 1}, {'id': 2}]).apply()
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_get(self):
+        response = self.db.get('books').apply(raw=True)
+        self.assertIsInstance(response, RawResponse)
+        self.assertEqual(response.status, 200)
+        self.assertIsNone(response.error)
+        self.assertEqual(json.loads(bytes(response.result)), [{'id': 1}, {'id': 2}])
+        response = self.db.get_one('books').where(COND('id', '==', 2)).apply_async(raw=True).result(timeout=5)
+        self.assertEqual(bytes(response.result), b'{"id": 2}')
+
+    def test_not_found(self):
+        response = self.db.get_one('books').where(COND('id', '==', 3)).apply(raw=True)
+        self.assertEqual((response.status, response.error, response.result), (404, 'not found', None))
+
+    def test_aggregate(self):
+        response = self.db.aggr('books').pipe([{'$match': {'id': 1}}]).apply(raw=True)
+        self.assertEqual(bytes(response.result), b'[{"$match":{"id":1}}]')
+
+    def test_raw_and_decoded_reads_are_distinct(self):
+        self.assertIsInstance(self.db.get('books').apply(raw=True), RawResponse)
+        self.assertEqual(self.db.get('books').apply().result, [{'id': 1}, {'id': 2}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import threading
+import unittest
+from space_api.codec import get_codec
+from space_api.proto import server_pb2
+from space_api.response import Response, ResponseError
+
+
+class ResponseTest(unittest.TestCase):
+    def test_lazy_result(self):
+        response = Response(server_pb2.Response(status=200, result=b'[{"id":1}]'))
+        self.assertEqual((response.status, response.error, response.encoded_size), (200, None, 10))
+        self.assertIsNone(response.decode_time)
+        self.assertEqual(response.result, [{'id': 1}])
+        self.assertIsNotNone(response.decode_time)
+        self.assertIs(response.result, response.result)
+
+    def test_empty_result(self):
+        response = Response(server_pb2.Response(status=404, error='not found'))
+        self.assertEqual((response.status, response.error, response.result), (404, 'not found', None))
+        self.assertEqual(response.encoded_size, 0)
+
+    def test_set_result(self):
+        response = Response(server_pb2.Response(status=200, result=b'[1]'))
+        response.result = [2]
+        self.assertEqual(response.result, [2])
+
+    def test_slots(self):
+        response = Response(server_pb2.Response(status=200))
+        with self.assertRaises(AttributeError):
+            response.other = 1
+
+    def test_codec(self):
+        codec = get_codec('json')
+        response = Response(server_pb2.Response(status=200, result=b'{"a":1}'), codec)
+        self.assertEqual(response.result, {'a': 1})
+        self.assertEqual(str(response), "Response(status=200, error=None, result={'a': 1})")
+
+    def test_concurrent_readers_share_one_decoding(self):
+        encoded = json.dumps([{'id': i} for i in range(50000)]).encode()
+        response = Response(server_pb2.Response(status=200, result=encoded))
+        results = []
+        barrier = threading.Barrier(8)
+
+        def read():
+            barrier.wait()
+            results.append(response.result)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_response_error(self):
+        error = ResponseError(500, 'failed')
+        self.assertEqual((error.status, error.error), (500, 'failed'))
+        self.assertIn('500', str(error))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import time
+import unittest
+from concurrent import futures
+import grpc
+from space_api import API
+from space_api.retry import RetryBudget, RetryPolicy
+from fakeserver import FakeSpaceCloud
+
+
+class RetryBudgetTest(unittest.TestCase):
+    def test_budget(self):
+        budget = RetryBudget(ratio=0.5, reserve=2)
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+    def test_reserve_caps_the_balance(self):
+        budget = RetryBudget(ratio=1, reserve=1)
+        for _ in range(5):
+            budget.deposit()
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_backoff(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3, multiplier=2)
+        for attempt, ceiling in ((0, 0.1), (1, 0.2), (2, 0.3), (5, 0.3)):
+            for _ in range(20):
+                self.assertTrue(0 <= policy.backoff(attempt) <= ceiling)
+
+
+class TransportRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def api(self, **kwargs) -> API:
+        api = API('books-app', self.server.url, retry_policy=RetryPolicy(base_delay=0.01, **kwargs))
+        self.addCleanup(api.close)
+        return api
+
+    def test_reads_are_retried(self):
+        db = self.api(max_attempts=3).mongo()
+        self.server.fail(2)
+        self.assertEqual(db.get('books').apply().status, 200)
+        self.server.fail(2)
+        self.assertEqual(db.get('books').apply_async().result(timeout=5).status, 200)
+        self.assertEqual(self.server.count('Read'), 6)
+
+    def test_attempts_run_out(self):
+        api = self.api(max_attempts=2)
+        self.server.fail(5)
+        with self.assertRaises(grpc.RpcError) as error:
+            api.mongo().get('books').apply()
+        self.assertEqual(error.exception.code(), grpc.StatusCode.UNAVAILABLE)
+        self.assertEqual(self.server.count('Read'), 2)
+        self.assertEqual(api.metrics()['retry']['attempts_exhausted'], 1)
+
+    def test_other_codes_are_not_retried(self):
+        db = self.api().mongo()
+        self.server.fail(1, grpc.StatusCode.INVALID_ARGUMENT)
+        with self.assertRaises(grpc.RpcError):
+            db.get('books').apply()
+        self.assertEqual(self.server.count('Read'), 1)
+
+    def test_writes_opt_in(self):
+        db = self.api().mongo()
+        self.server.fail(1)
+        with self.assertRaises(grpc.RpcError):
+            db.insert('books').doc({'id': 1}).apply()
+        self.server.fail(1)
+        self.assertEqual(db.insert('books').doc({'id': 1}).apply(retry=True).status, 200)
+        self.server.fail(1)
+        self.assertEqual(db.insert('books').doc({'id': 2}).apply_async(retry=True).result(timeout=5).status, 200)
+        self.assertEqual(self.server.store['books'], [{'id': 1}, {'id': 2}])
+
+    def test_retry_writes(self):
+        db = self.api(retry_writes=True).mongo()
+        self.server.fail(1)
+        self.assertEqual(db.delete('books').apply().status, 200)
+
+    def test_budget_runs_out(self):
+        api = self.api(max_attempts=5, budget=RetryBudget(ratio=0, reserve=1))
+        self.server.fail(10)
+        with self.assertRaises(grpc.RpcError):
+            api.mongo().get('books').apply()
+        self.assertEqual(self.server.count('Read'), 2)
+        self.assertEqual(api.metrics()['retry']['budget_exhausted'], 1)
+
+    def test_cancel_during_backoff(self):
+        api = API('books-app', self.server.url, retry_policy=RetryPolicy(base_delay=10, max_delay=10))
+        self.addCleanup(api.close)
+        api.transport.retry_policy.backoff = lambda attempt: 0.3
+        self.server.fail(1)
+        future = api.mongo().get('books').apply_async()
+        time.sleep(0.1)
+        self.assertTrue(future.cancel())
+        time.sleep(0.4)
+        # The pending retry is cancelled along with the future
+        self.assertEqual(self.server.count('Read'), 1)
+        with self.assertRaises(futures.CancelledError):
+            future.result()
+
+    def test_cancel_in_flight(self):
+        db = self.api().mongo()
+        self.server.delays['Read'] = 0.3
+        future = db.get('books').apply_async()
+        time.sleep(0.1)
+        self.assertTrue(future.cancel())
+        time.sleep(0.3)
+        self.assertTrue(future.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
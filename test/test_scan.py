@@ -0,0 +1,85 @@
+import unittest
+from space_api import API, AsyncAPI, COND, OR
+from fakeserver import FakeSpaceCloud
+
+DOCS = [{'id': i, 'type': 'even' if i % 2 == 0 else 'odd'} for i in range(20)]
+
+
+class ScanTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.api = API('books-app', self.server.url)
+        self.db = self.api.mongo()
+        self.db.insert('books').docs(DOCS).apply()
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_boundaries(self):
+        self.assertEqual(self.db.scan('books', partitions=4).boundaries(), [5, 10, 15])
+        self.assertEqual(self.db.scan('books', partitions=1).boundaries(), [])
+        self.assertEqual(self.db.scan('books', boundaries=[8, 2, 8]).boundaries(), [2, 8])
+
+    def test_repeated_boundaries_make_fewer_partitions(self):
+        # The documents at 5, 10 and 15 in the order of the type are 'even', 'odd' and 'odd'
+        scan = self.db.scan('books', partitions=4, key='type')
+        self.assertEqual(scan.boundaries(), ['even', 'odd'])
+        self.assertEqual(sorted(doc['id'] for doc in scan.apply()), list(range(20)))
+
+    def test_partitions(self):
+        self.server.calls.clear()
+        list(self.db.scan('books', boundaries=[5, 10]).apply())
+        finds = sorted(request.find for rpc, request in self.server.calls if rpc == 'Read')
+        self.assertEqual(finds, sorted([b'{"id":{"$lt":5}}', b'{"id":{"$gte":5,"$lt":10}}', b'{"id":{"$gte":10}}']))
+
+    def test_every_document_once(self):
+        for partitions in (1, 3, 4, 7, 30):
+            docs = list(self.db.scan('books', partitions=partitions).apply())
+            self.assertEqual(sorted(docs, key=lambda doc: doc['id']), DOCS)
+
+    def test_ordered(self):
+        self.assertEqual(list(self.db.scan('books', partitions=3, ordered=True).apply()), DOCS)
+
+    def test_where(self):
+        docs = list(self.db.scan('books', partitions=3, ordered=True).where(COND('type', '==', 'odd')).apply())
+        self.assertEqual(docs, [doc for doc in DOCS if doc['type'] == 'odd'])
+        docs = self.db.scan('books', boundaries=[10], ordered=True).where(
+            OR(COND('id', '<', 3), COND('id', '>', 16))).apply()
+        self.assertEqual([doc['id'] for doc in docs], [0, 1, 2, 17, 18, 19])
+        docs = self.db.scan('books', boundaries=[10], ordered=True).where(COND('id', '>=', 8)).apply()
+        self.assertEqual([doc['id'] for doc in docs], list(range(8, 20)))
+
+    def test_select(self):
+        docs = list(self.db.scan('books', partitions=2, ordered=True).select({'id': 1}).apply())
+        self.assertEqual(docs, [{'id': doc['id']} for doc in DOCS])
+
+    def test_empty(self):
+        self.assertEqual(list(self.db.scan('other', partitions=4).apply()), [])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.db.scan('books', partitions=0)
+
+
+class AsyncScanTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_scan(self):
+        async with AsyncAPI('books-app', self.server.url) as api:
+            db = api.mongo()
+            await db.insert('books').docs(DOCS).apply()
+            self.assertEqual(await db.scan('books', partitions=4).boundaries(), [5, 10, 15])
+            docs = [doc async for doc in db.scan('books', partitions=4).apply()]
+            self.assertEqual(sorted(docs, key=lambda doc: doc['id']), DOCS)
+            docs = [doc async for doc in db.scan('books', partitions=3, ordered=True).where(
+                COND('type', '==', 'even')).apply()]
+            self.assertEqual(docs, [doc for doc in DOCS if doc['type'] == 'even'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import threading
+import time
+import unittest
+import grpc
+from space_api import API
+from space_api.pool import Lane
+from fakeserver import FakeSpaceCloud
+
+
+class LaneTest(unittest.TestCase):
+    def test_connect_is_shared_and_cancelled_on_close(self):
+        lane = Lane('localhost:1')
+        ready = lane.connect()
+        self.assertIs(lane.connect(), ready)
+        time.sleep(0.1)
+        lane.close()
+        self.assertTrue(ready.cancelled())
+
+
+class CloseTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+        self.errors = []
+        self.excepthook = threading.excepthook
+        threading.excepthook = lambda args: self.errors.append(args.exc_value)
+
+    def tearDown(self):
+        threading.excepthook = self.excepthook
+        self.server.stop()
+
+    def test_close_does_not_raise_on_the_grpc_threads(self):
+        for kwargs in ({}, {'channels': 2, 'warm_up_timeout': 5}, {'url': [self.server.url, self.server.url],
+                                                                   'health_check_interval': 0.05}):
+            api = API('books-app', kwargs.pop('url', self.server.url), **kwargs)
+            api.mongo().get('books').apply()
+            time.sleep(0.1)
+            start = time.monotonic()
+            api.close()
+            self.assertLess(time.monotonic() - start, 1)
+        # The polling threads of gRPC raise on their next poll, at most 0.2 seconds later
+        time.sleep(0.5)
+        self.assertEqual(self.errors, [])
+
+
+class WarmUpTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSpaceCloud().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_wait_ready(self):
+        api = API('books-app', self.server.url, channels=2, warm_up_timeout=5)
+        try:
+            connectivity = api.metrics()['connectivity']
+            self.assertEqual(connectivity['states'], {'READY': 2})
+            self.assertIsNotNone(connectivity['max_time_to_ready'])
+            self.assertTrue(api.wait_ready(timeout=1))
+        finally:
+            api.close()
+
+    def test_unreachable(self):
+        api = API('books-app', 'localhost:1')
+        try:
+            self.assertFalse(api.wait_ready(timeout=0.2))
+        finally:
+            api.close()
+
+    def test_connect_replaces_the_channels(self):
+        api = API('books-app', self.server.url, warm_up_timeout=5)
+        try:
+            channel = api.transport.channel
+            api.connect()
+            self.assertIsNot(api.transport.channel, channel)
+            self.assertEqual(api.mongo().get('books').apply().status, 200)
+            self.assertEqual(api.metrics()['connectivity']['connects'], 1)
+        finally:
+            api.close()
+
+    def test_connect_drains_the_old_channels(self):
+        api = API('books-app', self.server.url, warm_up_timeout=5)
+        try:
+            pool = api.transport.pool
+            self.server.delays['Read'] = 0.5
+            pending = [api.mongo().get('books').apply_async(), api.mongo().get('books').apply_async(raw=True)]
+            call = threading.Thread(target=lambda: pending.append(api.mongo().get('books').apply()))
+            call.start()
+            while self.server.count('Read') < 3:
+                time.sleep(0.01)
+            api.connect()
+            # The calls in flight on the old channels are answered, and the old channels closed afterwards
+            self.assertEqual([future.result(timeout=5).status for future in pending[:2]], [200, 200])
+            call.join(5)
+            self.assertEqual(pending[2].status, 200)
+            deadline = time.monotonic() + 5
+            while not pool._closed.is_set() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(pool._closed.is_set())
+        finally:
+            api.close()
+
+    def test_reconnects(self):
+        api = API('books-app', self.server.url, warm_up_timeout=5)
+        try:
+            self.server.stop()
+            time.sleep(0.2)
+            self.server = FakeSpaceCloud(self.server.port).start()
+            deadline = time.monotonic() + 10
+            while api.metrics()['connectivity']['reconnects'] < 1 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            # The channel is connected again eagerly, before the next call
+            self.assertEqual(api.metrics()['connectivity']['reconnects'], 1)
+            self.assertEqual(api.transport.pool.lanes[0].state, grpc.ChannelConnectivity.READY)
+            self.assertEqual(api.mongo().get('books').apply().status, 200)
+        finally:
+            api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()